@@ -114,8 +114,10 @@ class RelayProjectConfigsEndpoint(Endpoint):
 
         proj_configs = {}
         pending = []
+        # Read all configs in one round trip, rather than one per key.
+        cached_configs = projectconfig_cache.backend.get_many(public_keys)
         for key in public_keys:
-            computed = self._get_cached_or_schedule(key)
+            computed = self._get_cached_or_schedule(key, cached_configs.get(key))
             if not computed:
                 pending.append(key)
             else:
@@ -129,14 +131,13 @@ class RelayProjectConfigsEndpoint(Endpoint):
         metrics.incr("relay.project_configs.post_v3.fetched", amount=len(proj_configs))
         return {"configs": proj_configs, "pending": pending}
 
-    def _get_cached_or_schedule(self, public_key) -> dict | None:
+    def _get_cached_or_schedule(self, public_key, cached_config) -> dict | None:
         """
         Returns the config of a project if it's in the cache; else, schedules a
         task to compute and write it into the cache.
 
         Debouncing of the project happens after the task has been scheduled.
         """
-        cached_config = projectconfig_cache.backend.get(public_key)
         if cached_config:
             return cached_config
 
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import functools
 import re
+import threading
 from collections.abc import Callable, Generator, Mapping, Sequence
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, Literal, NamedTuple, TypeIs, cast, overload
 
+from cachetools import LRUCache
 from django.utils.functional import cached_property
 from parsimonious.exceptions import IncompleteParseError
 from parsimonious.grammar import Grammar
@@ -37,9 +39,13 @@ from sentry.search.utils import (
     parse_size,
 )
 from sentry.snuba.dataset import Dataset
+from sentry.utils import metrics
 from sentry.utils.snuba import is_duration_measurement, is_measurement, is_span_op_breakdown
 from sentry.utils.validators import is_event_id, is_span_id
 
+if TYPE_CHECKING:
+    from sentry.search.events.builder.discover import UnresolvedQuery
+
 # A wildcard is an asterisk prefixed by an even number of back slashes.
 # If there are an odd number of back slashes, then the back slash immediately
 # before the asterisk is actually escaping the asterisk.
@@ -697,6 +703,24 @@ class SearchConfig[TAllowBoolean: (Literal[True], Literal[False]) = Literal[True
         return config
 
 
+def _build_fallback_builder(params: ParamsType) -> UnresolvedQuery:
+    # Avoid circular import
+    from sentry.search.events.builder.discover import UnresolvedQuery
+
+    # TODO: read dataset from config
+    return UnresolvedQuery(
+        dataset=Dataset.Discover,
+        params=params,
+        config=QueryBuilderConfig(functions_acl=list(FUNCTIONS)),
+    )
+
+
+@functools.cache
+def _get_default_fallback_builder() -> UnresolvedQuery:
+    # Without params the fallback builder is always the same, so share it
+    return _build_fallback_builder({})
+
+
 class SearchVisitor(NodeVisitor[list[QueryToken]]):
     # `tuple[...]` is used for the typing of `children` because there isn't
     # a way to represent positional-heterogenous lists -- but they are
@@ -715,29 +739,27 @@ class SearchVisitor(NodeVisitor[list[QueryToken]]):
 
         self.config = config
 
-        if TYPE_CHECKING:
-            from sentry.search.events.builder.discover import UnresolvedQuery
-
         @functools.cache
         def _get_fallback_builder() -> UnresolvedQuery:
-            # Avoid circular import
-            from sentry.search.events.builder.discover import UnresolvedQuery
-
-            # TODO: read dataset from config
-            return UnresolvedQuery(
-                dataset=Dataset.Discover,
-                params=params if params is not None else {},
-                config=QueryBuilderConfig(functions_acl=list(FUNCTIONS)),
-            )
+            if not params:
+                return _get_default_fallback_builder()
+            return _build_fallback_builder(params)
 
+        # The fallback builder is only built once a key's type is actually needed
         if get_field_type is not None:
             self.get_field_type = get_field_type
         else:
-            self.get_field_type = _get_fallback_builder().get_field_type
+            self.get_field_type = lambda key: _get_fallback_builder().get_field_type(key)
         if get_function_result_type is not None:
             self.get_function_result_type = get_function_result_type
         else:
-            self.get_function_result_type = _get_fallback_builder().get_function_result_type
+            self.get_function_result_type = (
+                lambda key: _get_fallback_builder().get_function_result_type(key)
+            )
+
+        # Whether the result only depends on the query and config, and not on the
+        # current time (relative dates are resolved to absolute ones)
+        self.cacheable = True
 
     @cached_property
     def key_mappings_lookup(self) -> dict[str, str]:
@@ -806,11 +828,14 @@ class SearchVisitor(NodeVisitor[list[QueryToken]]):
     def visit_free_text(self, node: Node, children: tuple[str]) -> SearchFilter | None:
         if not children[0]:
             return None
+        return self._handle_free_text(children[0])
+
+    def _handle_free_text(self, text: str) -> SearchFilter:
         # Free text searches need to be treated like they were wildcards
         return SearchFilter(
             SearchKey(self.config.free_text_key),
             "=",
-            SearchValue(wrap_free_text(children[0], self.config.wildcard_free_text)),
+            SearchValue(wrap_free_text(text, self.config.wildcard_free_text)),
         )
 
     def visit_paren_group(
@@ -936,6 +961,7 @@ class SearchVisitor(NodeVisitor[list[QueryToken]]):
         (search_key, _, value) = children
 
         if self.is_date_key(search_key.name):
+            self.cacheable = False
             try:
                 dt_range = parse_datetime_range(value.text)
             except InvalidQuery as exc:
@@ -1231,6 +1257,7 @@ class SearchVisitor(NodeVisitor[list[QueryToken]]):
         operator_s = handle_negation(negation, operator)
         is_date_aggregate = any(key in search_key.name for key in self.config.date_keys)
         if is_date_aggregate:
+            self.cacheable = False
             try:
                 dt_range = parse_datetime_range(search_value.text)
             except InvalidQuery as exc:
@@ -1294,7 +1321,9 @@ class SearchVisitor(NodeVisitor[list[QueryToken]]):
         ],
     ) -> SearchFilter:
         negation, _, _, _, search_value = children
+        return self._handle_is_filter(is_negated(negation), search_value)
 
+    def _handle_is_filter(self, negated: bool, search_value: SearchValue) -> SearchFilter:
         translators = self.config.is_filter_translation
 
         if not translators:
@@ -1311,7 +1340,7 @@ class SearchVisitor(NodeVisitor[list[QueryToken]]):
 
         search_key_s, search_value_v = translators[search_value.raw_value]  # type: ignore[index]   # in progress fixing the value type here
 
-        operator = "!=" if is_negated(negation) else "="
+        operator = "!=" if negated else "="
         search_key = SearchKey(search_key_s)
         search_value = SearchValue(search_value_v)
 
@@ -1528,7 +1557,9 @@ class SearchVisitor(NodeVisitor[list[QueryToken]]):
         return children[0].name
 
     def visit_search_key(self, node: Node, children: tuple[str | SearchKey]) -> SearchKey:
-        key = children[0]
+        return self._resolve_search_key(children[0])
+
+    def _resolve_search_key(self, key: str | SearchKey) -> SearchKey:
         if (
             self.config.allowed_keys
             and key not in self.config.allowed_keys
@@ -1759,6 +1790,22 @@ def parse_search_query(
     if config is None:
         config = default_config
 
+    return _parse_search_query_cached(
+        query, config, params, get_field_type, get_function_result_type
+    )
+
+
+def _parse_search_query(
+    query: str, visitor: SearchVisitor, fast_path: bool = True
+) -> tuple[list[QueryToken], bool]:
+    """
+    Returns the tokens for `query`, and whether they may be cached.
+    """
+    if fast_path:
+        tokens = _fast_tokenize(query, visitor)
+        if tokens is not None:
+            return tokens, visitor.cacheable
+
     try:
         tree = event_search_grammar.parse(query)
     except IncompleteParseError as e:
@@ -1772,9 +1819,187 @@ def parse_search_query(
             )
         )
 
-    return SearchVisitor(
+    return visitor.visit(tree), visitor.cacheable
+
+
+# A `key:value` filter that can only be parsed as a text filter: the value can't be
+# quoted, a list, start with an operator, or look like a number, date or duration.
+_FAST_PATH_FILTER = re.compile(r"(!?)([a-zA-Z0-9_.-]+):([^\s()\"\[<>=!+\-0-9][^\s()\"]*)")
+_FAST_PATH_FREE_TEXT = re.compile(r"[^\s()\":]+")
+
+
+def _fast_tokenize(query: str, visitor: SearchVisitor) -> list[QueryToken] | None:
+    """
+    Tokenizes the most common simple queries (`key:value` filters, `is:` filters and
+    free text) without going through the grammar. Returns None for anything else, in
+    which case the query must be parsed with the grammar. For the queries it does
+    handle, the result is the same as what `SearchVisitor` produces.
+    """
+    if "\t" in query or "\n" in query:
+        return None
+
+    tokens: list[QueryToken] = []
+    free_text_start: int | None = None
+    free_text_end = 0
+
+    for term in re.finditer(r"[^ ]+", query):
+        text = term.group()
+        match = _FAST_PATH_FILTER.fullmatch(text)
+        if match is None:
+            if not _FAST_PATH_FREE_TEXT.fullmatch(text) or text.upper() in ("OR", "AND"):
+                return None
+            # Consecutive words of free text make up a single filter
+            if free_text_start is None:
+                free_text_start = term.start()
+            free_text_end = term.end()
+            continue
+
+        negation, key, value = match.groups()
+        if key == "has" or value.lower() in ("true", "false"):
+            return None
+
+        if free_text_start is not None:
+            tokens.append(visitor._handle_free_text(query[free_text_start:free_text_end]))
+            free_text_start = None
+
+        search_key = visitor._resolve_search_key(key)
+        if key == "is":
+            tokens.append(visitor._handle_is_filter(bool(negation), SearchValue(value)))
+        else:
+            operator = "!=" if negation else "="
+            tokens.append(visitor._handle_basic_filter(search_key, operator, SearchValue(value)))
+
+    if free_text_start is not None:
+        tokens.append(visitor._handle_free_text(query[free_text_start:free_text_end]))
+
+    return tokens
+
+
+class _RecordingLookup:
+    """
+    Wraps a field type lookup, recording the results it returned.
+    """
+
+    def __init__(self, lookup: Callable[[str], str | None]) -> None:
+        self.lookup = lookup
+        self.results: dict[str, str | None] = {}
+
+    def __call__(self, key: str) -> str | None:
+        result = self.results[key] = self.lookup(key)
+        return result
+
+
+@dataclass(frozen=True)
+class _CachedParse:
+    tokens: tuple[QueryToken, ...]
+    # Results of the type lookups made while parsing. These depend on the caller, so the
+    # tokens can only be reused if the caller's lookups return the same results.
+    field_types: tuple[tuple[str, str | None], ...]
+    function_result_types: tuple[tuple[str, str | None], ...]
+
+    def is_valid_for(
+        self,
+        get_field_type: Callable[[str], str | None],
+        get_function_result_type: Callable[[str], str | None],
+    ) -> bool:
+        return all(get_field_type(key) == result for key, result in self.field_types) and all(
+            get_function_result_type(key) == result for key, result in self.function_result_types
+        )
+
+
+PARSE_CACHE_SIZE = 2000
+
+_parse_cache: LRUCache[tuple[Any, ...], _CachedParse] = LRUCache(maxsize=PARSE_CACHE_SIZE)
+_parse_cache_lock = threading.Lock()
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+    return value
+
+
+def get_search_config_fingerprint(config: SearchConfig[Any]) -> tuple[Any, ...]:
+    """
+    A hashable representation of everything in `config` that affects parsing.
+    """
+    return (
+        config.free_text_key,
+        *(_freeze(getattr(config, config_field.name)) for config_field in fields(config)),
+    )
+
+
+def _parse_search_query_cached(
+    query: str,
+    config: SearchConfig[Any],
+    params: ParamsType | None,
+    get_field_type: Callable[[str], str | None] | None,
+    get_function_result_type: Callable[[str], str | None] | None,
+) -> list[QueryToken]:
+    """
+    `parse_search_query`, memoized in a per-process LRU cache keyed by the query and
+    config.
+
+    How a query is parsed also depends on the types of the keys in it, which come from
+    the caller. The results of the type lookups made while parsing are stored alongside
+    the tokens, and cached tokens are only reused if the caller's lookups still agree
+    with them. These lookups are cheap compared to parsing.
+    """
+    visitor = SearchVisitor(
         config,
         params=params,
         get_field_type=get_field_type,
         get_function_result_type=get_function_result_type,
-    ).visit(tree)
+    )
+
+    try:
+        cache_key: tuple[Any, ...] = (query, get_search_config_fingerprint(config))
+        hash(cache_key)
+    except TypeError:
+        metrics.incr("event_search.parse_cache", tags={"result": "unhashable"})
+        return _parse_search_query(query, visitor)[0]
+
+    with _parse_cache_lock:
+        cached = _parse_cache.get(cache_key)
+    if cached is not None and cached.is_valid_for(
+        visitor.get_field_type, visitor.get_function_result_type
+    ):
+        metrics.incr("event_search.parse_cache", tags={"result": "hit"})
+        return [_thaw_token(token) for token in cached.tokens]
+
+    field_type_lookup = _RecordingLookup(visitor.get_field_type)
+    function_result_type_lookup = _RecordingLookup(visitor.get_function_result_type)
+    visitor.get_field_type = field_type_lookup
+    visitor.get_function_result_type = function_result_type_lookup
+
+    tokens, cacheable = _parse_search_query(query, visitor)
+    if not cacheable:
+        metrics.incr("event_search.parse_cache", tags={"result": "uncacheable"})
+        return tokens
+
+    metrics.incr("event_search.parse_cache", tags={"result": "miss"})
+    with _parse_cache_lock:
+        _parse_cache[cache_key] = _CachedParse(
+            tokens=tuple(_freeze_token(token) for token in tokens),
+            field_types=tuple(field_type_lookup.results.items()),
+            function_result_types=tuple(function_result_type_lookup.results.items()),
+        )
+    return tokens
+
+
+def _freeze_token(token: QueryToken) -> QueryToken:
+    # Tokens are tuples, but paren expressions hold a list of their children
+    if isinstance(token, ParenExpression):
+        return ParenExpression(tuple(_freeze_token(child) for child in token.children))
+    return token
+
+
+def _thaw_token(token: QueryToken) -> QueryToken:
+    # Hand out fresh lists so that callers can't modify the cached tokens
+    if isinstance(token, ParenExpression):
+        return ParenExpression([_thaw_token(child) for child in token.children])
+    return token
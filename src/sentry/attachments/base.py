@@ -1,4 +1,5 @@
 import zlib
+from collections.abc import Iterator
 
 import sentry_sdk
 import zstandard
@@ -67,6 +68,20 @@ class CachedAttachment:
         assert self._data is not UNINITIALIZED_DATA
         return self._data
 
+    def iter_data(self) -> Iterator[bytes]:
+        """
+        Yields the attachment's data chunk by chunk, without loading all of it into
+        memory at once. Raises `MissingAttachmentChunks` when reaching a chunk that is
+        missing from the cache.
+        """
+        if self._data is UNINITIALIZED_DATA and self._cache is not None:
+            yield from self._cache.iter_data(self)
+            return
+
+        assert self._data is not UNINITIALIZED_DATA
+        if self._data:
+            yield self._data
+
     def delete(self):
         for key in self.chunk_keys:
             self._cache.inner.delete(key)
@@ -162,19 +177,17 @@ class BaseAttachmentCache:
             yield CachedAttachment(cache=self, **attachment)
 
     def get_data(self, attachment) -> bytes:
-        data = bytearray()
+        return b"".join(self.iter_data(attachment))
 
+    def iter_data(self, attachment) -> Iterator[bytes]:
         for key in attachment.chunk_keys:
             raw_data = self.inner.get(key, raw=True)
             if raw_data is None:
                 raise MissingAttachmentChunks()
             if raw_data.startswith(b"\x28\xb5\x2f\xfd"):
-                decompressed = zstandard.decompress(raw_data)
+                yield zstandard.decompress(raw_data)
             else:
-                decompressed = zlib.decompress(raw_data)
-            data.extend(decompressed)
-
-        return bytes(data)
+                yield zlib.decompress(raw_data)
 
     @sentry_sdk.tracing.trace
     def delete(self, key):
@@ -29,7 +29,7 @@ from sentry.conf.types.role_dict import RoleDict
 from sentry.conf.types.sdk_config import ServerSdkConfig
 from sentry.conf.types.sentry_config import SentryMode
 from sentry.conf.types.service_options import ServiceOptions
-from sentry.conf.types.taskworker import ScheduleConfigMap
+from sentry.conf.types.taskworker import ChildPoolConfigMap, ScheduleConfigMap
 from sentry.conf.types.uptime import UptimeRegionConfig
 from sentry.utils.celery import make_split_task_queues
 
@@ -141,6 +141,8 @@ SENTRY_SPAN_BUFFER_CLUSTER = "default"
 SENTRY_ASSEMBLE_CLUSTER = "default"
 SENTRY_UPTIME_DETECTOR_CLUSTER = "default"
 SENTRY_WORKFLOW_ENGINE_REDIS_CLUSTER = "default"
+SENTRY_SEARCH_QUERY_STATE_REDIS_CLUSTER = "default"
+SENTRY_SNUBA_QUERY_COALESCING_REDIS_CLUSTER = "default"
 
 # Hosts that are allowed to use system token authentication.
 # http://en.wikipedia.org/wiki/Reserved_IP_addresses
@@ -1764,6 +1766,12 @@ TASKWORKER_HIGH_THROUGHPUT_NAMESPACES = {
     "ingest.errors",
 }
 
+# Partitions of taskworker child processes, keyed by processing pool name.
+# Each partition runs the namespaces and tasks assigned to it in its own
+# children, so that slow tasks don't delay fast ones. Tasks that don't
+# match a partition run in the default children of the worker.
+TASKWORKER_CHILD_POOLS: Mapping[str, ChildPoolConfigMap] = {}
+
 # Sentry logs to two major places: stdout, and its internal project.
 # To disable logging to the internal project, add a logger whose only
 # handler is 'console' and disable propagating upwards.
@@ -2161,6 +2169,8 @@ SENTRY_DEFAULT_MAX_EVENTS_PER_MINUTE = "90%"
 SENTRY_SNUBA = os.environ.get("SNUBA", "http://127.0.0.1:1218")
 SENTRY_SNUBA_TIMEOUT = 30
 SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
+# Size of the connection pool used by the asyncio Snuba transport, per event loop
+SENTRY_SNUBA_ASYNC_MAX_CONNECTIONS = 50
 
 # Node storage backend
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
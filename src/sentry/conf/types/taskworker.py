@@ -3,7 +3,7 @@ from __future__ import annotations
 import dataclasses
 from collections.abc import Mapping
 from datetime import timedelta
-from typing import TypedDict
+from typing import NotRequired, TypedDict
 
 
 @dataclasses.dataclass
@@ -37,3 +37,22 @@ class ScheduleConfig(TypedDict):
 
 ScheduleConfigMap = Mapping[str, ScheduleConfig]
 """A collection of schedule configuration, usually defined in application configuration"""
+
+
+class ChildPoolConfig(TypedDict):
+    """
+    A partition of the child processes of a taskworker.
+
+    Tasks in any of `namespaces`, or named in `tasks` as `namespace:taskname`,
+    are executed by the children of this partition.
+    """
+
+    namespaces: NotRequired[list[str]]
+    tasks: NotRequired[list[str]]
+    concurrency: int
+    max_child_task_count: NotRequired[int]
+    queue_maxsize: NotRequired[int]
+
+
+ChildPoolConfigMap = Mapping[str, ChildPoolConfig]
+"""A collection of child pool partitions keyed by partition name"""
@@ -75,6 +75,19 @@ def issue_occurrence_options() -> list[click.Option]:
     ]
 
 
+def query_subscription_options() -> list[click.Option]:
+    """Return a list of query subscription results consumer options."""
+    return [
+        *multiprocessing_options(default_max_batch_size=100),
+        click.Option(
+            ["--mode", "mode"],
+            type=click.Choice(["parallel", "batched"]),
+            default="parallel",
+            help="The mode to process subscription results in. Batched prefetches alert rule state for a whole batch of updates at once.",
+        ),
+    ]
+
+
 def ingest_replay_recordings_options() -> list[click.Option]:
     """Return a list of ingest-replay-recordings options."""
     options = multiprocessing_options(default_max_batch_size=10)
@@ -287,38 +300,38 @@ KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {
     "events-subscription-results": {
         "topic": Topic.EVENTS_SUBSCRIPTIONS_RESULTS,
         "strategy_factory": "sentry.snuba.query_subscriptions.run.QuerySubscriptionStrategyFactory",
-        "click_options": multiprocessing_options(default_max_batch_size=100),
+        "click_options": query_subscription_options(),
         "static_args": {"dataset": "events"},
     },
     "transactions-subscription-results": {
         "topic": Topic.TRANSACTIONS_SUBSCRIPTIONS_RESULTS,
         "strategy_factory": "sentry.snuba.query_subscriptions.run.QuerySubscriptionStrategyFactory",
-        "click_options": multiprocessing_options(default_max_batch_size=100),
+        "click_options": query_subscription_options(),
         "static_args": {"dataset": "transactions"},
     },
     "generic-metrics-subscription-results": {
         "topic": Topic.GENERIC_METRICS_SUBSCRIPTIONS_RESULTS,
         "validate_schema": True,
         "strategy_factory": "sentry.snuba.query_subscriptions.run.QuerySubscriptionStrategyFactory",
-        "click_options": multiprocessing_options(default_max_batch_size=100),
+        "click_options": query_subscription_options(),
         "static_args": {"dataset": "generic_metrics"},
     },
     "metrics-subscription-results": {
         "topic": Topic.METRICS_SUBSCRIPTIONS_RESULTS,
         "strategy_factory": "sentry.snuba.query_subscriptions.run.QuerySubscriptionStrategyFactory",
-        "click_options": multiprocessing_options(default_max_batch_size=100),
+        "click_options": query_subscription_options(),
         "static_args": {"dataset": "metrics"},
     },
     "eap-spans-subscription-results": {
         "topic": Topic.EAP_SPANS_SUBSCRIPTIONS_RESULTS,
         "strategy_factory": "sentry.snuba.query_subscriptions.run.QuerySubscriptionStrategyFactory",
-        "click_options": multiprocessing_options(default_max_batch_size=100),
+        "click_options": query_subscription_options(),
         "static_args": {"dataset": "events_analytics_platform"},
     },
     "subscription-results-eap-items": {
         "topic": Topic.EAP_ITEMS_SUBSCRIPTIONS_RESULTS,
         "strategy_factory": "sentry.snuba.query_subscriptions.run.QuerySubscriptionStrategyFactory",
-        "click_options": multiprocessing_options(default_max_batch_size=100),
+        "click_options": query_subscription_options(),
         "static_args": {
             "dataset": "events_analytics_platform",
             "topic_override": "subscription-results-eap-items",
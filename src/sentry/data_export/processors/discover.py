@@ -2,6 +2,7 @@ import logging
 
 from sentry_relay.consts import SPAN_STATUS_CODE_TO_NAME
 
+from sentry import options
 from sentry.api.utils import get_date_range_from_params
 from sentry.models.environment import Environment
 from sentry.models.group import Group
@@ -10,6 +11,7 @@ from sentry.search.events.fields import get_function_alias
 from sentry.search.events.types import SnubaParams
 from sentry.snuba import discover
 from sentry.snuba.utils import get_dataset
+from sentry.utils.snuba_columnar import ColumnarData
 
 from ..base import ExportError
 
@@ -84,6 +86,10 @@ class DiscoverProcessor:
         if dataset is None:
             dataset = discover
 
+        extra_kwargs = {}
+        if dataset is discover and options.get("data-export.discover.columnar-results"):
+            extra_kwargs["columnar_results"] = True
+
         def data_fn(offset, limit):
             return dataset.query(
                 selected_columns=fields,
@@ -97,11 +103,15 @@ class DiscoverProcessor:
                 auto_fields=True,
                 auto_aggregations=True,
                 use_aggregate_conditions=True,
+                **extra_kwargs,
             )
 
         return data_fn
 
     def handle_fields(self, result_list):
+        if isinstance(result_list, ColumnarData):
+            return self.handle_columnar_fields(result_list)
+
         # Find issue short_id if present
         # (originally in `/api/bases/organization_events.py`)
         new_result_list = result_list[:]
@@ -134,3 +144,32 @@ class DiscoverProcessor:
                     result[equation] = result.get(equation_alias)
 
         return new_result_list
+
+    def handle_columnar_fields(self, data):
+        """
+        Same as `handle_fields`, for results returned as `ColumnarData`.
+        """
+        columns = data.columns
+
+        if "issue" in self.header_fields and "issue.id" in columns:
+            issues = {
+                i.id: i.qualified_short_id
+                for i in Group.objects.filter(
+                    id__in=set(columns["issue.id"]),
+                    project__in=self.snuba_params.project_ids,
+                    project__organization_id=self.snuba_params.organization_id,
+                )
+            }
+            columns["issue"] = [issues.get(issue_id, "unknown") for issue_id in columns["issue.id"]]
+
+        if "transaction.status" in self.header_fields and "transaction.status" in columns:
+            columns["transaction.status"] = [
+                SPAN_STATUS_CODE_TO_NAME.get(status, "unknown")
+                for status in columns["transaction.status"]
+            ]
+
+        # Map equations back to their unaliased forms
+        for equation_alias, equation in self.equation_aliases.items():
+            columns[equation] = columns.get(equation_alias, [None] * len(data))
+
+        return data
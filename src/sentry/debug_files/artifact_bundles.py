@@ -20,6 +20,7 @@ from sentry.models.artifactbundle import (
     ProjectArtifactBundle,
     ReleaseArtifactBundle,
 )
+from sentry.models.files.disk_cache import file_cache
 from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.utils import metrics, redis
@@ -32,6 +33,9 @@ MAX_BUNDLES_QUERY = 5
 # A value of 3 means that the third upload will trigger indexing and backfill.
 INDEXING_THRESHOLD = 3
 
+# Number of rows inserted per query when bulk inserting the association and index rows of a bundle.
+BULK_INSERT_BATCH_SIZE = 1000
+
 # Number of days that determine whether an artifact bundle is ready for being renewed.
 AVAILABLE_FOR_RENEWAL_DAYS = 30
 
@@ -128,7 +132,7 @@ def index_urls_in_bundle(
 ):
     # We first open up the bundle and extract all the things we want to index from it.
     archive = existing_archive or ArtifactBundleArchive(
-        artifact_bundle.file.getfile(), build_memory_map=False
+        file_cache.open(artifact_bundle.file), build_memory_map=False
     )
     urls_to_index = []
     try:
@@ -171,7 +175,7 @@ def index_urls_in_bundle(
         # NOTE: The django ORM by default tries to batch *all* the inserts into a single query,
         # which is not quite that efficient. We want to have a fixed batch size,
         # which will result in a fixed number of unique `INSERT` queries.
-        ArtifactBundleIndex.objects.bulk_create(urls_to_index, batch_size=50)
+        ArtifactBundleIndex.objects.bulk_create(urls_to_index, batch_size=BULK_INSERT_BATCH_SIZE)
 
         # Mark the bundle as indexed
         ArtifactBundle.objects.filter(id=artifact_bundle.id).update(
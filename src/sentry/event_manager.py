@@ -2409,22 +2409,6 @@ def save_attachment(
     else:
         timestamp = datetime.now(timezone.utc)
 
-    try:
-        attachment.data
-    except MissingAttachmentChunks:
-        track_outcome(
-            org_id=project.organization_id,
-            project_id=project.id,
-            key_id=key_id,
-            outcome=Outcome.INVALID,
-            reason="missing_chunks",
-            timestamp=timestamp,
-            event_id=event_id,
-            category=DataCategory.ATTACHMENT,
-        )
-
-        logger.exception("Missing chunks for cache_key=%s", cache_key)
-        return
     from sentry import ratelimits as ratelimiter
 
     is_limited, _, _ = ratelimiter.backend.is_limited_with_value(
@@ -2459,7 +2443,24 @@ def save_attachment(
         )
         return
 
-    file = EventAttachment.putfile(project.id, attachment)
+    # The data is streamed from the attachment cache, so missing chunks only
+    # show up while storing it.
+    try:
+        file = EventAttachment.putfile(project.id, attachment)
+    except MissingAttachmentChunks:
+        track_outcome(
+            org_id=project.organization_id,
+            project_id=project.id,
+            key_id=key_id,
+            outcome=Outcome.INVALID,
+            reason="missing_chunks",
+            timestamp=timestamp,
+            event_id=event_id,
+            category=DataCategory.ATTACHMENT,
+        )
+
+        logger.exception("Missing chunks for cache_key=%s", cache_key)
+        return
 
     EventAttachment.objects.create(
         # lookup:
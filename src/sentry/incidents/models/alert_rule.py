@@ -121,6 +121,46 @@ class AlertRuleManager(BaseManager["AlertRule"]):
 
         return alert_rule
 
+    def get_for_subscriptions(
+        self, subscriptions: Collection[QuerySubscription]
+    ) -> dict[int, AlertRule]:
+        """
+        Bulk version of `get_for_subscription`. Returns a mapping of subscription id to
+        AlertRule, omitting subscriptions that have no AlertRule. Fetches everything it
+        can from cache and the rest with a single query.
+        """
+        cache_keys = {
+            subscription.id: self.__build_subscription_cache_key(subscription.id)
+            for subscription in subscriptions
+        }
+        cached = cache.get_many(list(cache_keys.values()))
+        alert_rules: dict[int, AlertRule] = {}
+        missing: list[QuerySubscription] = []
+        for subscription in subscriptions:
+            alert_rule = cached.get(cache_keys[subscription.id])
+            if alert_rule is None:
+                missing.append(subscription)
+            else:
+                alert_rules[subscription.id] = alert_rule
+
+        if missing:
+            rules_by_snuba_query_id = {
+                alert_rule.snuba_query_id: alert_rule
+                for alert_rule in AlertRule.objects.filter(
+                    snuba_query_id__in={subscription.snuba_query_id for subscription in missing}
+                )
+            }
+            to_cache = {}
+            for subscription in missing:
+                alert_rule = rules_by_snuba_query_id.get(subscription.snuba_query_id)
+                if alert_rule is not None:
+                    alert_rules[subscription.id] = alert_rule
+                    to_cache[cache_keys[subscription.id]] = alert_rule
+            if to_cache:
+                cache.set_many(to_cache, 3600)
+
+        return alert_rules
+
     @classmethod
     def clear_subscription_cache(cls, instance, **kwargs: Any) -> None:
         cache.delete(cls.__build_subscription_cache_key(instance.id))
@@ -285,6 +325,45 @@ class AlertRuleTriggerManager(BaseManager["AlertRuleTrigger"]):
             cache.set(cache_key, triggers, 3600)
         return triggers
 
+    def get_for_alert_rules(
+        self, alert_rules: Collection[AlertRule]
+    ) -> dict[int, list[AlertRuleTrigger]]:
+        """
+        Bulk version of `get_for_alert_rule`. Returns a mapping of alert rule id to its
+        AlertRuleTriggers, fetching from cache first and then hitting the database once
+        for any rules that weren't cached.
+        """
+        cache_keys = {
+            alert_rule.id: self._build_trigger_cache_key(alert_rule.id)
+            for alert_rule in alert_rules
+        }
+        cached = cache.get_many(list(cache_keys.values()))
+        triggers_by_rule: dict[int, list[AlertRuleTrigger]] = {}
+        missing_ids = []
+        for alert_rule_id, cache_key in cache_keys.items():
+            triggers = cached.get(cache_key)
+            if triggers is None:
+                missing_ids.append(alert_rule_id)
+            else:
+                triggers_by_rule[alert_rule_id] = triggers
+
+        if missing_ids:
+            fetched: dict[int, list[AlertRuleTrigger]] = {
+                alert_rule_id: [] for alert_rule_id in missing_ids
+            }
+            for trigger in AlertRuleTrigger.objects.filter(alert_rule_id__in=missing_ids):
+                fetched[trigger.alert_rule_id].append(trigger)
+            cache.set_many(
+                {
+                    cache_keys[alert_rule_id]: triggers
+                    for alert_rule_id, triggers in fetched.items()
+                },
+                3600,
+            )
+            triggers_by_rule.update(fetched)
+
+        return triggers_by_rule
+
     @classmethod
     def clear_trigger_cache(cls, instance: AlertRuleTrigger, **kwargs: Any) -> None:
         cache.delete(cls._build_trigger_cache_key(instance.alert_rule_id))
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from collections import defaultdict
 from datetime import datetime
 from enum import Enum
 from typing import ClassVar
@@ -81,6 +82,75 @@ class IncidentManager(BaseManager["Incident"]):
 
         return incident
 
+    def get_active_incidents(self, keys):
+        """
+        Bulk version of `get_active_incident`. Accepts a collection of
+        `(alert_rule, project, subscription)` tuples and returns a dict mapping each
+        `(alert_rule_id, project_id, subscription_id)` to the latest active incident, or
+        None. Shares the same cache entries as `get_active_incident`, and fetches all
+        cache misses with a single query.
+        """
+        cache_keys = {
+            (
+                alert_rule.id,
+                project.id,
+                subscription.id if subscription else None,
+            ): self._build_active_incident_cache_key(
+                alert_rule_id=alert_rule.id,
+                project_id=project.id,
+                subscription_id=(subscription.id if subscription else None),
+            )
+            for alert_rule, project, subscription in keys
+        }
+        cached = cache.get_many(list(cache_keys.values()))
+
+        results = {}
+        missing = []
+        for key, cache_key in cache_keys.items():
+            incident = cached.get(cache_key)
+            if incident is None:
+                missing.append(key)
+            else:
+                # Falsey values are the negative cache
+                results[key] = incident or None
+
+        if missing:
+            candidates = list(
+                Incident.objects.filter(
+                    type=IncidentType.ALERT_TRIGGERED.value,
+                    alert_rule_id__in={alert_rule_id for alert_rule_id, _, _ in missing},
+                    projects__id__in={project_id for _, project_id, _ in missing},
+                )
+                .exclude(status=IncidentStatus.CLOSED.value)
+                .distinct()
+                .order_by("-date_added")
+            )
+            project_ids_by_incident = defaultdict(set)
+            for incident_id, project_id in IncidentProject.objects.filter(
+                incident__in=candidates
+            ).values_list("incident_id", "project_id"):
+                project_ids_by_incident[incident_id].add(project_id)
+
+            # Candidates are ordered by `-date_added`, so the first one seen for a key is
+            # its latest active incident.
+            latest_incidents = {}
+            for candidate in candidates:
+                for project_id in project_ids_by_incident[candidate.id]:
+                    latest_incidents.setdefault(
+                        (candidate.alert_rule_id, project_id, candidate.subscription_id),
+                        candidate,
+                    )
+
+            to_cache = {}
+            for key in missing:
+                incident = latest_incidents.get(key)
+                results[key] = incident
+                # Set this to False so that we can have a negative cache as well.
+                to_cache[cache_keys[key]] = incident if incident is not None else False
+            cache.set_many(to_cache)
+
+        return results
+
     @classmethod
     def clear_active_incident_cache(cls, instance, **kwargs):
         # instance is an Incident
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import logging
 import operator
+from collections import defaultdict
 from collections.abc import Sequence
 from copy import deepcopy
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import TypeVar, cast
+from typing import Any, TypeVar, cast
 
 from django.conf import settings
 from django.db import router, transaction
@@ -100,19 +102,56 @@ class SubscriptionProcessor:
 
     def __init__(self, subscription: QuerySubscription) -> None:
         self.subscription = subscription
+        # When set, rule stats are accumulated in memory and written by the caller via
+        # `get_alert_rule_stats_update`, rather than after every update.
+        self.defer_stats_update = False
         try:
-            self.alert_rule = AlertRule.objects.get_for_subscription(subscription)
+            alert_rule = AlertRule.objects.get_for_subscription(subscription)
         except AlertRule.DoesNotExist:
             return
 
-        self.triggers = AlertRuleTrigger.objects.get_for_alert_rule(self.alert_rule)
+        triggers = AlertRuleTrigger.objects.get_for_alert_rule(alert_rule)
+        self._set_alert_rule_state(
+            alert_rule, triggers, get_alert_rule_stats(alert_rule, subscription, triggers)
+        )
+
+    @classmethod
+    def from_prefetched(
+        cls,
+        subscription: QuerySubscription,
+        state: PrefetchedAlertRuleState | None,
+    ) -> SubscriptionProcessor:
+        """
+        Builds a processor from state loaded in bulk by `prefetch_alert_rule_states`,
+        without issuing any queries. A `state` of None means the subscription has no
+        alert rule.
+        """
+        processor = cls.__new__(cls)
+        processor.subscription = subscription
+        processor.defer_stats_update = True
+        if state is None:
+            return processor
+
+        processor._set_alert_rule_state(state.alert_rule, state.triggers, state.stats)
+        processor.active_incident = state.active_incident
+        processor._incident_triggers = state.incident_triggers
+        return processor
+
+    def _set_alert_rule_state(
+        self,
+        alert_rule: AlertRule,
+        triggers: list[AlertRuleTrigger],
+        stats: tuple[datetime, dict[int, int], dict[int, int]],
+    ) -> None:
+        self.alert_rule = alert_rule
+        self.triggers = triggers
         self.triggers.sort(key=lambda trigger: trigger.alert_threshold)
 
         (
             self.last_update,
             self.trigger_alert_counts,
             self.trigger_resolve_counts,
-        ) = get_alert_rule_stats(self.alert_rule, self.subscription, self.triggers)
+        ) = stats
         self.orig_trigger_alert_counts = deepcopy(self.trigger_alert_counts)
         self.orig_trigger_resolve_counts = deepcopy(self.trigger_resolve_counts)
 
@@ -820,31 +859,198 @@ class SubscriptionProcessor:
                     status_method=IncidentStatusMethod.RULE_TRIGGERED,
                 )
 
+    def get_alert_rule_stats_update(self) -> AlertRuleStatsUpdate | None:
+        """
+        Returns the stats that need to be written for this alert rule and subscription,
+        containing only the trigger counts that have changed since they were loaded.
+        Returns None if there is no alert rule.
+        """
+        if not hasattr(self, "alert_rule"):
+            return None
+
+        return AlertRuleStatsUpdate(
+            alert_rule=self.alert_rule,
+            subscription=self.subscription,
+            last_update=self.last_update,
+            alert_counts={
+                trigger_id: alert_count
+                for trigger_id, alert_count in self.trigger_alert_counts.items()
+                if alert_count != self.orig_trigger_alert_counts[trigger_id]
+            },
+            resolve_counts={
+                trigger_id: alert_count
+                for trigger_id, alert_count in self.trigger_resolve_counts.items()
+                if alert_count != self.orig_trigger_resolve_counts[trigger_id]
+            },
+        )
+
     def update_alert_rule_stats(self) -> None:
         """
         Updates stats about the alert rule, if they're changed.
         :return:
         """
-        updated_trigger_alert_counts = {
-            trigger_id: alert_count
-            for trigger_id, alert_count in self.trigger_alert_counts.items()
-            if alert_count != self.orig_trigger_alert_counts[trigger_id]
-        }
-        updated_trigger_resolve_counts = {
-            trigger_id: alert_count
-            for trigger_id, alert_count in self.trigger_resolve_counts.items()
-            if alert_count != self.orig_trigger_resolve_counts[trigger_id]
-        }
+        if self.defer_stats_update:
+            return
 
+        stats_update = self.get_alert_rule_stats_update()
+        assert stats_update is not None
         update_alert_rule_stats(
-            self.alert_rule,
-            self.subscription,
-            self.last_update,
-            updated_trigger_alert_counts,
-            updated_trigger_resolve_counts,
+            stats_update.alert_rule,
+            stats_update.subscription,
+            stats_update.last_update,
+            stats_update.alert_counts,
+            stats_update.resolve_counts,
         )
 
 
+@dataclass(frozen=True)
+class PrefetchedAlertRuleState:
+    """
+    Everything `SubscriptionProcessor` loads when it is constructed, fetched in bulk
+    for a batch of subscriptions.
+    """
+
+    alert_rule: AlertRule
+    triggers: list[AlertRuleTrigger]
+    stats: tuple[datetime, dict[int, int], dict[int, int]]
+    active_incident: Incident | None
+    incident_triggers: dict[int, IncidentTrigger]
+
+
+@dataclass(frozen=True)
+class AlertRuleStatsUpdate:
+    alert_rule: AlertRule
+    subscription: QuerySubscription
+    last_update: datetime
+    alert_counts: dict[int, int]
+    resolve_counts: dict[int, int]
+
+
+def prefetch_alert_rule_states(
+    subscriptions: Sequence[QuerySubscription],
+) -> dict[int, PrefetchedAlertRuleState]:
+    """
+    Loads the alert rules, triggers, active incidents and rule stats for a batch of
+    subscriptions using bulk queries and a single redis pipeline. Subscriptions with no
+    alert rule are omitted from the result.
+    """
+    alert_rules = AlertRule.objects.get_for_subscriptions(subscriptions)
+    if not alert_rules:
+        return {}
+
+    subscriptions = [sub for sub in subscriptions if sub.id in alert_rules]
+    triggers_by_rule = AlertRuleTrigger.objects.get_for_alert_rules(
+        list({alert_rule.id: alert_rule for alert_rule in alert_rules.values()}.values())
+    )
+    # `get_for_alert_rules` may return the same cached lists for rules shared across
+    # subscriptions, and each processor sorts and mutates its own trigger list.
+    triggers_by_sub = {
+        sub.id: list(triggers_by_rule.get(alert_rules[sub.id].id, [])) for sub in subscriptions
+    }
+    stats = get_alert_rule_stats_many(
+        [(alert_rules[sub.id], sub, triggers_by_sub[sub.id]) for sub in subscriptions]
+    )
+
+    # Mirror `SubscriptionProcessor.active_incident`: prefer an incident for this
+    # subscription, falling back to one for the project with no subscription.
+    incident_keys = []
+    for sub in subscriptions:
+        incident_keys.append((alert_rules[sub.id], sub.project, sub))
+        incident_keys.append((alert_rules[sub.id], sub.project, None))
+    incidents = Incident.objects.get_active_incidents(incident_keys)
+    active_incidents: dict[int, Incident | None] = {}
+    for sub in subscriptions:
+        alert_rule_id = alert_rules[sub.id].id
+        active_incidents[sub.id] = incidents[(alert_rule_id, sub.project_id, sub.id)] or (
+            incidents[(alert_rule_id, sub.project_id, None)]
+        )
+
+    incident_triggers: dict[int, dict[int, IncidentTrigger]] = defaultdict(dict)
+    active_incident_ids = {
+        incident.id for incident in active_incidents.values() if incident is not None
+    }
+    if active_incident_ids:
+        for incident_trigger in IncidentTrigger.objects.filter(
+            incident_id__in=active_incident_ids
+        ).select_related("alert_rule_trigger"):
+            incident_triggers[incident_trigger.incident_id][
+                incident_trigger.alert_rule_trigger_id
+            ] = incident_trigger
+
+    states = {}
+    for sub, sub_stats in zip(subscriptions, stats):
+        active_incident = active_incidents[sub.id]
+        states[sub.id] = PrefetchedAlertRuleState(
+            alert_rule=alert_rules[sub.id],
+            triggers=triggers_by_sub[sub.id],
+            stats=sub_stats,
+            active_incident=active_incident,
+            incident_triggers=(
+                dict(incident_triggers[active_incident.id]) if active_incident else {}
+            ),
+        )
+    return states
+
+
+def process_subscription_updates(
+    updates: Sequence[tuple[QuerySubscriptionUpdate, QuerySubscription]],
+) -> None:
+    """
+    Batch equivalent of calling `SubscriptionProcessor(subscription).process_update(update)`
+    for each update. Alert rules, triggers, incidents and rule stats are prefetched for
+    the whole batch, updates for the same subscription are evaluated in order against
+    shared in-memory state, and all rule stats are written back in one redis pipeline
+    once the batch is processed.
+
+    If processing an update fails, the stats accumulated so far for that subscription
+    are written and its remaining updates fall back to being processed one at a time,
+    so a failure behaves the same way as it does outside of batch mode.
+    """
+    updates_by_sub: dict[int, list[QuerySubscriptionUpdate]] = defaultdict(list)
+    subscriptions: dict[int, QuerySubscription] = {}
+    for subscription_update, subscription in updates:
+        updates_by_sub[subscription.id].append(subscription_update)
+        subscriptions[subscription.id] = subscription
+
+    with metrics.timer("incidents.subscription_processor.prefetch_alert_rule_states"):
+        states = prefetch_alert_rule_states(list(subscriptions.values()))
+    metrics.distribution(
+        "incidents.subscription_processor.batch_size", len(updates), unit="element"
+    )
+
+    stats_updates: list[AlertRuleStatsUpdate] = []
+    for subscription_id, sub_updates in updates_by_sub.items():
+        subscription = subscriptions[subscription_id]
+        processor = SubscriptionProcessor.from_prefetched(subscription, states.get(subscription_id))
+        stats_update = processor.get_alert_rule_stats_update()
+        for i, subscription_update in enumerate(sub_updates):
+            try:
+                processor.process_update(subscription_update)
+            except Exception:
+                logger.exception(
+                    "Failed to process subscription update in batch",
+                    extra={"subscription_id": subscription_id},
+                )
+                if stats_update is not None:
+                    update_alert_rule_stats_many([stats_update])
+                stats_update = None
+                for remaining_update in sub_updates[i + 1 :]:
+                    try:
+                        SubscriptionProcessor(subscription).process_update(remaining_update)
+                    except Exception:
+                        logger.exception(
+                            "Failed to process subscription update",
+                            extra={"subscription_id": subscription_id},
+                        )
+                break
+            stats_update = processor.get_alert_rule_stats_update()
+
+        if stats_update is not None:
+            stats_updates.append(stats_update)
+
+    update_alert_rule_stats_many(stats_updates)
+
+
 def build_alert_rule_stat_keys(alert_rule: AlertRule, subscription: QuerySubscription) -> list[str]:
     """
     Builds keys for fetching stats about alert rules
@@ -905,6 +1111,37 @@ def get_alert_rule_stats(
     alert_rule_keys = build_alert_rule_stat_keys(alert_rule, subscription)
     trigger_keys = build_trigger_stat_keys(alert_rule, subscription, triggers)
     results = get_redis_client().mget(alert_rule_keys + trigger_keys)
+    return _parse_alert_rule_stats(results, triggers)
+
+
+def get_alert_rule_stats_many(
+    items: Sequence[tuple[AlertRule, QuerySubscription, list[AlertRuleTrigger]]],
+) -> list[tuple[datetime, dict[int, int], dict[int, int]]]:
+    """
+    Bulk version of `get_alert_rule_stats`. Fetches stats for each
+    `(alert_rule, subscription, triggers)` tuple with one pipelined round trip, and
+    returns the results in the same order.
+    """
+    if not items:
+        return []
+
+    pipeline = get_redis_client().pipeline(transaction=False)
+    for alert_rule, subscription, triggers in items:
+        # Keys for a single rule and project share a hash tag, so each mget is routed
+        # to a single node.
+        pipeline.mget(
+            build_alert_rule_stat_keys(alert_rule, subscription)
+            + build_trigger_stat_keys(alert_rule, subscription, triggers)
+        )
+    return [
+        _parse_alert_rule_stats(results, triggers)
+        for results, (_, _, triggers) in zip(pipeline.execute(), items)
+    ]
+
+
+def _parse_alert_rule_stats(
+    results: Sequence[str | None], triggers: list[AlertRuleTrigger]
+) -> tuple[datetime, dict[int, int], dict[int, int]]:
     results = tuple(0 if result is None else int(result) for result in results)
     last_update = to_datetime(results[0])
     trigger_results = results[1:]
@@ -931,7 +1168,40 @@ def update_alert_rule_stats(
     Updates stats about the alert rule, subscription and triggers if they've changed.
     """
     pipeline = get_redis_client().pipeline()
+    _add_alert_rule_stats_to_pipeline(
+        pipeline, alert_rule, subscription, last_update, alert_counts, resolve_counts
+    )
+    pipeline.execute()
+
+
+def update_alert_rule_stats_many(stats_updates: Sequence[AlertRuleStatsUpdate]) -> None:
+    """
+    Bulk version of `update_alert_rule_stats` that writes all updates in one pipeline.
+    """
+    if not stats_updates:
+        return
+
+    pipeline = get_redis_client().pipeline(transaction=False)
+    for stats_update in stats_updates:
+        _add_alert_rule_stats_to_pipeline(
+            pipeline,
+            stats_update.alert_rule,
+            stats_update.subscription,
+            stats_update.last_update,
+            stats_update.alert_counts,
+            stats_update.resolve_counts,
+        )
+    pipeline.execute()
 
+
+def _add_alert_rule_stats_to_pipeline(
+    pipeline: Any,
+    alert_rule: AlertRule,
+    subscription: QuerySubscription,
+    last_update: datetime,
+    alert_counts: dict[int, int],
+    resolve_counts: dict[int, int],
+) -> None:
     counts_with_stat_keys = zip(ALERT_RULE_TRIGGER_STAT_KEYS, (alert_counts, resolve_counts))
     for stat_key, trigger_counts in counts_with_stat_keys:
         for trigger_id, alert_count in trigger_counts.items():
@@ -945,7 +1215,6 @@ def update_alert_rule_stats(
 
     last_update_key = build_alert_rule_stat_keys(alert_rule, subscription)[0]
     pipeline.set(last_update_key, int(last_update.timestamp()), ex=REDIS_TTL)
-    pipeline.execute()
 
 
 def get_redis_client() -> RetryingRedisCluster:
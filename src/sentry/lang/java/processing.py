@@ -1,9 +1,11 @@
 import logging
 import re
-from collections.abc import Mapping
+import threading
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 import orjson
+from cachetools import TTLCache
 
 from sentry.attachments import CachedAttachment, attachment_cache
 from sentry.ingest.consumer.processors import CACHE_TIMEOUT
@@ -13,13 +15,24 @@ from sentry.lang.native.symbolicator import Symbolicator
 from sentry.models.eventerror import EventError
 from sentry.models.project import Project
 from sentry.models.release import Release
-from sentry.stacktraces.processing import find_stacktraces_in_data
+from sentry.stacktraces.processing import StacktraceInfo, find_stacktraces_in_data
 from sentry.utils import metrics
 from sentry.utils.cache import cache_key_for_event
 from sentry.utils.safe import get_path
 
 logger = logging.getLogger(__name__)
 
+# Deobfuscated class names of view hierarchy windows, keyed by project, ProGuard
+# mappings and obfuscated class name. ProGuard mappings never change for a UUID,
+# so entries only expire to bound memory and to pick up deleted mapping files.
+CLASS_NAME_CACHE_SIZE = 10_000
+CLASS_NAME_CACHE_TTL = 10 * 60
+
+_class_name_cache: TTLCache[tuple[int, tuple[str, ...], str], str] = TTLCache(
+    maxsize=CLASS_NAME_CACHE_SIZE, ttl=CLASS_NAME_CACHE_TTL
+)
+_class_name_cache_lock = threading.Lock()
+
 
 def deobfuscate_exception_value(data: Any) -> Any:
     # Deobfuscate the exception value by regex replacing
@@ -214,6 +227,77 @@ def _deobfuscate_view_hierarchies(
     return new_attachments
 
 
+def _get_cached_class_names(
+    project_id: int, proguard_uuids: tuple[str, ...], class_names: Sequence[str]
+) -> dict[str, str]:
+    """Returns the cached deobfuscated names of those `class_names` that are cached."""
+
+    if not proguard_uuids:
+        return {}
+
+    cached = {}
+    with _class_name_cache_lock:
+        for class_name in class_names:
+            mapped = _class_name_cache.get((project_id, proguard_uuids, class_name))
+            if mapped is not None:
+                cached[class_name] = mapped
+    return cached
+
+
+def _cache_class_names(
+    project_id: int,
+    proguard_uuids: tuple[str, ...],
+    class_names: Sequence[str],
+    mapped_class_names: Mapping[str, str],
+) -> None:
+    """Caches the deobfuscated names of `class_names`. Classes that are missing from
+    `mapped_class_names` are not obfuscated and are cached as themselves."""
+
+    if not proguard_uuids:
+        return
+
+    with _class_name_cache_lock:
+        for class_name in class_names:
+            _class_name_cache[(project_id, proguard_uuids, class_name)] = mapped_class_names.get(
+                class_name, class_name
+            )
+
+
+def clear_class_name_cache() -> None:
+    with _class_name_cache_lock:
+        _class_name_cache.clear()
+
+
+def _deduplicate_stacktraces(
+    stacktrace_infos: Sequence[StacktraceInfo], stacktraces: list[dict[str, Any]]
+) -> tuple[list[dict[str, Any]], list[int]]:
+    """Deduplicates identical thread stacktraces, e.g. of threads waiting in the same place.
+
+    Returns the unique stacktraces and, for every stacktrace in `stacktraces`, the index
+    of its unique stacktrace. Whole stacktraces are compared rather than single frames,
+    because remapping a frame can depend on the frames around it. Exception stacktraces
+    are never deduplicated, as their remapping can depend on the exception."""
+
+    unique_stacktraces: list[dict[str, Any]] = []
+    unique_indexes: dict[bytes, int] = {}
+    indexes = []
+
+    for sinfo, stacktrace in zip(stacktrace_infos, stacktraces):
+        if sinfo.is_exception:
+            indexes.append(len(unique_stacktraces))
+            unique_stacktraces.append(stacktrace)
+            continue
+
+        key = orjson.dumps(stacktrace["frames"], option=orjson.OPT_SORT_KEYS)
+        index = unique_indexes.get(key)
+        if index is None:
+            index = unique_indexes[key] = len(unique_stacktraces)
+            unique_stacktraces.append(stacktrace)
+        indexes.append(index)
+
+    return unique_stacktraces, indexes
+
+
 def map_symbolicator_process_jvm_errors(
     errors: list[dict[str, Any]] | None,
 ) -> list[dict[str, Any]]:
@@ -253,8 +337,9 @@ def map_symbolicator_process_jvm_errors(
 def process_jvm_stacktraces(symbolicator: Symbolicator, data: Any) -> Any:
     """Uses Symbolicator to symbolicate a JVM event."""
 
+    proguard_images = get_proguard_images(data)
     modules = []
-    modules.extend([{"uuid": id, "type": "proguard"} for id in get_proguard_images(data)])
+    modules.extend([{"uuid": id, "type": "proguard"} for id in proguard_images])
     modules.extend([{"uuid": id, "type": "source"} for id in get_jvm_images(data)])
 
     stacktrace_infos = find_stacktraces_in_data(data)
@@ -272,10 +357,17 @@ def process_jvm_stacktraces(symbolicator: Symbolicator, data: Any) -> Any:
     processable_exceptions = _get_exceptions_for_symbolication(data)
     cache_key = cache_key_for_event(data)
     attachments = [*attachment_cache.get(cache_key)]
-    window_class_names = _get_window_class_names(attachments)
+    window_class_names = list(dict.fromkeys(_get_window_class_names(attachments)))
 
     metrics.incr("proguard.symbolicator.events")
 
+    project_id = symbolicator.project.id
+    proguard_uuids = tuple(sorted(proguard_images))
+    cached_class_names = _get_cached_class_names(project_id, proguard_uuids, window_class_names)
+    uncached_class_names = [
+        class_name for class_name in window_class_names if class_name not in cached_class_names
+    ]
+
     if (
         not any(stacktrace["frames"] for stacktrace in stacktraces)
         and not processable_exceptions
@@ -284,6 +376,24 @@ def process_jvm_stacktraces(symbolicator: Symbolicator, data: Any) -> Any:
         metrics.incr("proguard.symbolicator.events.skipped")
         return
 
+    if (
+        not any(stacktrace["frames"] for stacktrace in stacktraces)
+        and not processable_exceptions
+        and not uncached_class_names
+    ):
+        # Only view hierarchies need deobfuscating, and all their classes are cached
+        metrics.incr("proguard.symbolicator.events.cached")
+        new_attachments = _deobfuscate_view_hierarchies(attachments, cached_class_names)
+        attachment_cache.set(cache_key, attachments=new_attachments, timeout=CACHE_TIMEOUT)
+        return data
+
+    unique_stacktraces, stacktrace_indexes = _deduplicate_stacktraces(stacktrace_infos, stacktraces)
+    if len(unique_stacktraces) < len(stacktraces):
+        metrics.incr(
+            "proguard.symbolicator.stacktraces.deduplicated",
+            amount=len(stacktraces) - len(unique_stacktraces),
+        )
+
     release_package = _get_release_package(symbolicator.project, data.get("release"))
     metrics.incr("process.java.symbolicate.request")
     response = symbolicator.process_jvm(
@@ -291,10 +401,10 @@ def process_jvm_stacktraces(symbolicator: Symbolicator, data: Any) -> Any:
         exceptions=[
             {"module": exc["module"], "type": exc["type"]} for exc in processable_exceptions
         ],
-        stacktraces=stacktraces,
+        stacktraces=unique_stacktraces,
         modules=modules,
         release_package=release_package,
-        classes=window_class_names,
+        classes=uncached_class_names,
     )
 
     if not _handle_response_status(data, response):
@@ -304,7 +414,8 @@ def process_jvm_stacktraces(symbolicator: Symbolicator, data: Any) -> Any:
     if processing_errors:
         data.setdefault("errors", []).extend(map_symbolicator_process_jvm_errors(processing_errors))
 
-    for sinfo, complete_stacktrace in zip(stacktrace_infos, response["stacktraces"]):
+    complete_stacktraces = [response["stacktraces"][index] for index in stacktrace_indexes]
+    for sinfo, complete_stacktrace in zip(stacktrace_infos, complete_stacktraces):
         raw_frames = sinfo.stacktrace["frames"]
         complete_frames = complete_stacktrace["frames"]
         new_frames = []
@@ -334,7 +445,12 @@ def process_jvm_stacktraces(symbolicator: Symbolicator, data: Any) -> Any:
         raw_exc["module"] = exc["module"]
         raw_exc["type"] = exc["type"]
 
-    classes = response.get("classes")
+    classes = response.get("classes") or {}
+    if not processing_errors:
+        # Without errors all ProGuard mappings were found, so the results are final
+        _cache_class_names(project_id, proguard_uuids, uncached_class_names, classes)
+
+    classes = {**cached_class_names, **classes}
     new_attachments = _deobfuscate_view_hierarchies(attachments, classes)
     attachment_cache.set(cache_key, attachments=new_attachments, timeout=CACHE_TIMEOUT)
 
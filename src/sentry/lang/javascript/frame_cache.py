@@ -0,0 +1,86 @@
+"""
+A cache of JavaScript frames symbolicated by Symbolicator.
+
+High volume frontends send the same minified frames over and over. Symbolicating a
+frame only depends on the frame itself and on the sourcemap it resolves to, so
+the results are cached per project, keyed by the sourcemap identity (the debug id
+of the minified file, or the release and dist it was uploaded to) and the frame's
+position in the minified file. Only frames that are missing from the cache are
+sent to Symbolicator. Frames with neither a debug id nor a release are resolved by
+scraping their URL, which can serve new content at any time, so they are never
+cached.
+
+Results are kept in Redis for "symbolicator.sourcemaps-frame-cache-ttl" seconds,
+with a small in-process cache in front of it. Only frames that were symbolicated
+without errors are cached, so uploading missing sourcemaps takes effect right
+away. Setting the TTL to 0 disables the cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import orjson
+
+from sentry.lang.native.frame_cache import FrameCache
+
+# Bump this to invalidate all cached frames, e.g. when the symbolicator response changes.
+FRAME_CACHE_VERSION = 1
+
+_frame_cache = FrameCache("JavaScript")
+
+
+def get_frame_cache_key(
+    project_id: int, release: str | None, dist: str | None, debug_id: str | None, frame: Any
+) -> str | None:
+    """
+    Returns the cache key of a frame sent to Symbolicator, or None if the frame can't
+    be cached.
+
+    The frame is identified by the debug id of the file it is in if there is one, and by
+    the release and dist the file was uploaded to otherwise.
+    """
+    if debug_id is not None:
+        sourcemap = ["debug_id", debug_id]
+    elif release:
+        sourcemap = ["release", release, dist]
+    else:
+        return None
+
+    position = [
+        frame.get("platform"),
+        frame.get("abs_path"),
+        frame.get("lineno"),
+        frame.get("colno"),
+        frame.get("function"),
+    ]
+    digest = hashlib.md5(orjson.dumps([sourcemap, position])).hexdigest()
+    return f"js-frame:{FRAME_CACHE_VERSION}:{project_id}:{digest}"
+
+
+def is_cacheable(complete_frame: Any) -> bool:
+    return bool((complete_frame.get("data") or {}).get("symbolicated"))
+
+
+def get_cached_frames(keys: Sequence[str]) -> dict[str, tuple[Any, Any]]:
+    """
+    Returns the cached `(raw_frame, complete_frame)` results for the given keys, looking
+    them up in the local cache first and in Redis second.
+    """
+    rv = {}
+    for key, (raw_frame, complete_frame) in _frame_cache.get_many(keys).items():
+        rv[key] = (raw_frame, complete_frame)
+    return rv
+
+
+def cache_frames(frames: Mapping[str, tuple[Any, Any]], ttl: int) -> None:
+    """
+    Stores `(raw_frame, complete_frame)` results by their keys.
+    """
+    _frame_cache.set_many(frames, ttl)
+
+
+def clear_local_cache() -> None:
+    _frame_cache.clear_local_cache()
@@ -2,7 +2,9 @@ import logging
 import re
 from typing import Any
 
+from sentry import options
 from sentry.debug_files.artifact_bundles import maybe_renew_artifact_bundles_from_processing
+from sentry.lang.javascript import frame_cache
 from sentry.lang.javascript.utils import JAVASCRIPT_PLATFORMS
 from sentry.lang.native.error import SymbolicationFailed, write_error
 from sentry.lang.native.symbolicator import Symbolicator
@@ -224,6 +226,67 @@ def _normalize_frame(raw_frame: Any) -> dict:
     return frame
 
 
+def _get_frame_cache_keys(
+    symbolicator: Symbolicator, data: Any, modules: Any, stacktraces: list[dict]
+) -> list[list[str | None]]:
+    debug_ids = {module["code_file"]: module["debug_id"] for module in modules}
+    project_id = symbolicator.project.id
+    release = data.get("release")
+    dist = data.get("dist")
+
+    return [
+        [
+            frame_cache.get_frame_cache_key(
+                project_id, release, dist, debug_ids.get(frame["abs_path"]), frame
+            )
+            for frame in stacktrace["frames"]
+        ]
+        for stacktrace in stacktraces
+    ]
+
+
+def _fill_cached_frames(
+    response: Any,
+    cache_keys: list[list[str | None]],
+    cached_frames: dict[str, tuple[Any, Any]],
+) -> dict[str, tuple[Any, Any]]:
+    """
+    Puts the cached frames back into the stacktraces of the symbolicator response, in
+    place of the frames that were not sent to symbolicator.
+
+    Returns the newly symbolicated frames that can be cached.
+    """
+    error_paths = {error.get("abs_path") for error in response.get("errors") or ()}
+    frames_to_cache = {}
+
+    for keys, raw_stacktrace, complete_stacktrace in zip(
+        cache_keys, response["raw_stacktraces"], response["stacktraces"]
+    ):
+        raw_frames = iter(raw_stacktrace["frames"])
+        complete_frames = iter(complete_stacktrace["frames"])
+        new_raw_frames = []
+        new_complete_frames = []
+        for key in keys:
+            if key is not None and (cached := cached_frames.get(key)) is not None:
+                raw_frame, complete_frame = cached
+            else:
+                raw_frame = next(raw_frames)
+                complete_frame = next(complete_frames)
+                if (
+                    key is not None
+                    and frame_cache.is_cacheable(complete_frame)
+                    and raw_frame.get("abs_path") not in error_paths
+                ):
+                    frames_to_cache[key] = (raw_frame, complete_frame)
+            new_raw_frames.append(raw_frame)
+            new_complete_frames.append(complete_frame)
+
+        raw_stacktrace["frames"] = new_raw_frames
+        complete_stacktrace["frames"] = new_complete_frames
+
+    return frames_to_cache
+
+
 def process_js_stacktraces(symbolicator: Symbolicator, data: Any) -> Any:
     modules = sourcemap_images_from_data(data)
 
@@ -245,17 +308,56 @@ def process_js_stacktraces(symbolicator: Symbolicator, data: Any) -> Any:
         metrics.incr("sourcemaps.symbolicator.events.skipped")
         return
 
-    metrics.incr("process.javascript.symbolicate.request")
-    response = symbolicator.process_js(
-        platform=data.get("platform"),
-        stacktraces=stacktraces,
-        modules=modules,
-        release=data.get("release"),
-        dist=data.get("dist"),
-    )
+    # Only send the frames to symbolicator which are not in the frame cache.
+    frame_cache_ttl = options.get("symbolicator.sourcemaps-frame-cache-ttl")
+    cache_keys = None
+    cached_frames: dict[str, tuple[Any, Any]] = {}
+    request_stacktraces = stacktraces
+    if frame_cache_ttl > 0:
+        cache_keys = _get_frame_cache_keys(symbolicator, data, modules, stacktraces)
+        cached_frames = frame_cache.get_cached_frames(
+            [key for keys in cache_keys for key in keys if key is not None]
+        )
+        request_stacktraces = [
+            {
+                "frames": [
+                    frame for frame, key in zip(st["frames"], keys) if key not in cached_frames
+                ]
+            }
+            for st, keys in zip(stacktraces, cache_keys)
+        ]
+
+        num_frames = sum(len(keys) for keys in cache_keys)
+        num_cached = sum(key in cached_frames for keys in cache_keys for key in keys)
+        tags = {"project_id": str(symbolicator.project.id)}
+        metrics.incr("sourcemaps.symbolicator.frame_cache.hit", amount=num_cached, tags=tags)
+        metrics.incr(
+            "sourcemaps.symbolicator.frame_cache.miss", amount=num_frames - num_cached, tags=tags
+        )
+
+    if any(stacktrace["frames"] for stacktrace in request_stacktraces):
+        metrics.incr("process.javascript.symbolicate.request")
+        response = symbolicator.process_js(
+            platform=data.get("platform"),
+            stacktraces=request_stacktraces,
+            modules=modules,
+            release=data.get("release"),
+            dist=data.get("dist"),
+        )
+
+        if not _handle_response_status(data, response):
+            return data
+    else:
+        # All frames are cached, there is nothing to ask symbolicator for.
+        response = {
+            "status": "completed",
+            "stacktraces": [{"frames": []} for _ in stacktraces],
+            "raw_stacktraces": [{"frames": []} for _ in stacktraces],
+        }
 
-    if not _handle_response_status(data, response):
-        return data
+    if cache_keys is not None:
+        frames_to_cache = _fill_cached_frames(response, cache_keys, cached_frames)
+        frame_cache.cache_frames(frames_to_cache, frame_cache_ttl)
 
     used_artifact_bundles = response.get("used_artifact_bundles", [])
     if used_artifact_bundles:
@@ -0,0 +1,138 @@
+"""
+A cache of native frames symbolicated by Symbolicator.
+
+Crashes of one build report the same frames over and over. Symbolicating a
+native frame only depends on the debug file of the image it is in and on the
+frame's address relative to that image, so the results are cached per project,
+keyed by the image's debug id and the image-relative address. Only frames that
+are missing from the cache are sent to Symbolicator.
+
+Results are kept in Redis for "symbolicator.native-frame-cache-ttl" seconds,
+with a small in-process cache in front of it. Setting the TTL to 0 disables the
+cache.
+
+`FrameCache` implements the storage and is shared with the JavaScript frame
+cache in `sentry.lang.javascript.frame_cache`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import orjson
+from cachetools import TTLCache
+from django.conf import settings
+
+from sentry.utils import redis
+
+logger = logging.getLogger(__name__)
+
+# Bump this to invalidate all cached frames, e.g. when the symbolicator response changes.
+FRAME_CACHE_VERSION = 1
+
+# The in-process cache keeps entries for at most this many seconds, so that entries
+# expiring in Redis do not live on in long running workers.
+LOCAL_CACHE_TTL = 60
+LOCAL_CACHE_SIZE = 10_000
+
+
+class FrameCache:
+    """
+    Stores symbolication results by key in Redis, with a small in-process cache in
+    front of it.
+
+    Values are stored serialized, also in the in-process cache, so every event gets
+    its own copy of them.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        local_cache_size: int = LOCAL_CACHE_SIZE,
+        local_cache_ttl: int = LOCAL_CACHE_TTL,
+    ) -> None:
+        self.name = name
+        self._local_cache: TTLCache[str, bytes] = TTLCache(
+            maxsize=local_cache_size, ttl=local_cache_ttl
+        )
+        self._local_cache_lock = threading.Lock()
+
+    def _get_redis_client(self):
+        return redis.redis_clusters.get(settings.SENTRY_DEBUG_FILES_REDIS_CLUSTER)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """
+        Returns the cached values of those keys that are cached, looking them up in the
+        in-process cache first and in Redis second.
+        """
+        found: dict[str, bytes] = {}
+        missing = []
+        with self._local_cache_lock:
+            for key in dict.fromkeys(keys):
+                value = self._local_cache.get(key)
+                if value is not None:
+                    found[key] = value
+                else:
+                    missing.append(key)
+
+        if missing:
+            try:
+                values = self._get_redis_client().mget(missing)
+            except Exception:
+                logger.exception("Failed to read cached %s frames", self.name)
+                values = [None] * len(missing)
+
+            with self._local_cache_lock:
+                for key, value in zip(missing, values):
+                    if value is not None:
+                        found[key] = value
+                        self._local_cache[key] = value
+
+        return {key: orjson.loads(value) for key, value in found.items()}
+
+    def set_many(self, values: Mapping[str, Any], ttl: int) -> None:
+        if not values:
+            return
+
+        serialized = {key: orjson.dumps(value) for key, value in values.items()}
+        with self._local_cache_lock:
+            self._local_cache.update(serialized)
+
+        try:
+            with self._get_redis_client().pipeline(transaction=False) as pipeline:
+                for key, value in serialized.items():
+                    pipeline.set(key, value, ex=ttl)
+                pipeline.execute()
+        except Exception:
+            logger.exception("Failed to cache %s frames", self.name)
+
+    def clear_local_cache(self) -> None:
+        with self._local_cache_lock:
+            self._local_cache.clear()
+
+
+native_frame_cache = FrameCache("native")
+
+
+def get_frame_cache_key(
+    project_id: int, debug_id: str, relative_addr: int, frame: Mapping[str, Any]
+) -> str:
+    """
+    Returns the cache key of a native frame sent to Symbolicator.
+
+    The frame is identified by the debug id of its image and its address relative to
+    the image. Its platform and instruction address adjustment are part of the key as
+    well, as they change how the frame is symbolicated.
+    """
+    position = [
+        debug_id,
+        relative_addr,
+        frame.get("platform"),
+        frame.get("adjust_instruction_addr"),
+    ]
+    digest = hashlib.md5(orjson.dumps(position)).hexdigest()
+    return f"native-frame:{FRAME_CACHE_VERSION}:{project_id}:{digest}"
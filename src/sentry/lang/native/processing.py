@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import bisect
 import logging
 import posixpath
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, Mapping, Sequence
 from typing import Any
 
 import sentry_sdk
@@ -11,6 +12,7 @@ from symbolic.exceptions import ParseDebugIdError
 
 from sentry import options
 from sentry.lang.native.error import SymbolicationFailed, write_error
+from sentry.lang.native.frame_cache import get_frame_cache_key, native_frame_cache
 from sentry.lang.native.symbolicator import Symbolicator
 from sentry.lang.native.utils import (
     get_event_attachment,
@@ -444,6 +446,183 @@ def get_frames_for_symbolication(
     return rv
 
 
+# Fields of symbolicated frames that are specific to the event rather than to the
+# image and address, and are not cached.
+EVENT_FRAME_FIELDS = (
+    "original_index",
+    "instruction_addr",
+    "addr_mode",
+    "package",
+    "trust",
+    "function_id",
+    "sym_addr",
+)
+
+
+def _parse_addr(addr: Any) -> int | None:
+    if isinstance(addr, int):
+        return addr
+    try:
+        return int(addr, 16)
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_image_ranges(modules: Sequence[Mapping[str, Any]]) -> list[tuple[int, int, int]]:
+    "Returns the `(start, end, index)` address ranges of the images, sorted by start address."
+
+    ranges = []
+    for idx, module in enumerate(modules):
+        start = _parse_addr(module.get("image_addr"))
+        size = module.get("image_size")
+        if start is not None and isinstance(size, int) and size > 0:
+            ranges.append((start, start + size, idx))
+    ranges.sort()
+    return ranges
+
+
+def _find_frame_image(
+    frame: Mapping[str, Any],
+    modules: Sequence[Mapping[str, Any]],
+    image_ranges: list[tuple[int, int, int]],
+) -> tuple[int, int] | None:
+    """Returns the index of the image the frame is in and the frame's address relative
+    to the image, or `None` if the image is unknown."""
+
+    addr = _parse_addr(frame.get("instruction_addr"))
+    if addr is None:
+        return None
+
+    addr_mode = frame.get("addr_mode")
+    if addr_mode is not None:
+        # `get_frames_for_symbolication` sanitizes relative addressing to "rel:<index>"
+        idx = int(addr_mode[4:])
+        return (idx, addr) if idx < len(modules) else None
+
+    pos = bisect.bisect_right(image_ranges, addr, key=lambda r: r[0]) - 1
+    if pos < 0:
+        return None
+    start, end, idx = image_ranges[pos]
+    return (idx, addr - start) if addr < end else None
+
+
+def _get_frame_cache_keys(
+    project_id: int, stacktraces: list[dict[str, Any]], modules: Sequence[Mapping[str, Any]]
+) -> list[list[tuple[str, int] | None]]:
+    """Returns the cache key and image index of every frame in `stacktraces`, or `None`
+    for frames that are not cached.
+
+    The first frame of a stacktrace is never cached, as its symbolication depends on
+    the registers and signal of the event."""
+
+    image_ranges = _get_image_ranges(modules)
+    cache_keys: list[list[tuple[str, int] | None]] = []
+    for stacktrace in stacktraces:
+        keys: list[tuple[str, int] | None] = []
+        for idx, frame in enumerate(stacktrace["frames"]):
+            image = _find_frame_image(frame, modules, image_ranges) if idx > 0 else None
+            debug_id = modules[image[0]].get("debug_id") if image is not None else None
+            if image is None or not debug_id:
+                keys.append(None)
+                continue
+            image_idx, relative_addr = image
+            keys.append(
+                (get_frame_cache_key(project_id, debug_id, relative_addr, frame), image_idx)
+            )
+        cache_keys.append(keys)
+    return cache_keys
+
+
+def _remove_cached_frames(
+    stacktraces: list[dict[str, Any]],
+    cache_keys: list[list[tuple[str, int] | None]],
+    cached_frames: Mapping[str, Any],
+) -> tuple[list[dict[str, Any]], list[list[int]]]:
+    """Returns the stacktraces to send to Symbolicator, without the cached frames, and
+    for every sent frame its index in `stacktraces`."""
+
+    sent_stacktraces = []
+    frame_indexes = []
+    for stacktrace, keys in zip(stacktraces, cache_keys):
+        indexes = [
+            idx for idx, key in enumerate(keys) if key is None or key[0] not in cached_frames
+        ]
+        sent_stacktraces.append(
+            {**stacktrace, "frames": [stacktrace["frames"][idx] for idx in indexes]}
+        )
+        frame_indexes.append(indexes)
+    return sent_stacktraces, frame_indexes
+
+
+def _fill_cached_frames(
+    response: dict[str, Any],
+    stacktraces: list[dict[str, Any]],
+    frame_indexes: list[list[int]],
+    cache_keys: list[list[tuple[str, int] | None]],
+    cached_frames: Mapping[str, Any],
+    modules: Sequence[Mapping[str, Any]],
+) -> dict[str, Any]:
+    """Adds the cached frames to a Symbolicator response for the stacktraces without
+    them, as if they had been sent to Symbolicator. Updates `response` in place.
+
+    Returns the cache entries for the newly symbolicated frames."""
+
+    complete_images = response["modules"]
+    new_entries = {}
+
+    for stacktrace_idx, complete_stacktrace in enumerate(response["stacktraces"]):
+        frames = stacktraces[stacktrace_idx]["frames"]
+        indexes = frame_indexes[stacktrace_idx]
+        complete_frames_by_idx: dict[int, list[dict[str, Any]]] = {}
+        for complete_frame in complete_stacktrace.get("frames") or ():
+            complete_frame["original_index"] = indexes[complete_frame["original_index"]]
+            complete_frames_by_idx.setdefault(complete_frame["original_index"], []).append(
+                complete_frame
+            )
+
+        complete_frames = complete_stacktrace.setdefault("frames", [])
+        for idx, key in enumerate(cache_keys[stacktrace_idx]):
+            if key is None:
+                continue
+            cache_key, image_idx = key
+            complete_image = complete_images[image_idx]
+            entry = cached_frames.get(cache_key)
+
+            if entry is not None:
+                # The image is unused if all of its frames were cached
+                if complete_image.get("debug_status") == "unused":
+                    complete_image.update(entry["image"])
+                for cached_frame in entry["frames"]:
+                    complete_frame = dict(cached_frame)
+                    complete_frame["original_index"] = idx
+                    for field in ("instruction_addr", "addr_mode", "trust", "function_id"):
+                        if (value := frames[idx].get(field)) is not None:
+                            complete_frame[field] = value
+                    if code_file := modules[image_idx].get("code_file"):
+                        complete_frame["package"] = code_file
+                    complete_frames.append(complete_frame)
+                continue
+
+            symbolicated = complete_frames_by_idx.get(idx)
+            if (
+                symbolicated
+                and all(frame.get("status") == "symbolicated" for frame in symbolicated)
+                and complete_image.get("debug_status") == "found"
+            ):
+                new_entries[cache_key] = {
+                    "frames": [
+                        {k: v for k, v in frame.items() if k not in EVENT_FRAME_FIELDS}
+                        for frame in symbolicated
+                    ],
+                    "image": {
+                        "debug_status": "found",
+                        "features": complete_image.get("features"),
+                    },
+                }
+
+    return new_entries
+
+
 def process_native_stacktraces(symbolicator: Symbolicator, data: Any) -> Any:
     stacktrace_infos = [
         stacktrace
@@ -471,14 +650,36 @@ def process_native_stacktraces(symbolicator: Symbolicator, data: Any) -> Any:
 
     signal = signal_from_data(data)
 
+    frame_cache_ttl = options.get("symbolicator.native-frame-cache-ttl")
+    sent_stacktraces = stacktraces
+    if frame_cache_ttl > 0:
+        cache_keys = _get_frame_cache_keys(symbolicator.project.id, stacktraces, modules)
+        cached_frames = native_frame_cache.get_many(
+            key[0] for keys in cache_keys for key in keys if key is not None
+        )
+        sent_stacktraces, frame_indexes = _remove_cached_frames(
+            stacktraces, cache_keys, cached_frames
+        )
+
+        num_frames = sum(len(stacktrace["frames"]) for stacktrace in stacktraces)
+        num_sent = sum(len(stacktrace["frames"]) for stacktrace in sent_stacktraces)
+        metrics.incr("process.native.symbolicate.frame_cache.hit", amount=num_frames - num_sent)
+        metrics.incr("process.native.symbolicate.frame_cache.miss", amount=num_sent)
+
     metrics.incr("process.native.symbolicate.request")
     response = symbolicator.process_payload(
-        platform=data.get("platform"), stacktraces=stacktraces, modules=modules, signal=signal
+        platform=data.get("platform"), stacktraces=sent_stacktraces, modules=modules, signal=signal
     )
 
     if not _handle_response_status(data, response):
         return data
 
+    if frame_cache_ttl > 0:
+        new_entries = _fill_cached_frames(
+            response, stacktraces, frame_indexes, cache_keys, cached_frames, modules
+        )
+        native_frame_cache.set_many(new_entries, frame_cache_ttl)
+
     # Emit Apple symbol stats
     apple_symbol_stats = response.get("apple_symbol_stats")
     if apple_symbol_stats:
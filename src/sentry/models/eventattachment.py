@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import itertools
 import mimetypes
+import tempfile
 from dataclasses import dataclass
 from hashlib import sha1
 from io import BytesIO
@@ -16,7 +18,7 @@ from sentry.backup.scopes import RelocationScope
 from sentry.db.models import BoundedBigIntegerField, Model, region_silo_model, sane_repr
 from sentry.db.models.fields.bounded import BoundedIntegerField
 from sentry.db.models.manager.base_query_set import BaseQuerySet
-from sentry.models.files.utils import get_size_and_checksum, get_storage
+from sentry.models.files.utils import get_storage
 from sentry.utils import metrics
 from sentry.utils.storage import measure_storage_put
 
@@ -46,6 +48,14 @@ class PutfileResult:
     blob_path: str | None = None
 
 
+# Attachments shorter than this can be stored inline, see `can_store_inline`.
+MAX_INLINE_SIZE = 192
+
+# Compressed attachments are buffered in memory up to this size before they are
+# uploaded, and spill over to a temporary file beyond it.
+MAX_SPOOLED_SIZE = 1024 * 1024
+
+
 def can_store_inline(data: bytes) -> bool:
     """
     Determines whether `data` can be stored inline
@@ -53,7 +63,7 @@ def can_store_inline(data: bytes) -> bool:
     That is the case when it is shorter than 192 bytes,
     and all the bytes are non-NULL ASCII.
     """
-    return len(data) < 192 and all(byte > 0x00 and byte < 0x7F for byte in data)
+    return len(data) < MAX_INLINE_SIZE and all(byte > 0x00 and byte < 0x7F for byte in data)
 
 
 @region_silo_model
@@ -138,37 +148,70 @@ class EventAttachment(Model):
 
     @classmethod
     def putfile(cls, project_id: int, attachment: CachedAttachment) -> PutfileResult:
+        """
+        Stores the attachment's data, reading it from the attachment cache chunk by
+        chunk. Its size and checksum are computed while it is compressed, so only
+        one chunk of the raw data is held in memory at a time.
+
+        Raises `MissingAttachmentChunks` if the data is incomplete, in which case
+        nothing is stored.
+        """
         from sentry.models.files import FileBlob
 
         content_type = normalize_content_type(attachment.content_type, attachment.name)
-        data = attachment.data
-
-        if len(data) == 0:
-            return PutfileResult(content_type=content_type, size=0, sha1=sha1().hexdigest())
-
-        blob = BytesIO(data)
-        size, checksum = get_size_and_checksum(blob)
-
-        metrics.distribution(
-            "storage.put.size",
-            size,
-            tags={"usecase": "attachments", "compression": "none"},
-            unit="byte",
-        )
-
-        if can_store_inline(data):
-            blob_path = ":" + data.decode()
+        chunks = attachment.iter_data()
+
+        # Read just enough of the data to know whether it can be stored inline
+        head = b""
+        for chunk in chunks:
+            head += chunk
+            if len(head) >= MAX_INLINE_SIZE:
+                break
         else:
-            blob_path = "eventattachments/v1/" + FileBlob.generate_unique_path()
-
+            if len(head) == 0:
+                return PutfileResult(content_type=content_type, size=0, sha1=sha1().hexdigest())
+
+            if can_store_inline(head):
+                metrics.distribution(
+                    "storage.put.size",
+                    len(head),
+                    tags={"usecase": "attachments", "compression": "none"},
+                    unit="byte",
+                )
+                return PutfileResult(
+                    content_type=content_type,
+                    size=len(head),
+                    sha1=sha1(head).hexdigest(),
+                    blob_path=":" + head.decode(),
+                )
+
+        blob_path = "eventattachments/v1/" + FileBlob.generate_unique_path()
+        size = 0
+        checksum = sha1()
+        compressor = zstandard.ZstdCompressor().compressobj()
+
+        with tempfile.SpooledTemporaryFile(max_size=MAX_SPOOLED_SIZE) as compressed_blob:
+            for chunk in itertools.chain([head], chunks):
+                size += len(chunk)
+                checksum.update(chunk)
+                compressed_blob.write(compressor.compress(chunk))
+            compressed_blob.write(compressor.flush())
+
+            metrics.distribution(
+                "storage.put.size",
+                size,
+                tags={"usecase": "attachments", "compression": "none"},
+                unit="byte",
+            )
+
+            compressed_size = compressed_blob.tell()
+            compressed_blob.seek(0)
             storage = get_storage()
-            compressed_blob = zstandard.compress(data)
-
-            with measure_storage_put(len(compressed_blob), "attachments", "zstd"):
-                storage.save(blob_path, BytesIO(compressed_blob))
+            with measure_storage_put(compressed_size, "attachments", "zstd"):
+                storage.save(blob_path, compressed_blob)
 
         return PutfileResult(
-            content_type=content_type, size=size, sha1=checksum, blob_path=blob_path
+            content_type=content_type, size=size, sha1=checksum.hexdigest(), blob_path=blob_path
         )
 
 
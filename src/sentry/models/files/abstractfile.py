@@ -6,9 +6,13 @@ import logging
 import mmap
 import os
 import tempfile
-from collections.abc import Sequence
-from concurrent.futures import ThreadPoolExecutor
+import time
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from hashlib import sha1
+from itertools import islice
 from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
 import sentry_sdk
@@ -17,6 +21,7 @@ from django.core.files.base import File as FileObj
 from django.db import IntegrityError, models, router, transaction
 from django.utils import timezone
 
+from sentry import options
 from sentry.backup.scopes import RelocationScope
 from sentry.celery import SentryTask
 from sentry.db.models import JSONField, Model, WrappingU32IntegerField
@@ -28,12 +33,50 @@ from sentry.utils import metrics
 logger = logging.getLogger(__name__)
 
 
+# Number of blobs a `ChunkedFileBlobIndexWrapper` keeps in memory, including the
+# neighbouring blob it downloads ahead of sequential reads.
+BLOB_CACHE_SIZE = 4
+
+
+def _read_blob(blob: AbstractFileBlob) -> bytes:
+    with blob.getfile() as blobfile:
+        return blobfile.read()
+
+
 class ChunkedFileBlobIndexWrapper:
-    def __init__(self, indexes, mode=None, prefetch=False, prefetch_to=None, delete=True):
+    """
+    A read-only, seekable file over the blobs of a file.
+
+    Without prefetching, blobs are downloaded on demand as reads reach them and
+    the most recently used ones are kept in memory, so seeking back and forth
+    (e.g. reading entries out of a zip archive) does not download a blob more
+    than once. Whenever a blob is downloaded, the one following it is downloaded
+    in the background.
+
+    With prefetching, the whole file is downloaded into a tempfile up front.
+    """
+
+    def __init__(
+        self,
+        indexes,
+        mode=None,
+        prefetch=False,
+        prefetch_to=None,
+        delete=True,
+        cache_size=BLOB_CACHE_SIZE,
+    ):
         # eager load from database incase its a queryset
         self._indexes = list(indexes)
+        # Empty blobs share their offset with the following blob, skip them when reading
+        self._read_indexes = [idx for idx in self._indexes if idx.blob.size]
+        self._offsets = [idx.offset for idx in self._read_indexes]
+        self._size = sum(idx.blob.size for idx in self._indexes)
         self._curfile = None
-        self._curidx = None
+        self._pos = 0
+        self._cache: OrderedDict[int, bytes | Future[bytes]] = OrderedDict()
+        self._cache_size = max(cache_size, 1)
+        self._pool: ThreadPoolExecutor | None = None
+        self._mmap: mmap.mmap | None = None
         if prefetch:
             self.prefetched = True
             self._prefetch(prefetch_to, delete)
@@ -58,23 +101,34 @@ class ChunkedFileBlobIndexWrapper:
         rv.seek(0)
         return rv
 
-    def _nextidx(self) -> None:
-        assert not self.prefetched, "this makes no sense"
-        old_file = self._curfile
-        try:
-            try:
-                self._curidx = next(self._idxiter)
-                self._curfile = self._curidx.blob.getfile()
-            except StopIteration:
-                self._curidx = None
-                self._curfile = None
-        finally:
-            if old_file is not None:
-                old_file.close()
+    def _get_blob(self, i: int) -> bytes:
+        entry = self._cache.pop(i, None)
+        if entry is None:
+            data = _read_blob(self._read_indexes[i].blob)
+        elif isinstance(entry, Future):
+            data = entry.result()
+        else:
+            data = entry
+        self._cache[i] = data
+
+        # Download the next blob while the caller reads this one
+        if self._cache_size > 1 and i + 1 < len(self._read_indexes) and i + 1 not in self._cache:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=1)
+            self._cache[i + 1] = self._pool.submit(_read_blob, self._read_indexes[i + 1].blob)
+            # Keep the blob being read as the most recently used one
+            self._cache.move_to_end(i)
+
+        while len(self._cache) > self._cache_size:
+            _, evicted = self._cache.popitem(last=False)
+            if isinstance(evicted, Future):
+                evicted.cancel()
+
+        return data
 
     @property
     def size(self):
-        return sum(i.blob.size for i in self._indexes)
+        return self._size
 
     def open(self) -> None:
         self.closed = False
@@ -108,13 +162,52 @@ class ChunkedFileBlobIndexWrapper:
                 exe.submit(fetch_file, idx.offset, idx.blob.getfile)
 
         mem.flush()
+        mem.close()
         self._curfile = f
 
+    def getbuffer(self) -> mmap.mmap | memoryview | None:
+        """
+        Returns a read-only buffer over the whole file if it is available
+        locally, or `None` if reading it would require downloading blobs.
+
+        A prefetched file is memory-mapped from its tempfile. Otherwise a buffer
+        is only returned once all blobs of the file are in memory. The buffer is
+        valid until the file is closed.
+        """
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+
+        if self.prefetched:
+            if self._mmap is None:
+                if self.size == 0:
+                    return memoryview(b"")
+                assert self._curfile is not None
+                self._mmap = mmap.mmap(self._curfile.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._mmap
+
+        blobs = []
+        for i in range(len(self._read_indexes)):
+            entry = self._cache.get(i)
+            if entry is None or (isinstance(entry, Future) and not entry.done()):
+                return None
+            blobs.append(entry.result() if isinstance(entry, Future) else entry)
+        return memoryview(b"".join(blobs))
+
     def close(self) -> None:
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Views of the map are still in use, it is closed once they are released
+                pass
+            self._mmap = None
         if self._curfile:
             self._curfile.close()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._cache.clear()
         self._curfile = None
-        self._curidx = None
         self.closed = True
 
     def _seek(self, pos):
@@ -127,21 +220,8 @@ class ChunkedFileBlobIndexWrapper:
 
         if pos < 0:
             raise OSError("Invalid argument")
-        if pos == 0 and not self._indexes:
-            # Empty file, there's no seeking to be done.
-            return
-
-        for n, idx in enumerate(self._indexes[::-1]):
-            if idx.offset <= pos:
-                if idx != self._curidx:
-                    self._idxiter = iter(self._indexes[-(n + 1) :])
-                    self._nextidx()
-                break
-        else:
-            raise ValueError("Cannot seek to pos")
-        assert self._curfile is not None
-        assert self._curidx is not None
-        self._curfile.seek(pos - self._curidx.offset)
+        self._pos = pos
+        return pos
 
     def seek(self, pos, whence=io.SEEK_SET):
         if whence == io.SEEK_SET:
@@ -159,11 +239,7 @@ class ChunkedFileBlobIndexWrapper:
         if self.prefetched:
             assert self._curfile is not None
             return self._curfile.tell()
-        if self._curfile is None:
-            return self.size
-        assert self._curidx is not None
-        assert self._curfile is not None
-        return self._curidx.offset + self._curfile.tell()
+        return self._pos
 
     def read(self, n=-1):
         if self.closed:
@@ -173,30 +249,52 @@ class ChunkedFileBlobIndexWrapper:
             assert self._curfile is not None
             return self._curfile.read(n)
 
-        result = bytearray()
-
-        # Read to the end of the file
         if n < 0:
-            while self._curfile is not None:
-                blob_result = self._curfile.read(32768)
-                if not blob_result:
-                    self._nextidx()
-                else:
-                    result.extend(blob_result)
-
-        # Read until a certain number of bytes are read
-        else:
-            while n > 0 and self._curfile is not None:
-                blob_result = self._curfile.read(min(n, 32768))
-                if not blob_result:
-                    self._nextidx()
-                else:
-                    n -= len(blob_result)
-                    result.extend(blob_result)
+            n = self.size - self._pos
+
+        result = bytearray()
+        while n > 0 and self._pos < self.size:
+            i = bisect_right(self._offsets, self._pos) - 1
+            blob = self._get_blob(i)
+            start = self._pos - self._offsets[i]
+            chunk = memoryview(blob)[start : start + n]
+            if not chunk:
+                # The blob is shorter than the index claims
+                break
+            result += chunk
+            self._pos += len(chunk)
+            n -= len(chunk)
 
         return bytes(result)
 
 
+def _iter_blob_contents(blobs: Sequence[AbstractFileBlob], read_ahead: int) -> Iterator[bytes]:
+    """Yield the contents of the blobs in order while the following blobs download
+    concurrently. At most `read_ahead` blobs are in flight (or downloaded but not yet
+    yielded) at once.
+    """
+    read_ahead = max(read_ahead, 1)
+    remaining = iter(blobs)
+    pending: deque[Future[bytes]] = deque()
+
+    pool = ThreadPoolExecutor(max_workers=read_ahead)
+    try:
+        for blob in islice(remaining, read_ahead):
+            pending.append(pool.submit(_read_blob, blob))
+
+        while pending:
+            contents = pending.popleft().result()
+
+            # Replace the blob we are about to yield with the next one.
+            for blob in islice(remaining, 1):
+                pending.append(pool.submit(_read_blob, blob))
+
+            yield contents
+    finally:
+        # Drop the queued downloads if assembly fails part way through.
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 BlobIndexType = TypeVar("BlobIndexType", bound=AbstractFileBlobIndex)
 BlobType = TypeVar("BlobType", bound=AbstractFileBlob)
 
@@ -234,6 +332,11 @@ class AbstractFile(Model, _Parent[BlobIndexType, BlobType]):
     @abc.abstractmethod
     def _create_blob_index(self, blob: BlobType, offset: int) -> BlobIndexType: ...
 
+    @abc.abstractmethod
+    def _create_blob_indexes(
+        self, blobs_with_offsets: Iterable[tuple[BlobType, int]]
+    ) -> Sequence[BlobIndexType]: ...
+
     @abc.abstractmethod
     def _create_blob_from_file(self, contents: ContentFile, logger: Any) -> BlobType: ...
 
@@ -332,50 +435,66 @@ class AbstractFile(Model, _Parent[BlobIndexType, BlobType]):
         """
         This creates a file, from file blobs and returns a temp file with the
         contents.
+
+        Blobs are downloaded concurrently, up to "filestore.assemble-read-ahead"
+        at a time, while the checksum and the temp file are fed in blob order.
         """
+        start = time.monotonic()
         tf = tempfile.NamedTemporaryFile()
 
+        try:
+            file_blobs_qs = self._get_blobs_by_id(blob_ids=file_blob_ids)
+
+            # Ensure blobs are in the order and duplication as provided
+            blobs_by_id = {blob.id: blob for blob in file_blobs_qs}
+            file_blobs = [blobs_by_id[blob_id] for blob_id in file_blob_ids]
+        except Exception:
+            tf.close()
+            # Most likely a `KeyError` like `SENTRY-11QP` because an `id` in
+            # `file_blob_ids` does suddenly not exist anymore
+            logger.exception("`FileBlob` disappeared during `assemble_file`")
+            raise
+
+        new_checksum = sha1(b"")
+        blobs_with_offsets = []
+        offset = 0
+        try:
+            read_ahead = options.get("filestore.assemble-read-ahead")
+            for blob, contents in zip(file_blobs, _iter_blob_contents(file_blobs, read_ahead)):
+                new_checksum.update(contents)
+                tf.write(contents)
+                blobs_with_offsets.append((blob, offset))
+                offset += len(contents)
+        except Exception:
+            tf.close()
+            raise
+
+        self.size = offset
+        self.checksum = new_checksum.hexdigest()
+
+        if checksum != self.checksum:
+            tf.close()
+            raise AssembleChecksumMismatch("Checksum mismatch")
+
         # All file tables are on the same connection and this lets us
         # bypass generics
         with transaction.atomic(using=router.db_for_write(type(self))):
             try:
-                file_blobs_qs = self._get_blobs_by_id(blob_ids=file_blob_ids)
-
-                # Ensure blobs are in the order and duplication as provided
-                blobs_by_id = {blob.id: blob for blob in file_blobs_qs}
-                file_blobs = [blobs_by_id[blob_id] for blob_id in file_blob_ids]
-            except Exception:
-                # Most likely a `KeyError` like `SENTRY-11QP` because an `id` in
-                # `file_blob_ids` does suddenly not exist anymore
-                logger.exception("`FileBlob` disappeared during `assemble_file`")
+                self._create_blob_indexes(blobs_with_offsets)
+            except IntegrityError:
+                tf.close()
+                # Most likely a `ForeignKeyViolation` like `SENTRY-11P5`, because
+                # the blob we want to link does not exist anymore
+                logger.exception("`FileBlob` disappeared trying to link `FileBlobIndex`")
                 raise
 
-            new_checksum = sha1(b"")
-            offset = 0
-            for blob in file_blobs:
-                try:
-                    self._create_blob_index(blob=blob, offset=offset)
-                except IntegrityError:
-                    # Most likely a `ForeignKeyViolation` like `SENTRY-11P5`, because
-                    # the blob we want to link does not exist anymore
-                    logger.exception("`FileBlob` disappeared trying to link `FileBlobIndex`")
-                    raise
-
-                with blob.getfile() as blobfile:
-                    for chunk in blobfile.chunks():
-                        new_checksum.update(chunk)
-                        tf.write(chunk)
-                offset += blob.size
-
-            self.size = offset
-            self.checksum = new_checksum.hexdigest()
-
-            if checksum != self.checksum:
-                tf.close()
-                raise AssembleChecksumMismatch("Checksum mismatch")
+            self.save()
 
+        duration = time.monotonic() - start
         metrics.distribution("filestore.file-size", offset, unit="byte")
-        self.save()
+        metrics.distribution("filestore.assemble.duration", duration, unit="second")
+        if duration > 0:
+            metrics.distribution("filestore.assemble.throughput", offset / duration / (1024 * 1024))
 
         tf.flush()
         tf.seek(0)
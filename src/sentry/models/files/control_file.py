@@ -1,4 +1,4 @@
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from typing import Any
 
 from django.core.files.base import ContentFile
@@ -34,6 +34,16 @@ class ControlFile(AbstractFile[ControlFileBlobIndex, ControlFileBlob]):
     def _create_blob_index(self, blob: ControlFileBlob, offset: int) -> ControlFileBlobIndex:
         return ControlFileBlobIndex.objects.create(file=self, blob=blob, offset=offset)
 
+    def _create_blob_indexes(
+        self, blobs_with_offsets: Iterable[tuple[ControlFileBlob, int]]
+    ) -> Sequence[ControlFileBlobIndex]:
+        return ControlFileBlobIndex.objects.bulk_create(
+            [
+                ControlFileBlobIndex(file=self, blob=blob, offset=offset)
+                for blob, offset in blobs_with_offsets
+            ]
+        )
+
     def _create_blob_from_file(self, contents: ContentFile, logger: Any) -> ControlFileBlob:
         return ControlFileBlob.from_file(contents, logger)
 
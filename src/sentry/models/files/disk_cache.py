@@ -0,0 +1,177 @@
+"""
+A content-addressed cache of file contents on the local disk of worker hosts.
+
+Files are cached by their checksum, so every `File` with the same contents
+shares one cache entry and an entry never has to be invalidated. All processes
+on a host share the cache directory:
+
+- Entries are written to a tempfile next to their final path and moved into
+  place, so readers never see a partially written entry.
+- Downloads of the same entry are serialized with file locks, so concurrent
+  readers of a hot file wait for one download instead of each fetching it.
+- Reading an entry updates its modification time. When the cache grows past
+  "filestore.cache-limit" bytes, the least recently used entries are removed.
+
+The cache is disabled while "filestore.cache-limit" is 0.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import IO, TYPE_CHECKING
+
+from sentry import options
+from sentry.utils import metrics
+
+if TYPE_CHECKING:
+    from sentry.models.files.abstractfile import AbstractFile
+
+# Downloads lock one of 256 lock files, picked by the first two characters of
+# the checksum, so the number of lock files stays bounded.
+LOCK_DIR = ".locks"
+EVICTION_LOCK = ".eviction.lock"
+
+# Tempfiles left behind by processes that died while writing an entry are
+# removed during eviction once they are this old.
+STALE_TEMPFILE_AGE = 60 * 60
+
+
+@contextmanager
+def _flock(path: str, blocking: bool = True) -> Iterator[bool]:
+    with open(path, "a") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class FileDiskCache:
+    @property
+    def cache_path(self) -> str:
+        return options.get("filestore.cache-path")
+
+    @property
+    def cache_limit(self) -> int:
+        return options.get("filestore.cache-limit")
+
+    def get_entry_path(self, checksum: str) -> str:
+        return os.path.join(self.cache_path, checksum[:2], checksum)
+
+    def _get_lock_path(self, checksum: str) -> str:
+        lock_dir = os.path.join(self.cache_path, LOCK_DIR)
+        os.makedirs(lock_dir, exist_ok=True)
+        return os.path.join(lock_dir, checksum[:2])
+
+    def _open_entry(self, path: str) -> IO[bytes] | None:
+        try:
+            fp = open(path, "rb")
+        except FileNotFoundError:
+            return None
+
+        # Mark the entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return fp
+
+    def open(self, file: AbstractFile) -> IO[bytes]:
+        """
+        Returns a readable file object for the contents of the file, reading
+        them from the cache and downloading them into it first if needed.
+
+        Files without a checksum, files larger than the cache and all files
+        while the cache is disabled are read from filestore instead.
+        """
+        cache_limit = self.cache_limit
+        if cache_limit <= 0 or not file.checksum or (file.size or 0) > cache_limit:
+            return file.getfile()
+
+        path = self.get_entry_path(file.checksum)
+        fp = self._open_entry(path)
+        if fp is not None:
+            metrics.incr("filestore.cache", tags={"hit": "true"})
+            return fp
+
+        with _flock(self._get_lock_path(file.checksum)):
+            # Another process may have downloaded the file while we waited for the lock
+            fp = self._open_entry(path)
+            if fp is not None:
+                metrics.incr("filestore.cache", tags={"hit": "true"})
+                return fp
+
+            metrics.incr("filestore.cache", tags={"hit": "false"})
+            file.save_to(path)
+            fp = open(path, "rb")
+
+        self.evict(cache_limit)
+        return fp
+
+    def evict(self, cache_limit: int | None = None) -> None:
+        """
+        Removes the least recently used entries until the cache fits into its
+        size limit. Only one process evicts at a time, others skip eviction.
+        """
+        if cache_limit is None:
+            cache_limit = self.cache_limit
+        cache_path = self.cache_path
+
+        try:
+            os.makedirs(cache_path, exist_ok=True)
+        except OSError:
+            return
+
+        with _flock(os.path.join(cache_path, EVICTION_LOCK), blocking=False) as locked:
+            if not locked:
+                return
+
+            now = time.time()
+            entries = []
+            total_size = 0
+            for folder in os.scandir(cache_path):
+                if folder.name == LOCK_DIR or not folder.is_dir():
+                    continue
+                for entry in os.scandir(folder.path):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    if entry.name.startswith("."):
+                        if stat.st_mtime < now - STALE_TEMPFILE_AGE:
+                            _remove(entry.path)
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total_size += stat.st_size
+
+            if total_size <= cache_limit:
+                return
+
+            entries.sort()
+            evicted = 0
+            for _, size, path in entries:
+                if total_size <= cache_limit:
+                    break
+                _remove(path)
+                total_size -= size
+                evicted += 1
+
+            metrics.incr("filestore.cache.evicted", amount=evicted)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+file_cache = FileDiskCache()
@@ -1,4 +1,4 @@
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from typing import Any
 
 from django.core.files.base import ContentFile
@@ -37,6 +37,16 @@ class File(AbstractFile[FileBlobIndex, FileBlob]):
     def _create_blob_index(self, blob: FileBlob, offset: int) -> FileBlobIndex:
         return FileBlobIndex.objects.create(file=self, blob=blob, offset=offset)
 
+    def _create_blob_indexes(
+        self, blobs_with_offsets: Iterable[tuple[FileBlob, int]]
+    ) -> Sequence[FileBlobIndex]:
+        return FileBlobIndex.objects.bulk_create(
+            [
+                FileBlobIndex(file=self, blob=blob, offset=offset)
+                for blob, offset in blobs_with_offsets
+            ]
+        )
+
     def _create_blob_from_file(self, contents: ContentFile, logger: Any) -> FileBlob:
         return FileBlob.from_file(contents, logger)
 
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
+from itertools import batched
 
 from arroyo.backends.kafka import KafkaPayload
 from django.db.models import Q
 from sentry_kafka_schemas.schema_types.monitors_clock_tasks_v1 import MarkMissing
 
 from sentry.constants import ObjectStatus
+from sentry.monitors import schedule_index
 from sentry.monitors.logic.mark_failed import mark_failed
 from sentry.monitors.models import CheckInStatus, MonitorCheckIn, MonitorEnvironment, MonitorStatus
 from sentry.monitors.schedule import get_prev_schedule
@@ -24,6 +26,10 @@ logger = logging.getLogger(__name__)
 # monitors the larger the number of checkins to check will exist.
 MONITOR_LIMIT = 10_000
 
+# The number of monitor environments popped from the schedule index that are
+# verified against Postgres in a single query.
+INDEX_VERIFY_BATCH_SIZE = 1_000
+
 # re-use the monitor exclusion query node across dispatch_check_missing and
 # mark_environment_missing.
 IGNORE_MONITORS = ~Q(
@@ -49,39 +55,72 @@ def dispatch_check_missing(ts: datetime):
 
     This will dispatch MarkMissing messages into monitors-clock-tasks.
     """
-    missed_envs = list(
-        MonitorEnvironment.objects.filter(
-            IGNORE_MONITORS,
-            next_checkin_latest__lte=ts,
-        ).values(
-            "id"
-        )[:MONITOR_LIMIT]
-    )
+    if schedule_index.use_schedule_index(ts):
+        missed_env_ids = _get_indexed_missed_environments(ts)
+    else:
+        missed_env_ids = list(
+            MonitorEnvironment.objects.filter(
+                IGNORE_MONITORS,
+                next_checkin_latest__lte=ts,
+            ).values_list("id", flat=True)[:MONITOR_LIMIT]
+        )
+        # Drop the dispatched environments from the index so the next index
+        # tick does not dispatch them a second time. Environments beyond the
+        # limit stay indexed and are picked up by a later tick.
+        schedule_index.unschedule_missed_many(missed_env_ids)
 
     metrics.gauge(
         "sentry.monitors.tasks.check_missing.count",
-        len(missed_envs),
+        len(missed_env_ids),
         sample_rate=1.0,
     )
 
-    for monitor_environment in missed_envs:
+    for monitor_environment_id in missed_env_ids:
         message: MarkMissing = {
             "type": "mark_missing",
             "ts": ts.timestamp(),
-            "monitor_environment_id": monitor_environment["id"],
+            "monitor_environment_id": monitor_environment_id,
         }
         # XXX(epurkhiser): Partitioning by monitor_environment.id is important
         # here as these task messages will be consumed in a multi-consumer
         # setup. If we backlogged clock-ticks we may produce multiple missed
         # tasks for the same monitor_environment. These MUST happen in-order.
         payload = KafkaPayload(
-            str(monitor_environment["id"]).encode(),
+            str(monitor_environment_id).encode(),
             MONITORS_CLOCK_TASKS_CODEC.encode(message),
             [],
         )
         produce_task(payload)
 
 
+def _get_indexed_missed_environments(ts: datetime) -> list[int]:
+    """
+    Pops the monitor environments due at this tick from the schedule index and
+    verifies them against Postgres. Environments that were moved forward since
+    they were indexed (margin changes, newer check-ins) are re-scheduled at
+    their current next_checkin_latest.
+    """
+    missed_env_ids: list[int] = []
+    reschedule: dict[int, datetime] = {}
+
+    for env_ids in batched(schedule_index.pop_due_missed(ts), INDEX_VERIFY_BATCH_SIZE):
+        monitor_environments = MonitorEnvironment.objects.filter(
+            IGNORE_MONITORS,
+            id__in=env_ids,
+        ).values_list("id", "next_checkin_latest")
+
+        for monitor_environment_id, next_checkin_latest in monitor_environments:
+            if next_checkin_latest is None:
+                continue
+            if next_checkin_latest <= ts:
+                missed_env_ids.append(monitor_environment_id)
+            else:
+                reschedule[monitor_environment_id] = next_checkin_latest
+
+    schedule_index.schedule_missed_many(reschedule.items())
+    return missed_env_ids
+
+
 def mark_environment_missing(monitor_environment_id: int, ts: datetime):
     logger.info("mark_missing", extra={"monitor_environment_id": monitor_environment_id})
 
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
+from itertools import batched
+from typing import Any
 
 from arroyo.backends.kafka import KafkaPayload
 from sentry_kafka_schemas.schema_types.monitors_clock_tasks_v1 import MarkTimeout
 
+from sentry.monitors import schedule_index
 from sentry.monitors.logic.mark_failed import mark_failed
 from sentry.monitors.models import CheckInStatus, MonitorCheckIn
 from sentry.monitors.schedule import get_prev_schedule
@@ -21,6 +24,10 @@ logger = logging.getLogger(__name__)
 # monitors the larger the number of checkins to check will exist.
 CHECKINS_LIMIT = 10_000
 
+# The number of check-ins popped from the schedule index that are verified
+# against Postgres in a single query.
+INDEX_VERIFY_BATCH_SIZE = 1_000
+
 
 def dispatch_check_timeout(ts: datetime):
     """
@@ -29,14 +36,20 @@ def dispatch_check_timeout(ts: datetime):
 
     This will dispatch MarkTimeout messages into monitors-clock-tasks.
     """
-    timed_out_checkins = list(
-        MonitorCheckIn.objects.filter(
-            status=CheckInStatus.IN_PROGRESS,
-            timeout_at__lte=ts,
-        ).values(
-            "id", "monitor_environment_id"
-        )[:CHECKINS_LIMIT]
-    )
+    timed_out_checkins: list[dict[str, Any]]
+    if schedule_index.use_schedule_index(ts):
+        timed_out_checkins = _get_indexed_timed_out_checkins(ts)
+    else:
+        timed_out_checkins = list(
+            MonitorCheckIn.objects.filter(
+                status=CheckInStatus.IN_PROGRESS,
+                timeout_at__lte=ts,
+            ).values("id", "monitor_environment_id")[:CHECKINS_LIMIT]
+        )
+        # Drop the dispatched check-ins from the index so the next index tick
+        # does not dispatch them a second time. Check-ins beyond the limit
+        # stay indexed and are picked up by a later tick.
+        schedule_index.unschedule_timeout_many(checkin["id"] for checkin in timed_out_checkins)
 
     metrics.gauge(
         "sentry.monitors.tasks.check_timeout.count",
@@ -64,6 +77,39 @@ def dispatch_check_timeout(ts: datetime):
         produce_task(payload)
 
 
+def _get_indexed_timed_out_checkins(ts: datetime) -> list[dict[str, Any]]:
+    """
+    Pops the check-ins timing out at this tick from the schedule index and
+    verifies they are still in-progress. Check-ins whose timeout was pushed
+    back since they were indexed are re-scheduled at their current timeout_at.
+    """
+    timed_out_checkins: list[dict[str, Any]] = []
+    reschedule: dict[int, datetime] = {}
+
+    for checkin_ids in batched(schedule_index.pop_due_timeouts(ts), INDEX_VERIFY_BATCH_SIZE):
+        checkins = MonitorCheckIn.objects.filter(
+            id__in=checkin_ids,
+            status=CheckInStatus.IN_PROGRESS,
+        ).values("id", "monitor_environment_id", "timeout_at")
+
+        for checkin in checkins:
+            timeout_at = checkin["timeout_at"]
+            if timeout_at is None:
+                continue
+            if timeout_at <= ts:
+                timed_out_checkins.append(
+                    {
+                        "id": checkin["id"],
+                        "monitor_environment_id": checkin["monitor_environment_id"],
+                    }
+                )
+            else:
+                reschedule[checkin["id"]] = timeout_at
+
+    schedule_index.schedule_timeout_many(reschedule.items())
+    return timed_out_checkins
+
+
 def mark_checkin_timeout(checkin_id: int, ts: datetime) -> None:
     logger.info("checkin_timeout", extra={"checkin_id": checkin_id})
 
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import Sequence
+
+from sentry.models.environment import Environment
+from sentry.models.project import Project
+from sentry.monitors.models import Monitor, MonitorCheckIn, MonitorEnvironment
+from sentry.monitors.types import CheckinItem
+from sentry.utils import metrics
+
+
+class CheckinBatchState:
+    """
+    Monitors, monitor environments and check-in GUIDs for a batch of check-ins,
+    loaded with a few bulk queries instead of a set of queries per check-in.
+
+    Each value is handed out once. The first check-in of a group that uses a
+    value may modify it (upserting a monitor, creating a check-in, marking an
+    environment OK) so later check-ins fall back to querying the database, the
+    same as they would without a batch state.
+    """
+
+    def __init__(
+        self,
+        monitors: dict[tuple[int, str], Monitor | None],
+        monitor_environments: dict[tuple[int, int], MonitorEnvironment],
+        new_guids: set[uuid.UUID],
+    ) -> None:
+        self._monitors = monitors
+        self._monitor_environments = monitor_environments
+        self._new_guids = new_guids
+
+    @classmethod
+    def load(cls, items: Sequence[CheckinItem]) -> CheckinBatchState:
+        with metrics.timer("monitors.checkin.batch_state.load"):
+            monitors: dict[tuple[int, str], Monitor | None] = {
+                (int(item.message["project_id"]), item.valid_monitor_slug): None for item in items
+            }
+            queryset = Monitor.objects.filter(
+                project_id__in={project_id for project_id, _ in monitors},
+                slug__in={slug for _, slug in monitors},
+            )
+            for monitor in queryset:
+                key = (monitor.project_id, monitor.slug)
+                if key in monitors:
+                    monitors[key] = monitor
+
+            monitor_ids = [monitor.id for monitor in monitors.values() if monitor is not None]
+            monitor_environments = {
+                (monitor_env.monitor_id, monitor_env.environment_id): monitor_env
+                for monitor_env in MonitorEnvironment.objects.filter(monitor_id__in=monitor_ids)
+            }
+
+            guids = set()
+            for item in items:
+                try:
+                    guid = uuid.UUID(item.payload["check_in_id"])
+                except (KeyError, ValueError):
+                    continue
+                if guid.int != 0:
+                    guids.add(guid)
+            existing_guids = set(
+                MonitorCheckIn.objects.filter(guid__in=guids).values_list("guid", flat=True)
+            )
+
+        return cls(monitors, monitor_environments, guids - existing_guids)
+
+    def take_monitor(self, project: Project, monitor_slug: str) -> tuple[bool, Monitor | None]:
+        """
+        Returns whether the monitor was loaded, and the monitor if it exists.
+        """
+        try:
+            monitor = self._monitors.pop((project.id, monitor_slug))
+        except KeyError:
+            return False, None
+        if monitor is not None and monitor.organization_id != project.organization_id:
+            return False, None
+        return True, monitor
+
+    def take_monitor_environment(
+        self, project: Project, monitor: Monitor, environment_name: str | None
+    ) -> MonitorEnvironment | None:
+        """
+        Returns the monitor environment if it existed when the batch was loaded.
+        """
+        environment_name = environment_name or "production"
+        if not Environment.is_valid_name(environment_name):
+            return None
+        environment = Environment.get_or_create(project=project, name=environment_name)
+
+        monitor_environment = self._monitor_environments.pop((monitor.id, environment.id), None)
+        if monitor_environment is not None:
+            monitor_environment.monitor = monitor
+        return monitor_environment
+
+    def take_new_guid(self, guid: uuid.UUID) -> bool:
+        """
+        Returns True if no check-in with this GUID existed when the batch was loaded.
+        """
+        try:
+            self._new_guids.remove(guid)
+        except KeyError:
+            return False
+        return True
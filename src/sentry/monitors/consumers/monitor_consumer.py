@@ -22,14 +22,16 @@ from sentry_kafka_schemas.codecs import Codec
 from sentry_kafka_schemas.schema_types.ingest_monitors_v1 import IngestMonitorMessage
 from sentry_sdk.tracing import Span, Transaction
 
-from sentry import quotas, ratelimits
+from sentry import options, quotas, ratelimits
 from sentry.conf.types.kafka_definition import Topic, get_topic_codec
 from sentry.constants import DataCategory, ObjectStatus
 from sentry.db.postgres.transactions import in_test_hide_transaction_boundary
 from sentry.killswitches import killswitch_matches_context
 from sentry.models.project import Project
+from sentry.monitors import schedule_index
 from sentry.monitors.clock_dispatch import try_monitor_clock_tick
 from sentry.monitors.constants import PermitCheckInStatus
+from sentry.monitors.consumers.batch_state import CheckinBatchState
 from sentry.monitors.logic.mark_failed import mark_failed
 from sentry.monitors.logic.mark_ok import mark_ok
 from sentry.monitors.models import (
@@ -90,15 +92,20 @@ def _ensure_monitor_with_config(
     project: Project,
     monitor_slug: str,
     config: dict[str, Any] | None,
+    batch_state: CheckinBatchState | None = None,
 ) -> Monitor | None:
-    try:
-        monitor = Monitor.objects.get(
-            slug=monitor_slug,
-            project_id=project.id,
-            organization_id=project.organization_id,
-        )
-    except Monitor.DoesNotExist:
-        monitor = None
+    loaded, monitor = (
+        batch_state.take_monitor(project, monitor_slug) if batch_state else (False, None)
+    )
+    if not loaded:
+        try:
+            monitor = Monitor.objects.get(
+                slug=monitor_slug,
+                project_id=project.id,
+                organization_id=project.organization_id,
+            )
+        except Monitor.DoesNotExist:
+            monitor = None
 
     # Monitor was previously marked as upserting, but no config is provided for
     # this check-in, therefore it's no longer upserting.
@@ -438,8 +445,17 @@ def update_existing_check_in(
 
     existing_check_in.update(**updated_checkin)
 
+    if updated_checkin["timeout_at"] is not None:
+        schedule_index.schedule_timeout(existing_check_in.id, updated_checkin["timeout_at"])
+    else:
+        schedule_index.unschedule_timeout(existing_check_in.id)
+
 
-def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
+def _process_checkin(
+    item: CheckinItem,
+    txn: Transaction | Span,
+    batch_state: CheckinBatchState | None = None,
+) -> None:
     params = item.payload
 
     # XXX: The start_time is when relay received the original envelope store
@@ -617,6 +633,7 @@ def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
             project,
             monitor_slug,
             monitor_config,
+            batch_state,
         )
     except ProcessingErrorsException as e:
         ensure_config_errors = list(e.processing_errors)
@@ -730,9 +747,15 @@ def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
     # 02
     # Retrieve or upsert monitor environment for this check-in
     try:
-        monitor_environment = MonitorEnvironment.objects.ensure_environment(
-            project, monitor, environment
-        )
+        monitor_environment = None
+        if batch_state:
+            monitor_environment = batch_state.take_monitor_environment(
+                project, monitor, environment
+            )
+        if monitor_environment is None:
+            monitor_environment = MonitorEnvironment.objects.ensure_environment(
+                project, monitor, environment
+            )
     except MonitorEnvironmentLimitsExceeded as e:
         metrics.incr(
             "monitors.checkin.result",
@@ -815,6 +838,11 @@ def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
                         .get()
                     )
                 else:
+                    # No check-in with this GUID existed when the batch was
+                    # loaded, skip straight to creating it.
+                    if batch_state and batch_state.take_new_guid(guid):
+                        raise MonitorCheckIn.DoesNotExist
+
                     check_in = MonitorCheckIn.objects.select_for_update().get(
                         guid=guid,
                     )
@@ -931,6 +959,8 @@ def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
                     )
                 else:
                     txn.set_tag("outcome", "create_new_checkin")
+                    if timeout_at is not None:
+                        schedule_index.schedule_timeout(check_in.id, timeout_at)
                     with in_test_hide_transaction_boundary():
                         signal_first_checkin(project, monitor)
                     metrics.incr(
@@ -990,7 +1020,7 @@ def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
         logger.exception("Failed to process check-in")
 
 
-def process_checkin(item: CheckinItem) -> None:
+def process_checkin(item: CheckinItem, batch_state: CheckinBatchState | None = None) -> None:
     """
     Process an individual check-in
     """
@@ -1001,20 +1031,22 @@ def process_checkin(item: CheckinItem) -> None:
         ) as txn:
             # Deepcopy the checkin here so that it's not modified. We need the original when we get a
             # `ProcessingErrorsException`
-            _process_checkin(deepcopy(item), txn)
+            _process_checkin(deepcopy(item), txn, batch_state)
     except ProcessingErrorsException as e:
         handle_processing_errors(item, e)
     except Exception:
         logger.exception("Failed to process check-in")
 
 
-def process_checkin_group(items: list[CheckinItem]) -> None:
+def process_checkin_group(
+    items: list[CheckinItem], batch_state: CheckinBatchState | None = None
+) -> None:
     """
     Process a group of related check-ins (all part of the same monitor)
     completely serially.
     """
     for item in items:
-        process_checkin(item)
+        process_checkin(item, batch_state)
 
 
 def process_batch(
@@ -1066,8 +1098,18 @@ def process_batch(
 
     # Submit check-in groups for processing
     with sentry_sdk.start_transaction(op="process_batch", name="monitors.monitor_consumer"):
+        batch_state = None
+        if options.get("crons.consumer.prefetch-batch-state"):
+            try:
+                batch_state = CheckinBatchState.load(
+                    [item for group in checkin_mapping.values() for item in group]
+                )
+            except Exception:
+                logger.exception("Failed to load check-in batch state")
+
         futures = [
-            executor.submit(process_checkin_group, group) for group in checkin_mapping.values()
+            executor.submit(process_checkin_group, group, batch_state)
+            for group in checkin_mapping.values()
         ]
         wait(futures)
 
@@ -17,6 +17,7 @@ from sentry.deletions.models.scheduleddeletion import RegionScheduledDeletion
 from sentry.models.environment import Environment
 from sentry.models.project import Project
 from sentry.models.rule import Rule, RuleActivity, RuleActivityType
+from sentry.monitors import schedule_index
 from sentry.monitors.models import (
     CheckInStatus,
     Monitor,
@@ -109,12 +110,24 @@ class MonitorDetailsMixin(BaseEndpointMixin):
                 MonitorEnvironment.objects.filter(monitor_id=monitor.id).update(
                     next_checkin_latest=F("next_checkin") + get_checkin_margin(checkin_margin)
                 )
+                schedule_index.schedule_missed_many(
+                    MonitorEnvironment.objects.filter(
+                        monitor_id=monitor.id, next_checkin_latest__isnull=False
+                    ).values_list("id", "next_checkin_latest")
+                )
 
             max_runtime = result["config"].get("max_runtime")
             if max_runtime != existing_max_runtime:
                 MonitorCheckIn.objects.filter(
                     monitor_id=monitor.id, status=CheckInStatus.IN_PROGRESS
                 ).update(timeout_at=TruncMinute(F("date_added")) + get_max_runtime(max_runtime))
+                schedule_index.schedule_timeout_many(
+                    MonitorCheckIn.objects.filter(
+                        monitor_id=monitor.id,
+                        status=CheckInStatus.IN_PROGRESS,
+                        timeout_at__isnull=False,
+                    ).values_list("id", "timeout_at")
+                )
 
         if "project" in result and result["project"].id != monitor.project_id:
             raise ParameterValidationError("existing monitors may not be moved between projects")
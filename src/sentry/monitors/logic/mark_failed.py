@@ -5,6 +5,7 @@ from datetime import datetime
 
 from django.db.models import Q
 
+from sentry.monitors import schedule_index
 from sentry.monitors.logic.incidents import try_incident_threshold
 from sentry.monitors.models import CheckInStatus, MonitorCheckIn, MonitorEnvironment
 
@@ -69,6 +70,8 @@ def mark_failed(
     if not affected:
         return False
 
+    schedule_index.schedule_missed(monitor_env.id, next_checkin_latest)
+
     # refresh the object from the database so we have the updated values in our
     # cached instance
     monitor_env.refresh_from_db()
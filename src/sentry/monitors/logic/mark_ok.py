@@ -4,6 +4,7 @@ import logging
 from datetime import datetime
 from typing import NotRequired, TypedDict
 
+from sentry.monitors import schedule_index
 from sentry.monitors.logic.incidents import try_incident_resolution
 from sentry.monitors.models import MonitorCheckIn, MonitorEnvironment, MonitorStatus
 
@@ -45,3 +46,5 @@ def mark_ok(checkin: MonitorCheckIn, succeeded_at: datetime) -> None:
     MonitorEnvironment.objects.filter(id=monitor_env.id).exclude(
         last_checkin__gt=succeeded_at
     ).update(**params)
+
+    schedule_index.schedule_missed(monitor_env.id, next_checkin_latest)
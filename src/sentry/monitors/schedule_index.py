@@ -0,0 +1,162 @@
+"""
+A Redis index of when monitor environments are next expected to check-in and
+when in-progress check-ins will time out.
+
+The clock tick dispatchers (`dispatch_check_missing` and
+`dispatch_check_timeout`) use this index to find the monitor environments and
+check-ins due for each tick, instead of scanning Postgres for every overdue row
+on every tick.
+
+The index only narrows down candidates. Every popped id is verified against
+Postgres before a task is dispatched, so stale entries (deleted monitors,
+completed check-ins, changed margins) are dropped or re-scheduled at their real
+time. Entries that were never written to the index (written before the index
+was enabled, lost redis writes) are picked up by the periodic reconciliation
+tick, which falls back to the full Postgres query.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+
+from django.conf import settings
+
+from sentry import options
+from sentry.utils import redis
+
+# Sorted set of monitor environment ids scored by their next_checkin_latest
+# timestamp.
+MONITOR_MISSED_INDEX = "sentry.monitors.schedule_index.missed"
+
+# Sorted set of in-progress check-in ids scored by their timeout_at timestamp.
+MONITOR_TIMEOUT_INDEX = "sentry.monitors.schedule_index.timeout"
+
+
+def _get_redis_client():
+    return redis.redis_clusters.get(settings.SENTRY_MONITORS_REDIS_CLUSTER)
+
+
+def _schedule_many(key: str, schedule: Iterable[tuple[int, datetime]]) -> None:
+    if not options.get("crons.schedule_index.write_enabled"):
+        return
+
+    mapping = {str(id): int(ts.timestamp()) for id, ts in schedule}
+    if not mapping:
+        return
+
+    redis_client = _get_redis_client()
+    redis_client.zadd(key, mapping)
+
+
+def _unschedule_many(key: str, ids: Iterable[int]) -> None:
+    if not options.get("crons.schedule_index.write_enabled"):
+        return
+
+    members = [str(id) for id in ids]
+    if not members:
+        return
+
+    redis_client = _get_redis_client()
+    redis_client.zrem(key, *members)
+
+
+def _pop_due(key: str, ts: datetime) -> list[int]:
+    """
+    Atomically remove and return all ids scored at or before the timestamp.
+    """
+    redis_client = _get_redis_client()
+    max_score = int(ts.timestamp())
+
+    pipeline = redis_client.pipeline(transaction=True)
+    pipeline.zrangebyscore(key, "-inf", max_score)
+    pipeline.zremrangebyscore(key, "-inf", max_score)
+    members, _ = pipeline.execute()
+
+    return [int(member) for member in members]
+
+
+def use_schedule_index(ts: datetime) -> bool:
+    """
+    Determines if the clock tick at this timestamp should dispatch from the
+    schedule index. Every `reconcile_interval` ticks the dispatchers instead
+    query Postgres directly, picking up anything the index is missing.
+    """
+    if not options.get("crons.schedule_index.read_enabled"):
+        return False
+
+    interval = options.get("crons.schedule_index.reconcile_interval")
+    if interval <= 1:
+        return False
+
+    return (int(ts.timestamp()) // 60) % interval != 0
+
+
+def schedule_missed(monitor_environment_id: int, next_checkin_latest: datetime) -> None:
+    """
+    Record when a monitor environment will be considered missed.
+    """
+    _schedule_many(MONITOR_MISSED_INDEX, [(monitor_environment_id, next_checkin_latest)])
+
+
+def schedule_missed_many(schedule: Iterable[tuple[int, datetime]]) -> None:
+    """
+    Record when each of the (monitor_environment_id, next_checkin_latest)
+    pairs will be considered missed. The iterable is only consumed when the
+    index is enabled.
+    """
+    _schedule_many(MONITOR_MISSED_INDEX, schedule)
+
+
+def unschedule_missed_many(monitor_environment_ids: Iterable[int]) -> None:
+    """
+    Remove monitor environments from the missed index, e.g. once a missed
+    check-in was dispatched for them without reading the index.
+    """
+    _unschedule_many(MONITOR_MISSED_INDEX, monitor_environment_ids)
+
+
+def pop_due_missed(ts: datetime) -> list[int]:
+    """
+    Remove and return the monitor environment ids expected to have checked-in
+    by the timestamp.
+    """
+    return _pop_due(MONITOR_MISSED_INDEX, ts)
+
+
+def schedule_timeout(checkin_id: int, timeout_at: datetime) -> None:
+    """
+    Record when an in-progress check-in will time out.
+    """
+    _schedule_many(MONITOR_TIMEOUT_INDEX, [(checkin_id, timeout_at)])
+
+
+def schedule_timeout_many(schedule: Iterable[tuple[int, datetime]]) -> None:
+    """
+    Record when each of the (checkin_id, timeout_at) pairs will time out. The
+    iterable is only consumed when the index is enabled.
+    """
+    _schedule_many(MONITOR_TIMEOUT_INDEX, schedule)
+
+
+def unschedule_timeout(checkin_id: int) -> None:
+    """
+    Remove a check-in from the timeout index once it is no longer in-progress.
+    """
+    _unschedule_many(MONITOR_TIMEOUT_INDEX, [checkin_id])
+
+
+def unschedule_timeout_many(checkin_ids: Iterable[int]) -> None:
+    """
+    Remove check-ins from the timeout index, e.g. once a timeout was
+    dispatched for them without reading the index.
+    """
+    _unschedule_many(MONITOR_TIMEOUT_INDEX, checkin_ids)
+
+
+def pop_due_timeouts(ts: datetime) -> list[int]:
+    """
+    Remove and return the check-in ids that time out at or before the
+    timestamp.
+    """
+    return _pop_due(MONITOR_TIMEOUT_INDEX, ts)
@@ -125,6 +125,20 @@ register(
     default=10 * 1024 * 1024,
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Content-addressed cache of filestore files read by processing tasks, see
+# `sentry.models.files.disk_cache`. The limit is in bytes, 0 disables the cache.
+register(
+    "filestore.cache-path",
+    type=String,
+    default="/tmp/sentry-file-cache",
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "filestore.cache-limit",
+    type=Int,
+    default=0,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 
 # Mail
@@ -351,6 +365,10 @@ register(
 register("filestore.control.backend", default="", flags=FLAG_NOSTORE)
 register("filestore.control.options", default={}, flags=FLAG_NOSTORE)
 
+# Number of blobs downloaded concurrently ahead of the checksum when assembling files from
+# uploaded chunks
+register("filestore.assemble-read-ahead", type=Int, default=4, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
 # Whether to use a redis lock on fileblob uploads and deletes
 register("fileblob.upload.use_lock", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE)
 # Whether to use redis to cache `FileBlob.id` lookups
@@ -456,6 +474,22 @@ register(
     default=None,
     flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# The number of recording segments downloaded concurrently, ahead of the segment being
+# streamed to the client.
+register(
+    "replay.storage.download-read-ahead",
+    type=Int,
+    default=10,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# The maximum number of bytes of recently downloaded (compressed) recording segments kept in
+# memory by each process. Disabled when 0.
+register(
+    "replay.storage.download-cache-size",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 # Beta recording consumer rollout.
 register(
     "replay.consumer.recording.beta-rollout",
@@ -753,7 +787,54 @@ register("snuba.search.chunk-growth-rate", default=1.5, flags=FLAG_AUTOMATOR_MOD
 register("snuba.search.max-chunk-size", default=2000, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.search.max-total-chunk-time-seconds", default=30.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.search.hits-sample-size", default=100, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Store per-query candidates and ranked groups in redis so that subsequent pages of the
+# same issue search can continue from them rather than recomputing from scratch.
+register(
+    "snuba.search.query-state.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register("snuba.search.query-state.ttl", default=60, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.track-outcomes-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Decode discover export results into columns rather than a list of row dicts.
+register(
+    "data-export.discover.columnar-results",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Run batches of concurrent Snuba queries on the asyncio transport instead of the thread pool.
+register(
+    "snuba.async-transport.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Coalesce identical concurrent Snuba queries so that only one of them is sent to Snuba.
+register(
+    "snuba.query-coalescing.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Also coalesce identical queries across processes using a lease in redis.
+register(
+    "snuba.query-coalescing.redis-lease.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# How long a process may hold the redis lease for a query, and how long others wait for it.
+register("snuba.query-coalescing.lease-ms", default=10000, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# How long (in seconds) results of lease holders are shared with other processes.
+register("snuba.query-coalescing.default-ttl", default=5, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register(
+    "snuba.query-coalescing.referrer-ttls",
+    type=Dict,
+    default={},
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # The percentage of tagkeys that we want to cache. Set to 1.0 in order to cache everything, <=0.0 to stop caching
 register(
@@ -783,6 +864,22 @@ register(
     default=0.0,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Seconds to cache symbolicated JavaScript frames for, see `sentry.lang.javascript.frame_cache`.
+# 0 disables the cache.
+register(
+    "symbolicator.sourcemaps-frame-cache-ttl",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Seconds to cache symbolicated native frames for, see `sentry.lang.native.frame_cache`.
+# 0 disables the cache.
+register(
+    "symbolicator.native-frame-cache-ttl",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # Transaction events
 # True => kill switch to disable ingestion of transaction events for internal project.
@@ -1227,6 +1324,14 @@ register("relay.metric-bucket-distribution-encodings", default={}, flags=FLAG_AU
 # Controls the rollout rate in percent (`0.0` to `1.0`) for metric stats.
 register("relay.metric-stats.rollout-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Recompute only the affected sections of cached project configs for invalidations
+# that are known to only affect some of them (see `INVALIDATION_TRIGGER_SECTIONS`).
+register(
+    "relay.project-config.section-invalidation.enabled",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Write new kafka headers in eventstream
 register("eventstream:kafka-headers", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
@@ -2118,6 +2223,14 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Load the monitors, monitor environments and check-in GUIDs of a batch of
+# check-ins in bulk before processing the batch in the monitor consumer.
+register(
+    "crons.consumer.prefetch-batch-state",
+    default=False,
+    flags=FLAG_BOOL | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Temporary killswitch to enable dispatching incident occurrences into the
 # incident_occurrence_consumer
 register(
@@ -2170,6 +2283,34 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Maintain the redis schedule index of monitor environment next_checkin_latest
+# and in-progress check-in timeout_at times.
+#
+# See the `monitors.schedule_index` module for more details
+register(
+    "crons.schedule_index.write_enabled",
+    default=False,
+    flags=FLAG_BOOL | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Dispatch missed and timed-out tasks from the redis schedule index instead of
+# querying Postgres on every clock tick. The index should be written for at
+# least one reconcile interval before this is enabled.
+register(
+    "crons.schedule_index.read_enabled",
+    default=False,
+    flags=FLAG_BOOL | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Every N clock ticks the missed and timeout dispatchers query Postgres
+# directly instead of using the schedule index, picking up anything missing
+# from the index.
+register(
+    "crons.schedule_index.reconcile_interval",
+    default=10,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Determines how many check-ins per-minute will be allowed per monitor. This is
 # used when computing the QuotaConfig for the DataCategory.MONITOR (check-ins)
 #
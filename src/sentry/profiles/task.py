@@ -4,8 +4,10 @@ import io
 import logging
 import zlib
 from base64 import b64decode, b64encode
+from collections.abc import Callable
 from copy import deepcopy
 from datetime import datetime, timezone
+from itertools import chain
 from operator import itemgetter
 from time import time
 from typing import Any, TypedDict
@@ -721,38 +723,9 @@ def _process_symbolicator_results(
 def _process_symbolicator_results_for_sample(
     profile: Profile, stacktraces: list[Any], frames_sent: set[int], platform: str
 ) -> None:
-    if platform == "rust":
-
-        def truncate_stack_needed(frames: list[dict[str, Any]], stack: list[Any]) -> list[Any]:
-            # remove top frames related to the profiler (top of the stack)
-            if frames[stack[0]].get("function", "") == "perf_signal_handler":
-                stack = stack[2:]
-            # remove unsymbolicated frames before the runtime calls (bottom of the stack)
-            if frames[stack[len(stack) - 2]].get("function", "") == "":
-                stack = stack[:-2]
-            return stack
-
-    elif platform == "cocoa":
-
-        def truncate_stack_needed(
-            frames: list[dict[str, Any]],
-            stack: list[Any],
-        ) -> list[Any]:
-            # remove bottom frames we can't symbolicate
-            if frames[stack[-1]].get("instruction_addr", "") == "0xffffffffc":
-                return stack[:-2]
-            return stack
-
-    else:
-
-        def truncate_stack_needed(
-            frames: list[dict[str, Any]],
-            stack: list[Any],
-        ) -> list[Any]:
-            return stack
-
     symbolicated_frames = stacktraces[0]["frames"]
     symbolicated_frames_dict = get_frame_index_map(symbolicated_frames)
+    raw_frames_count = len(profile["profile"]["frames"])
 
     if len(frames_sent) > 0:
         raw_frames = profile["profile"]["frames"]
@@ -795,38 +768,129 @@ def _process_symbolicator_results_for_sample(
     elif symbolicated_frames:
         profile["profile"]["frames"] = symbolicated_frames
 
-    if platform in SHOULD_SYMBOLICATE:
-
-        def get_stack(stack: list[int]) -> list[int]:
-            new_stack: list[int] = []
-            for index in stack:
-                if index in symbolicated_frames_dict:
-                    # the new stack extends the older by replacing
-                    # a specific frame index with the indices of
-                    # the frames originated from the original frame
-                    # should inlines be present
-                    new_stack.extend(symbolicated_frames_dict[index])
-                else:
-                    new_stack.append(index)
-            return new_stack
+    with sentry_sdk.start_span(op="task.profiling.symbolicate.remap_stacks"):
+        if platform in SHOULD_SYMBOLICATE:
+            remap_stack = get_stack_remapper(symbolicated_frames_dict, raw_frames_count)
+        else:
+            remap_stack = None
 
-    else:
+        truncate_stack_needed = get_stack_truncator(profile["profile"]["frames"], platform)
+
+        stacks = []
+
+        for stack in profile["profile"]["stacks"]:
+            new_stack = remap_stack(stack) if remap_stack is not None else stack
+
+            if truncate_stack_needed is not None and len(new_stack) >= 2:
+                # truncate some unneeded frames in the stack (related to the profiler itself or impossible to symbolicate)
+                new_stack = truncate_stack_needed(new_stack)
+
+            stacks.append(new_stack)
+
+        profile["profile"]["stacks"] = stacks
 
-        def get_stack(stack: list[int]) -> list[int]:
+
+def get_stack_remapper(
+    index_map: dict[int, list[int]], frames_count: int
+) -> Callable[[list[int]], list[int]] | None:
+    """
+    Returns a function replacing each frame index of a stack with the indices
+    of the frames symbolicator produced from it (see `get_frame_index_map`).
+    Indices missing from the map are kept as they are.
+
+    The map is flattened once into a table indexed by the original frame
+    index, so each stack is remapped with list indexing instead of a dict
+    lookup and an extend per frame. Returns None when the map does not change
+    any index, which is the case for profiles without inlined frames that were
+    sent to symbolicator in full.
+    """
+    if not index_map or all(len(v) == 1 and v[0] == k for k, v in index_map.items()):
+        return None
+
+    size = max(max(index_map) + 1, frames_count)
+
+    if all(len(v) == 1 for v in index_map.values()):
+        # Without inlined frames every index maps to exactly one index
+        flat_table = list(range(size))
+        for index, indices in index_map.items():
+            flat_table[index] = indices[0]
+
+        def remap_flat(stack: list[int]) -> list[int]:
+            try:
+                return [flat_table[index] for index in stack]
+            except IndexError:
+                return _remap_stack_slow(index_map, stack)
+
+        return remap_flat
+
+    table: list[tuple[int, ...]] = [(i,) for i in range(size)]
+    for index, indices in index_map.items():
+        table[index] = tuple(indices)
+
+    def remap(stack: list[int]) -> list[int]:
+        try:
+            return list(chain.from_iterable([table[index] for index in stack]))
+        except IndexError:
+            return _remap_stack_slow(index_map, stack)
+
+    return remap
+
+
+def _remap_stack_slow(index_map: dict[int, list[int]], stack: list[int]) -> list[int]:
+    new_stack: list[int] = []
+    for index in stack:
+        if index in index_map:
+            # the new stack extends the older by replacing
+            # a specific frame index with the indices of
+            # the frames originated from the original frame
+            # should inlines be present
+            new_stack.extend(index_map[index])
+        else:
+            new_stack.append(index)
+    return new_stack
+
+
+def get_stack_truncator(
+    frames: list[dict[str, Any]], platform: str
+) -> Callable[[list[int]], list[int]] | None:
+    """
+    Returns a function removing the frames related to the profiler itself or
+    impossible to symbolicate from a stack of at least two frames, or None
+    when nothing needs to be removed on this platform.
+
+    The frames checked are looked up once per frame instead of once per stack.
+    """
+    if platform == "rust":
+        signal_handler_frames = {
+            i for i, f in enumerate(frames) if f.get("function", "") == "perf_signal_handler"
+        }
+        unsymbolicated_frames = {i for i, f in enumerate(frames) if f.get("function", "") == ""}
+
+        def truncate_rust(stack: list[int]) -> list[int]:
+            # remove top frames related to the profiler (top of the stack)
+            if stack[0] in signal_handler_frames:
+                stack = stack[2:]
+            # remove unsymbolicated frames before the runtime calls (bottom of the stack)
+            if stack[len(stack) - 2] in unsymbolicated_frames:
+                stack = stack[:-2]
             return stack
 
-    stacks = []
+        return truncate_rust
 
-    for stack in profile["profile"]["stacks"]:
-        new_stack = get_stack(stack)
+    if platform == "cocoa":
+        unsymbolicated_frames = {
+            i for i, f in enumerate(frames) if f.get("instruction_addr", "") == "0xffffffffc"
+        }
 
-        if len(new_stack) >= 2:
-            # truncate some unneeded frames in the stack (related to the profiler itself or impossible to symbolicate)
-            new_stack = truncate_stack_needed(profile["profile"]["frames"], new_stack)
+        def truncate_cocoa(stack: list[int]) -> list[int]:
+            # remove bottom frames we can't symbolicate
+            if stack[-1] in unsymbolicated_frames:
+                return stack[:-2]
+            return stack
 
-        stacks.append(new_stack)
+        return truncate_cocoa
 
-    profile["profile"]["stacks"] = stacks
+    return None
 
 
 def _process_symbolicator_results_for_cocoa(profile: Profile, stacktraces: list[Any]) -> None:
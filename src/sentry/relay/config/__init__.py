@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import logging
 import uuid
-from collections.abc import Iterable, Mapping, MutableMapping, Sequence
+from collections.abc import Callable, Iterable, Mapping, MutableMapping, Sequence
 from datetime import datetime, timezone
-from typing import Any, Literal, NotRequired, TypedDict
+from typing import Any, Literal, NamedTuple, NotRequired, TypedDict
 
 import sentry_sdk
+from django.utils.functional import cached_property
 from sentry_sdk import capture_exception
 
 from sentry import features, killswitches, options, quotas, utils
@@ -40,6 +41,7 @@ from sentry.relay.config.metric_extraction import (
 from sentry.relay.utils import to_camel_case_name
 from sentry.sentry_metrics.use_case_id_registry import CARDINALITY_LIMIT_USE_CASES
 from sentry.utils import metrics
+from sentry.utils.hashlib import md5_text
 from sentry.utils.http import get_origins
 from sentry.utils.options import sample_modulo
 
@@ -79,11 +81,53 @@ MIN_CLUSTERER_RUNS = 10
 logger = logging.getLogger(__name__)
 
 
-def get_exposed_features(project: Project) -> Sequence[str]:
+class OrganizationConfigData:
+    """Parts of project configs that only depend on the organization.
+
+    Each value is computed once on first use, so that building the configs of many
+    projects of an organization with the same instance only looks them up once.
+    """
+
+    def __init__(self, organization: Organization) -> None:
+        self.organization = organization
+        self._features: dict[str, bool] = {}
+
+    def has_feature(self, feature: str) -> bool:
+        if feature not in self._features:
+            self._features[feature] = features.has(feature, self.organization)
+        return self._features[feature]
+
+    @cached_property
+    def trusted_relays(self) -> list[str]:
+        return [
+            r["public_key"] for r in self.organization.get_option("sentry:trusted-relays", []) if r
+        ]
+
+    @cached_property
+    def performance_score_profiles(self) -> list[dict[str, Any]]:
+        return [
+            *_get_desktop_browser_performance_profiles(self.organization),
+            *_get_mobile_browser_performance_profiles(self.organization),
+            *_get_mobile_performance_profiles(self.organization),
+            *_get_default_browser_performance_profiles(self.organization),
+        ]
+
+    @cached_property
+    def event_retention(self) -> int | None:
+        with sentry_sdk.start_span(op="get_event_retention"):
+            return quotas.backend.get_event_retention(self.organization)
+
+
+def get_exposed_features(
+    project: Project, organization_data: OrganizationConfigData | None = None
+) -> Sequence[str]:
+    if organization_data is None:
+        organization_data = OrganizationConfigData(project.organization)
+
     active_features = []
     for feature in EXPOSABLE_FEATURES:
         if feature.startswith("organizations:"):
-            has_feature = features.has(feature, project.organization)
+            has_feature = organization_data.has_feature(feature)
         elif feature.startswith("projects:"):
             has_feature = features.has(feature, project)
         else:
@@ -283,7 +327,9 @@ def get_cardinality_limits(timeout: TimeChecker, project: Project) -> list[Cardi
 
 
 def get_project_config(
-    project: Project, project_keys: Iterable[ProjectKey] | None = None
+    project: Project,
+    project_keys: Iterable[ProjectKey] | None = None,
+    organization_data: OrganizationConfigData | None = None,
 ) -> ProjectConfig:
     """Constructs the ProjectConfig information.
     :param project: The project to load configuration for. Ensure that
@@ -293,6 +339,8 @@ def get_project_config(
         no project keys are provided it is assumed that the config does not
         need to contain auth information (this is the case when used in
         python's StoreView)
+    :param organization_data: Organization-level data shared between the configs of
+        the projects of an organization, for performance when building many of them.
     :return: a ProjectConfig object for the given project
     """
     with sentry_sdk.isolation_scope() as scope:
@@ -301,7 +349,9 @@ def get_project_config(
             sentry_sdk.start_transaction(name="get_project_config"),
             metrics.timer("relay.config.get_project_config.duration"),
         ):
-            return _get_project_config(project, project_keys=project_keys)
+            return _get_project_config(
+                project, project_keys=project_keys, organization_data=organization_data
+            )
 
 
 def get_dynamic_sampling_config(timeout: TimeChecker, project: Project) -> Mapping[str, Any] | None:
@@ -1019,12 +1069,210 @@ def _get_mobile_performance_profiles(
     ]
 
 
+def _add_sampling_section(
+    config: MutableMapping[str, Any],
+    project: Project,
+    project_keys: Iterable[ProjectKey] | None,
+    organization_data: OrganizationConfigData,
+) -> None:
+    # NOTE: Omitting dynamicSampling because of a failure increases the number
+    # of events forwarded by Relay, because dynamic sampling will stop filtering
+    # anything.
+    add_experimental_config(config, "sampling", get_dynamic_sampling_config, project)
+
+
+def _add_transaction_names_section(
+    config: MutableMapping[str, Any],
+    project: Project,
+    project_keys: Iterable[ProjectKey] | None,
+    organization_data: OrganizationConfigData,
+) -> None:
+    # Rules to replace high cardinality transaction names
+    if not features.has("projects:transaction-name-clustering-disabled", project):
+        add_experimental_config(config, "txNameRules", get_transaction_names_config, project)
+
+    # Mark the project as ready if it has seen >= 10 clusterer runs.
+    # This prevents projects from prematurely marking all URL transactions as sanitized.
+    if get_clusterer_meta(ClustererNamespace.TRANSACTIONS, project)["runs"] >= MIN_CLUSTERER_RUNS:
+        config["txNameReady"] = True
+
+
+def _add_metric_extraction_section(
+    config: MutableMapping[str, Any],
+    project: Project,
+    project_keys: Iterable[ProjectKey] | None,
+    organization_data: OrganizationConfigData,
+) -> None:
+    if not _should_extract_transaction_metrics(project):
+        return
+
+    add_experimental_config(
+        config,
+        "transactionMetrics",
+        get_transaction_metrics_settings,
+        project,
+        config.get("breakdownsV2"),
+    )
+
+    # This config key is technically not specific to _transaction_ metrics,
+    # is however currently both only applied to transaction metrics in
+    # Relay, and only used to tag transaction metrics in Sentry.
+    add_experimental_config(
+        config,
+        "metricConditionalTagging",
+        get_metric_conditional_tagging_rules,
+        project,
+    )
+
+    if metric_extraction := get_metric_extraction_config(project):
+        config["metricExtraction"] = metric_extraction
+
+
+def _add_performance_score_section(
+    config: MutableMapping[str, Any],
+    project: Project,
+    project_keys: Iterable[ProjectKey] | None,
+    organization_data: OrganizationConfigData,
+) -> None:
+    if performance_score_profiles := organization_data.performance_score_profiles:
+        config["performanceScore"] = {"profiles": performance_score_profiles}
+
+
+def _add_filter_settings_section(
+    config: MutableMapping[str, Any],
+    project: Project,
+    project_keys: Iterable[ProjectKey] | None,
+    organization_data: OrganizationConfigData,
+) -> None:
+    with sentry_sdk.start_span(op="get_filter_settings"):
+        if filter_settings := get_filter_settings(project):
+            config["filterSettings"] = filter_settings
+
+
+def _add_quotas_section(
+    config: MutableMapping[str, Any],
+    project: Project,
+    project_keys: Iterable[ProjectKey] | None,
+    organization_data: OrganizationConfigData,
+) -> None:
+    with sentry_sdk.start_span(op="get_all_quotas"):
+        if quotas_config := get_quotas(project, keys=project_keys):
+            config["quotas"] = quotas_config
+
+
+class _ConfigSection(NamedTuple):
+    #: The keys of the project config's ``config`` the section sets.
+    keys: tuple[str, ...]
+    build: Callable[
+        [MutableMapping[str, Any], Project, Iterable[ProjectKey] | None, OrganizationConfigData],
+        None,
+    ]
+
+
+#: Parts of the project config that can be recomputed on their own, see
+#: :func:`recompute_project_config_sections`.
+CONFIG_SECTIONS: dict[str, _ConfigSection] = {
+    "sampling": _ConfigSection(("sampling",), _add_sampling_section),
+    "transactionNames": _ConfigSection(
+        ("txNameRules", "txNameReady"), _add_transaction_names_section
+    ),
+    "metricExtraction": _ConfigSection(
+        ("transactionMetrics", "metricConditionalTagging", "metricExtraction"),
+        _add_metric_extraction_section,
+    ),
+    "performanceScore": _ConfigSection(("performanceScore",), _add_performance_score_section),
+    "filterSettings": _ConfigSection(("filterSettings",), _add_filter_settings_section),
+    "quotas": _ConfigSection(("quotas",), _add_quotas_section),
+}
+
+#: Invalidation triggers which are known to only change some sections of the project
+#: config. Invalidations with any other trigger recompute the whole config.
+INVALIDATION_TRIGGER_SECTIONS: dict[str, frozenset[str]] = {
+    "dynamic_sampling:boost_release": frozenset(["sampling"]),
+    "dynamic_sampling:custom_rule_upsert": frozenset(["sampling"]),
+    "dynamic_sampling_boost_low_volume_projects": frozenset(["sampling"]),
+    "dynamic_sampling_boost_low_volume_transactions": frozenset(["sampling"]),
+    "releaseproject.post_save": frozenset(["sampling"]),
+    "releaseproject.post_delete": frozenset(["sampling"]),
+    "teamkeytransaction.post_save": frozenset(["sampling"]),
+    "teamkeytransaction.post_delete": frozenset(["sampling"]),
+    "alerts:create-on-demand-metric": frozenset(["metricExtraction"]),
+    "dashboards:create-on-demand-metric": frozenset(["metricExtraction"]),
+}
+
+
+def get_config_section_fingerprint(config: Mapping[str, Any], section: str) -> str:
+    """Returns a hash of the values of ``section`` in the ``config`` of a project config.
+
+    The fingerprint is the same for a config that has been round-tripped through JSON.
+    """
+    values = {key: config.get(key) for key in CONFIG_SECTIONS[section].keys}
+    return md5_text(utils.json.dumps(values, sort_keys=True)).hexdigest()
+
+
+def recompute_project_config_sections(
+    cached_config: Mapping[str, Any],
+    project: Project,
+    sections: Iterable[str],
+    project_keys: Iterable[ProjectKey] | None = None,
+    organization_data: OrganizationConfigData | None = None,
+) -> MutableMapping[str, Any] | None:
+    """Recomputes some sections of a project config, keeping the rest of it as is.
+
+    :param cached_config: A full project config, as returned by
+        ``ProjectConfig.to_dict()`` or read back from the project config cache.
+    :param project: The project the config is for.
+    :param sections: Names of the sections to recompute, see :data:`CONFIG_SECTIONS`.
+    :param project_keys: The project keys the config was built for.
+    :param organization_data: See :func:`get_project_config`.
+    :return: The new project config, with a new revision, or ``None`` if none of the
+        recomputed sections changed.
+    """
+    if organization_data is None:
+        organization_data = OrganizationConfigData(project.organization)
+
+    config = dict(cached_config["config"])
+
+    changed = []
+    for section in sections:
+        previous_fingerprint = get_config_section_fingerprint(config, section)
+        for key in CONFIG_SECTIONS[section].keys:
+            config.pop(key, None)
+        with sentry_sdk.start_span(op=f"recompute_project_config_section.{section}"):
+            CONFIG_SECTIONS[section].build(config, project, project_keys, organization_data)
+        if get_config_section_fingerprint(config, section) != previous_fingerprint:
+            changed.append(section)
+
+    for section in sections:
+        metrics.incr(
+            "relay.config.recompute_section",
+            tags={"section": section, "result": "changed" if section in changed else "unchanged"},
+        )
+
+    if not changed:
+        return None
+
+    now = datetime.now(timezone.utc)
+    return {
+        **cached_config,
+        "lastFetch": now,
+        "lastChange": now,
+        "rev": uuid.uuid4().hex,
+        "config": config,
+    }
+
+
 def _get_project_config(
-    project: Project, project_keys: Iterable[ProjectKey] | None = None
+    project: Project,
+    project_keys: Iterable[ProjectKey] | None = None,
+    organization_data: OrganizationConfigData | None = None,
 ) -> ProjectConfig:
     if project.status != ObjectStatus.ACTIVE:
         return ProjectConfig(project, disabled=True)
 
+    if organization_data is None:
+        organization_data = OrganizationConfigData(project.organization)
+
     public_keys = get_public_key_configs(project_keys=project_keys)
 
     with sentry_sdk.start_span(op="get_public_config"):
@@ -1038,11 +1286,7 @@ def _get_project_config(
             "publicKeys": public_keys,
             "config": {
                 "allowedDomains": list(get_origins(project)),
-                "trustedRelays": [
-                    r["public_key"]
-                    for r in project.organization.get_option("sentry:trusted-relays", [])
-                    if r
-                ],
+                "trustedRelays": organization_data.trusted_relays,
                 "piiConfig": get_pii_config(project),
                 "datascrubbingSettings": get_datascrubbing_settings(project),
             },
@@ -1053,48 +1297,17 @@ def _get_project_config(
     config = cfg["config"]
 
     with sentry_sdk.start_span(op="get_exposed_features"):
-        if exposed_features := get_exposed_features(project):
+        if exposed_features := get_exposed_features(project, organization_data):
             config["features"] = exposed_features
 
-    # NOTE: Omitting dynamicSampling because of a failure increases the number
-    # of events forwarded by Relay, because dynamic sampling will stop filtering
-    # anything.
-    add_experimental_config(config, "sampling", get_dynamic_sampling_config, project)
-
-    # Rules to replace high cardinality transaction names
-    if not features.has("projects:transaction-name-clustering-disabled", project):
-        add_experimental_config(config, "txNameRules", get_transaction_names_config, project)
-
-    # Mark the project as ready if it has seen >= 10 clusterer runs.
-    # This prevents projects from prematurely marking all URL transactions as sanitized.
-    if get_clusterer_meta(ClustererNamespace.TRANSACTIONS, project)["runs"] >= MIN_CLUSTERER_RUNS:
-        config["txNameReady"] = True
+    _add_sampling_section(config, project, project_keys, organization_data)
+    _add_transaction_names_section(config, project, project_keys, organization_data)
 
     config["breakdownsV2"] = project.get_option("sentry:breakdowns")
 
     add_experimental_config(config, "metrics", get_metrics_config, project)
 
-    if _should_extract_transaction_metrics(project):
-        add_experimental_config(
-            config,
-            "transactionMetrics",
-            get_transaction_metrics_settings,
-            project,
-            config.get("breakdownsV2"),
-        )
-
-        # This config key is technically not specific to _transaction_ metrics,
-        # is however currently both only applied to transaction metrics in
-        # Relay, and only used to tag transaction metrics in Sentry.
-        add_experimental_config(
-            config,
-            "metricConditionalTagging",
-            get_metric_conditional_tagging_rules,
-            project,
-        )
-
-        if metric_extraction := get_metric_extraction_config(project):
-            config["metricExtraction"] = metric_extraction
+    _add_metric_extraction_section(config, project, project_keys, organization_data)
 
     config["sessionMetrics"] = {
         "version": (
@@ -1104,29 +1317,17 @@ def _get_project_config(
         ),
     }
 
-    performance_score_profiles = [
-        *_get_desktop_browser_performance_profiles(project.organization),
-        *_get_mobile_browser_performance_profiles(project.organization),
-        *_get_mobile_performance_profiles(project.organization),
-        *_get_default_browser_performance_profiles(project.organization),
-    ]
-    if performance_score_profiles:
-        config["performanceScore"] = {"profiles": performance_score_profiles}
+    _add_performance_score_section(config, project, project_keys, organization_data)
+    _add_filter_settings_section(config, project, project_keys, organization_data)
 
-    with sentry_sdk.start_span(op="get_filter_settings"):
-        if filter_settings := get_filter_settings(project):
-            config["filterSettings"] = filter_settings
     with sentry_sdk.start_span(op="get_grouping_config_dict_for_project"):
         grouping_config = get_grouping_config_dict_for_project(project)
         if grouping_config is not None:
             config["groupingConfig"] = grouping_config
-    with sentry_sdk.start_span(op="get_event_retention"):
-        event_retention = quotas.backend.get_event_retention(project.organization)
-        if event_retention is not None:
-            config["eventRetention"] = event_retention
-    with sentry_sdk.start_span(op="get_all_quotas"):
-        if quotas_config := get_quotas(project, keys=project_keys):
-            config["quotas"] = quotas_config
+    if (event_retention := organization_data.event_retention) is not None:
+        config["eventRetention"] = event_retention
+
+    _add_quotas_section(config, project, project_keys, organization_data)
 
     return ProjectConfig(project, **cfg)
 
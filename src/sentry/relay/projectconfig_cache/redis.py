@@ -14,7 +14,65 @@ COMPRESSION_LEVEL = 3  # 3 is the default level of compression
 logger = logging.getLogger(__name__)
 
 
+class _ConfigSerializer:
+    """Serializes project configs to the same JSON as ``json.dumps``.
+
+    Configs that are written together often share subsections of ``config``. When the
+    configs of an organization are built in bulk, identical subsections are the very same
+    objects (see :class:`sentry.relay.config.OrganizationConfigData`). Such subsections are
+    only serialized once per serializer.
+    """
+
+    def __init__(self) -> None:
+        # Keyed by object id. The object is kept alive so that its id isn't reused.
+        self._sections: dict[int, tuple[object, str]] = {}
+        self.reused = 0
+
+    def _serialize_section(self, value: Any) -> str:
+        if not isinstance(value, (dict, list)):
+            return json.dumps(value)
+        cached = self._sections.get(id(value))
+        if cached is not None:
+            self.reused += 1
+            return cached[1]
+        serialized = json.dumps(value)
+        self._sections[id(value)] = (value, serialized)
+        return serialized
+
+    def _serialize_object(self, items: list[tuple[str, str]]) -> str:
+        return "{" + ",".join(f"{json.dumps(key)}:{value}" for key, value in items) + "}"
+
+    def serialize(self, config: Mapping[str, Any]) -> str:
+        inner = config.get("config")
+        if not isinstance(inner, Mapping):
+            return json.dumps(config)
+
+        serialized_inner = self._serialize_object(
+            [(key, self._serialize_section(value)) for key, value in inner.items()]
+        )
+        return self._serialize_object(
+            [
+                (key, serialized_inner if key == "config" else json.dumps(value))
+                for key, value in config.items()
+            ]
+        )
+
+
 class RedisProjectConfigCache(ProjectConfigCache):
+    """Stores project configs in Redis, as zstd compressed JSON.
+
+    Relay reads configs directly from this cache, so each config has to be stored as a
+    single blob at ``relayconfig:<public key>``.
+
+    Options:
+
+    ``cluster``: The Redis cluster to write to.
+    ``read_cluster``: The Redis cluster to read from, defaults to ``cluster``.
+    ``compression_level``: The zstd compression level. Higher levels use less memory in
+        Redis, at the cost of more CPU when writing configs. Decompression speed does not
+        depend on it.
+    """
+
     def __init__(self, **options):
         cluster_key = options.get("cluster", "default")
         self.cluster = redis.redis_clusters.get_binary(cluster_key)
@@ -22,6 +80,8 @@ class RedisProjectConfigCache(ProjectConfigCache):
         read_cluster_key = options.get("read_cluster", cluster_key)
         self.cluster_read = redis.redis_clusters.get_binary(read_cluster_key)
 
+        self.compression_level = options.get("compression_level", COMPRESSION_LEVEL)
+
         super().__init__(**options)
 
     def validate(self):
@@ -36,11 +96,14 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def set_many(self, configs: dict[str, Mapping[str, Any]]):
         metrics.incr("relay.projectconfig_cache.write", amount=len(configs), tags={"action": "set"})
 
+        serializer = _ConfigSerializer()
+        compressor = zstandard.ZstdCompressor(level=self.compression_level)
+
         # Note: Those are multiple pipelines, one per cluster node.
         p = self.cluster.pipeline(transaction=False)
         for public_key, config in configs.items():
-            serialized = json.dumps(config).encode()
-            compressed = zstandard.compress(serialized, level=COMPRESSION_LEVEL)
+            serialized = serializer.serialize(config).encode()
+            compressed = compressor.compress(serialized)
             metrics.distribution(
                 "relay.projectconfig_cache.uncompressed_size", len(serialized), unit="byte"
             )
@@ -60,6 +123,9 @@ class RedisProjectConfigCache(ProjectConfigCache):
 
         p.execute()
 
+        if serializer.reused:
+            metrics.incr("relay.projectconfig_cache.reused_sections", amount=serializer.reused)
+
     def delete_many(self, public_keys):
         # Note: Those are multiple pipelines, one per cluster node
         with self.cluster.pipeline() as p:
@@ -72,7 +138,19 @@ class RedisProjectConfigCache(ProjectConfigCache):
         )
 
     def get(self, public_key):
-        rv_b = self.cluster_read.get(self.__get_redis_key(public_key))
+        return self.__decode(self.cluster_read.get(self.__get_redis_key(public_key)))
+
+    def get_many(self, public_keys):
+        public_keys = list(public_keys)
+        # Note: Those are multiple pipelines, one per cluster node.
+        p = self.cluster_read.pipeline(transaction=False)
+        for public_key in public_keys:
+            p.get(self.__get_redis_key(public_key))
+        return {
+            public_key: self.__decode(rv_b) for public_key, rv_b in zip(public_keys, p.execute())
+        }
+
+    def __decode(self, rv_b):
         if rv_b is not None:
             try:
                 rv = zstandard.decompress(rv_b).decode()
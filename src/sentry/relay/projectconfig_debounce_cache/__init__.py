@@ -1,3 +1,5 @@
+import functools
+
 from django.conf import settings
 
 from sentry.utils.services import LazyServiceWrapper
@@ -25,3 +27,21 @@ invalidation = LazyServiceWrapper(
         **settings.SENTRY_RELAY_PROJECTCONFIG_DEBOUNCE_CACHE_OPTIONS,
     },
 )
+
+
+@functools.cache
+def get_section_invalidation(section: str) -> LazyServiceWrapper[ProjectConfigDebounceCache]:
+    """Returns the debounce cache for invalidations that only recompute one section of
+    the project config.
+
+    These are debounced separately from full invalidations, which they must not
+    prevent from being scheduled.
+    """
+    return LazyServiceWrapper(
+        ProjectConfigDebounceCache,
+        settings.SENTRY_RELAY_PROJECTCONFIG_DEBOUNCE_CACHE,
+        {
+            "key_prefix": f"relayconfig-section-invalidation-dedup:{section}",
+            **settings.SENTRY_RELAY_PROJECTCONFIG_DEBOUNCE_CACHE_OPTIONS,
+        },
+    )
@@ -20,7 +20,7 @@ from sentry.replays.usecases.ingest.event_logger import (
     report_hydration_error,
     report_rage_click,
 )
-from sentry.replays.usecases.ingest.event_parser import ParsedEventMeta, parse_events
+from sentry.replays.usecases.ingest.event_parser import ParsedEventMeta, load_events, parse_events
 from sentry.replays.usecases.pack import pack
 from sentry.signals import first_replay_received
 from sentry.utils import json, metrics
@@ -99,7 +99,7 @@ def process_recording_event(message: Event) -> ProcessedEvent:
 
 def parse_replay_events(message: Event) -> ParsedEventMeta | None:
     try:
-        return parse_events(json.loads(message["payload"]))
+        return parse_events(load_events(message["payload"]))
     except Exception:
         logger.exception(
             "Failed to parse recording org=%s, project=%s, replay=%s, segment=%s",
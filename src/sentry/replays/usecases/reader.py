@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import threading
 import uuid
 import zlib
+from collections import OrderedDict, deque
 from collections.abc import Iterator
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from itertools import islice
 from typing import Any
 
 import sentry_sdk
@@ -24,11 +27,18 @@ from snuba_sdk import (
     Request,
 )
 
+from sentry import options
 from sentry.models.files.file import File
 from sentry.models.files.fileblobindex import FileBlobIndex
-from sentry.replays.lib.storage import RecordingSegmentStorageMeta, filestore, storage
+from sentry.replays.lib.storage import (
+    RecordingSegmentStorageMeta,
+    filestore,
+    make_recording_filename,
+    storage,
+)
 from sentry.replays.models import ReplayRecordingSegment
 from sentry.replays.usecases.pack import unpack
+from sentry.utils import metrics
 from sentry.utils.snuba import raw_snql_query
 
 # METADATA QUERY BEHAVIOR.
@@ -265,14 +275,37 @@ def download_segments(segments: list[RecordingSegmentStorageMeta]) -> Iterator[b
 def iter_segment_data(
     segments: list[RecordingSegmentStorageMeta],
 ) -> Iterator[tuple[int, memoryview]]:
-    with ThreadPoolExecutor(max_workers=10) as pool:
-        segment_data = pool.map(_download_segment, segments)
-
-    for i, result in enumerate(segment_data):
-        if result is None:
-            yield i, memoryview(b"[]")
-        else:
-            yield i, result[1]
+    """Yield segment data in order while the following segments download concurrently.
+
+    At most "replay.storage.download-read-ahead" segments are in flight (or downloaded but not
+    yet yielded) at once. Each segment is yielded as soon as it and the segments before it
+    have been downloaded, rather than after the whole replay has been downloaded.
+    """
+    read_ahead = max(options.get("replay.storage.download-read-ahead"), 1)
+    remaining = iter(segments)
+    pending: deque[Future[tuple[memoryview | None, memoryview] | None]] = deque()
+
+    pool = ThreadPoolExecutor(max_workers=read_ahead)
+    try:
+        for segment in islice(remaining, read_ahead):
+            pending.append(pool.submit(_download_segment, segment))
+
+        i = 0
+        while pending:
+            result = pending.popleft().result()
+
+            # Replace the segment we are about to yield with the next one.
+            for segment in islice(remaining, 1):
+                pending.append(pool.submit(_download_segment, segment))
+
+            if result is None:
+                yield i, memoryview(b"[]")
+            else:
+                yield i, result[1]
+            i += 1
+    finally:
+        # If the consumer stops early (e.g. a disconnected client) drop the queued downloads.
+        pool.shutdown(wait=False, cancel_futures=True)
 
 
 def download_segment(segment: RecordingSegmentStorageMeta, span: Any) -> bytes:
@@ -291,9 +324,7 @@ def download_video(segment: RecordingSegmentStorageMeta) -> bytes | None:
 def _download_segment(
     segment: RecordingSegmentStorageMeta,
 ) -> tuple[memoryview | None, memoryview] | None:
-    driver = filestore if segment.file_id else storage
-
-    result = driver.get(segment)
+    result = _get_segment_blob(segment)
     if result is None:
         return None
 
@@ -301,6 +332,69 @@ def _download_segment(
     return unpack(decompressed)
 
 
+def _get_segment_blob(segment: RecordingSegmentStorageMeta) -> bytes | None:
+    driver = filestore if segment.file_id else storage
+
+    max_size = options.get("replay.storage.download-cache-size")
+    if max_size <= 0:
+        return driver.get(segment)
+
+    # Segments are never modified once written so a cached blob does not need to be
+    # invalidated.
+    if segment.file_id:
+        key = f"file:{segment.file_id}"
+    else:
+        key = make_recording_filename(segment)
+
+    result = segment_cache.get(key)
+    metrics.incr("replays.usecases.reader.segment_cache", tags={"hit": result is not None})
+    if result is None:
+        result = driver.get(segment)
+        if result is not None:
+            segment_cache.set(key, result, max_size)
+    return result
+
+
+class SegmentCache:
+    """A least-recently-used cache of segment blobs bounded by their total size in bytes."""
+
+    def __init__(self) -> None:
+        self._blobs: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            blob = self._blobs.get(key)
+            if blob is not None:
+                self._blobs.move_to_end(key)
+            return blob
+
+    def set(self, key: str, blob: bytes, max_size: int) -> None:
+        if len(blob) > max_size:
+            return
+
+        with self._lock:
+            previous = self._blobs.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+
+            self._blobs[key] = blob
+            self._size += len(blob)
+
+            while self._size > max_size:
+                _, evicted = self._blobs.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._blobs.clear()
+            self._size = 0
+
+
+segment_cache = SegmentCache()
+
+
 @sentry_sdk.trace
 def decompress(buffer: bytes) -> bytes:
     """Return decompressed output."""
@@ -317,6 +317,17 @@ def taskworker_scheduler(redis_cluster: str, **options: Any) -> None:
     help="The name of the processing pool being used",
     default="unknown",
 )
+@click.option(
+    "--fetch-batch-size",
+    help="The number of tasks to prefetch at once with concurrent RPCs",
+    default=taskworker_constants.DEFAULT_FETCH_BATCH_SIZE,
+)
+@click.option(
+    "--process-type",
+    help="How child processes are started. forkserver forks children from a preloaded server.",
+    default="spawn",
+    type=click.Choice(["spawn", "fork", "forkserver"]),
+)
 @log_options()
 @configuration
 def taskworker(**options: Any) -> None:
@@ -340,11 +351,15 @@ def run_taskworker(
     result_queue_maxsize: int,
     rebalance_after: int,
     processing_pool_name: str,
+    fetch_batch_size: int,
+    process_type: str,
     **options: Any,
 ) -> None:
     """
     taskworker factory that can be reloaded
     """
+    from django.conf import settings
+
     from sentry.taskworker.worker import TaskWorker
 
     with managed_bgtasks(role="taskworker"):
@@ -358,6 +373,9 @@ def run_taskworker(
             result_queue_maxsize=result_queue_maxsize,
             rebalance_after=rebalance_after,
             processing_pool_name=processing_pool_name,
+            fetch_batch_size=fetch_batch_size,
+            process_type=process_type,
+            child_pools=settings.TASKWORKER_CHILD_POOLS.get(processing_pool_name),
             **options,
         )
         exitcode = worker.start()
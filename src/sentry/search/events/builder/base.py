@@ -53,6 +53,7 @@ from sentry.search.events.types import (
     ParamsType,
     QueryBuilderConfig,
     SelectType,
+    SnubaData,
     SnubaParams,
     WhereType,
 )
@@ -74,6 +75,7 @@ from sentry.utils.snuba import (
     raw_snql_query,
     resolve_column,
 )
+from sentry.utils.snuba_columnar import ColumnarData
 from sentry.utils.validators import INVALID_ID_DETAILS, INVALID_SPAN_ID, WILDCARD_NOT_ALLOWED
 
 DATASET_TO_ENTITY_MAP: Mapping[Dataset, EntityKey] = {
@@ -1592,7 +1594,13 @@ class BaseQueryBuilder:
     ) -> Any:
         if not referrer:
             InvalidSearchQuery("Query missing referrer.")
-        return raw_snql_query(self.get_snql_query(), referrer, use_cache, query_source)
+        return raw_snql_query(
+            self.get_snql_query(),
+            referrer,
+            use_cache,
+            query_source,
+            columnar=self.builder_config.columnar_results,
+        )
 
     def process_results(self, results: Any) -> EventsResponse:
         with sentry_sdk.start_span(op="QueryBuilder", name="process_results") as span:
@@ -1636,6 +1644,12 @@ class BaseQueryBuilder:
                             field_meta[field_key] = "string"
 
             # process the field results
+            def resolve_key(key: str) -> str:
+                resolved_key = translated_columns.get(key, key)
+                if not self.builder_config.skip_tag_resolution:
+                    resolved_key = self.prefixed_to_tag_map.get(resolved_key, resolved_key)
+                return resolved_key
+
             def get_row(row: dict[str, Any]) -> dict[str, Any]:
                 transformed = {}
                 for key, value in row.items():
@@ -1645,15 +1659,28 @@ class BaseQueryBuilder:
                     else:
                         new_value = value
 
-                    resolved_key = translated_columns.get(key, key)
-                    if not self.builder_config.skip_tag_resolution:
-                        resolved_key = self.prefixed_to_tag_map.get(resolved_key, resolved_key)
-                    transformed[resolved_key] = new_value
+                    transformed[resolve_key(key)] = new_value
 
                 return transformed
 
+            def get_columns(data: ColumnarData) -> ColumnarData:
+                columns = {}
+                for key, values in data.columns.items():
+                    values = [process_value(value) for value in values]
+                    if key in self.value_resolver_map:
+                        value_resolver = self.value_resolver_map[key]
+                        values = [value_resolver(value) for value in values]
+                    columns[resolve_key(key)] = values
+                return ColumnarData(columns, len(data))
+
+            data = results["data"]
             return {
-                "data": [get_row(row) for row in results["data"]],
+                "data": (
+                    # Columnar data can be read like a list of rows
+                    cast(SnubaData, get_columns(data))
+                    if isinstance(data, ColumnarData)
+                    else [get_row(row) for row in data]
+                ),
                 "meta": {
                     "fields": field_meta,
                     "tips": {},
@@ -257,6 +257,8 @@ class QueryBuilderConfig:
     insights_metrics_override_metric_layer: bool = False
     # Allow the errors query builder to use the entity prefix for fields
     use_entity_prefix_for_fields: bool = False
+    # Return result data as `ColumnarData` instead of a list of row dicts
+    columnar_results: bool = False
 
 
 @dataclass(frozen=True)
@@ -40,6 +40,12 @@ from sentry.models.group import Group
 from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.search.events.filter import convert_search_filter_to_snuba_query, format_search_filter
+from sentry.search.snuba.query_state import (
+    SearchQueryState,
+    build_query_state_key,
+    get_query_state,
+    set_query_state,
+)
 from sentry.snuba.dataset import Dataset
 from sentry.users.models.user import User
 from sentry.users.services.user.model import RpcUser
@@ -850,35 +856,36 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             )
             return results
 
-        # Here we check if all the django filters reduce the set of groups down
-        # to something that we can send down to Snuba in a `group_id IN (...)`
-        # clause.
-        max_candidates = options.get("snuba.search.max-pre-snuba-candidates")
-
-        with sentry_sdk.start_span(op="snuba_group_query") as span:
-            group_ids = list(
-                group_queryset.using_replica().values_list("id", flat=True)[: max_candidates + 1]
+        # When query state is enabled, the first page of a query stores its candidates
+        # and ranked groups, and subsequent pages continue from that state. Snuba is
+        # then queried without the cursor, since the stored ranking starts from the top.
+        query_state_key = None
+        query_state = None
+        if options.get("snuba.search.query-state.enabled"):
+            query_state_key = build_query_state_key(
+                organization_id=projects[0].organization_id,
+                project_ids=[p.id for p in projects],
+                environment_ids=environments and [environment.id for environment in environments],
+                sort_by=sort_by,
+                search_filters=search_filters,
+                date_from=date_from,
+                date_to=date_to,
+                actor_id=getattr(actor, "id", None),
+                aggregate_kwargs=aggregate_kwargs,
             )
-            span.set_data("Max Candidates", max_candidates)
-            span.set_data("Result Size", len(group_ids))
-        metrics.distribution("snuba.search.num_candidates", len(group_ids))
-        too_many_candidates = False
-        if not group_ids:
-            # no matches could possibly be found from this point on
-            metrics.incr("snuba.search.no_candidates", skip_internal=False)
-            return self.empty_result
-        elif len(group_ids) > max_candidates:
-            # If the pre-filter query didn't include anything to significantly
-            # filter down the number of results (from 'first_release', 'status',
-            # 'bookmarked_by', 'assigned_to', 'unassigned', or 'subscribed_by')
-            # then it might have surpassed the `max_candidates`. In this case,
-            # we *don't* want to pass candidates down to Snuba, and instead we
-            # want Snuba to do all the filtering/sorting it can and *then* apply
-            # this queryset to the results from Snuba, which we call
-            # post-filtering.
-            metrics.incr("snuba.search.too_many_candidates", skip_internal=False)
-            too_many_candidates = True
-            group_ids = []
+            if cursor is not None:
+                query_state = get_query_state(query_state_key)
+
+        if query_state is not None:
+            start, end = query_state.start, query_state.end
+            group_ids = query_state.group_ids
+            too_many_candidates = query_state.too_many_candidates
+        else:
+            group_ids, too_many_candidates = self.get_candidate_group_ids(group_queryset)
+            if not group_ids and not too_many_candidates:
+                return self.empty_result
+
+        snuba_cursor = None if query_state is not None else cursor
 
         sort_field = self.sort_strategies[sort_by]
         chunk_growth = options.get("snuba.search.chunk-growth-rate")
@@ -886,24 +893,32 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         chunk_limit = limit
         offset = 0
         num_chunks = 0
-        hits = self.calculate_hits(
-            group_ids,
-            too_many_candidates,
-            sort_field,
-            projects,
-            retention_window_start,
-            group_queryset,
-            environments,
-            sort_by,
-            limit,
-            cursor,
-            count_hits,
-            paginator_options,
-            search_filters,
-            start,
-            end,
-            actor,
-        )
+        if query_state is not None and not count_hits:
+            hits = None
+        elif query_state is not None and query_state.hits is not None:
+            hits = query_state.hits
+        elif query_state is not None and group_ids:
+            # All of the candidates were ranked in a single chunk, so this is exact
+            hits = len(query_state.result_groups)
+        else:
+            hits = self.calculate_hits(
+                group_ids,
+                too_many_candidates,
+                sort_field,
+                projects,
+                retention_window_start,
+                group_queryset,
+                environments,
+                sort_by,
+                limit,
+                snuba_cursor,
+                count_hits,
+                paginator_options,
+                search_filters,
+                start,
+                end,
+                actor,
+            )
         if count_hits and hits == 0:
             return self.empty_result
 
@@ -914,6 +929,19 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         max_time = options.get("snuba.search.max-total-chunk-time-seconds")
         time_start = time.time()
         more_results = False
+        needs_more_chunks = True
+
+        if query_state is not None:
+            result_groups = list(query_state.result_groups)
+            result_group_ids = {group_id for group_id, _ in result_groups}
+            offset = query_state.offset
+            more_results = query_state.more_results
+            paginator_results = SequencePaginator(
+                [(score, id) for (id, score) in result_groups], reverse=True, **paginator_options
+            ).get_result(limit, cursor, known_hits=hits, max_hits=max_hits)
+            needs_more_chunks = not (
+                group_ids or len(paginator_results.results) >= limit or not more_results
+            )
 
         # Do smaller searches in chunks until we have enough results
         # to answer the query (or hit the end of possible results). We do
@@ -921,7 +949,7 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         # sorted by `last_seen`, and we want to avoid returning all of
         # a project's groups and then post-sorting them all in Postgres
         # when typically the first N results will do.
-        while (time.time() - time_start) < max_time:
+        while needs_more_chunks and (time.time() - time_start) < max_time:
             num_chunks += 1
 
             # grow the chunk size on each iteration to account for huge projects
@@ -938,7 +966,7 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
                 environment_ids=environments and [environment.id for environment in environments],
                 organization=projects[0].organization,
                 sort_field=sort_field,
-                cursor=cursor,
+                cursor=snuba_cursor,
                 group_ids=group_ids,
                 limit=chunk_limit,
                 offset=offset,
@@ -997,6 +1025,21 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             if group_ids or len(paginator_results.results) >= limit or not more_results:
                 break
 
+        if query_state_key is not None and snuba_cursor is None and num_chunks:
+            set_query_state(
+                query_state_key,
+                SearchQueryState(
+                    start=start,
+                    end=end,
+                    group_ids=group_ids,
+                    too_many_candidates=too_many_candidates,
+                    result_groups=result_groups,
+                    offset=offset,
+                    more_results=more_results,
+                    hits=hits,
+                ),
+            )
+
         # HACK: We're using the SequencePaginator to mask the complexities of going
         # back and forth between two databases. This causes a problem with pagination
         # because we're 'lying' to the SequencePaginator (it thinks it has the entire
@@ -1028,6 +1071,39 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         )
         return paginator_results
 
+    def get_candidate_group_ids(self, group_queryset: BaseQuerySet) -> tuple[list[int], bool]:
+        """
+        Checks whether the django filters reduce the set of groups down to something
+        that we can send down to Snuba in a `group_id IN (...)` clause.
+
+        Returns a tuple of the candidate group ids and whether there were too many
+        candidates to pass down. If there were too many, the list of ids is empty.
+        """
+        max_candidates = options.get("snuba.search.max-pre-snuba-candidates")
+
+        with sentry_sdk.start_span(op="snuba_group_query") as span:
+            group_ids = list(
+                group_queryset.using_replica().values_list("id", flat=True)[: max_candidates + 1]
+            )
+            span.set_data("Max Candidates", max_candidates)
+            span.set_data("Result Size", len(group_ids))
+        metrics.distribution("snuba.search.num_candidates", len(group_ids))
+        if not group_ids:
+            # no matches could possibly be found from this point on
+            metrics.incr("snuba.search.no_candidates", skip_internal=False)
+        elif len(group_ids) > max_candidates:
+            # If the pre-filter query didn't include anything to significantly
+            # filter down the number of results (from 'first_release', 'status',
+            # 'bookmarked_by', 'assigned_to', 'unassigned', or 'subscribed_by')
+            # then it might have surpassed the `max_candidates`. In this case,
+            # we *don't* want to pass candidates down to Snuba, and instead we
+            # want Snuba to do all the filtering/sorting it can and *then* apply
+            # this queryset to the results from Snuba, which we call
+            # post-filtering.
+            metrics.incr("snuba.search.too_many_candidates", skip_internal=False)
+            return [], True
+        return group_ids, False
+
     def calculate_hits(
         self,
         group_ids: Sequence[int],
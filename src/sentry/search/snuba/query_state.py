@@ -0,0 +1,138 @@
+"""
+Short-lived per-query state for `PostgresSnubaQueryExecutor`.
+
+Paginating the issue stream re-runs the same search for every page: the Postgres
+candidate query, the hits estimate and one or more Snuba chunks. When enabled, the
+executor stores the candidate group ids and the groups it has already ranked for the
+first page of a query, and later pages of the same query continue from that state
+instead of starting from scratch.
+"""
+
+from __future__ import annotations
+
+import zlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import orjson
+from django.conf import settings
+from sentry_redis_tools.clients import RedisCluster, StrictRedis
+
+from sentry import options
+from sentry.utils import metrics, redis
+from sentry.utils.dates import to_datetime
+from sentry.utils.hashlib import hash_values
+
+QUERY_STATE_KEY = "search:query-state:{}"
+
+
+@dataclass
+class SearchQueryState:
+    # The time range the state was computed for. Continuing a query has to use the same
+    # range, otherwise Snuba offsets would no longer line up with the stored ranking.
+    start: datetime
+    end: datetime
+    # Postgres candidates that were passed down to Snuba. Empty if there were too many.
+    group_ids: list[int]
+    too_many_candidates: bool
+    # (group_id, score) tuples that have been ranked and post-filtered so far.
+    result_groups: list[tuple[int, Any]]
+    # Number of Snuba rows consumed so far, and whether Snuba has more.
+    offset: int
+    more_results: bool
+    hits: int | None
+
+    def to_bytes(self) -> bytes:
+        # Candidate ids are stored sorted and delta encoded, which makes them compress
+        # down to roughly a bitmap's worth of bytes for dense id ranges.
+        sorted_ids = sorted(self.group_ids)
+        deltas = [b - a for a, b in zip([0] + sorted_ids, sorted_ids)]
+        return zlib.compress(
+            orjson.dumps(
+                {
+                    "start": self.start.timestamp(),
+                    "end": self.end.timestamp(),
+                    "group_ids": deltas,
+                    "too_many_candidates": self.too_many_candidates,
+                    "result_groups": self.result_groups,
+                    "offset": self.offset,
+                    "more_results": self.more_results,
+                    "hits": self.hits,
+                }
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, value: bytes) -> SearchQueryState:
+        data = orjson.loads(zlib.decompress(value))
+        group_ids = []
+        group_id = 0
+        for delta in data["group_ids"]:
+            group_id += delta
+            group_ids.append(group_id)
+        return cls(
+            start=to_datetime(data["start"]),
+            end=to_datetime(data["end"]),
+            group_ids=group_ids,
+            too_many_candidates=data["too_many_candidates"],
+            result_groups=[(group_id, score) for group_id, score in data["result_groups"]],
+            offset=data["offset"],
+            more_results=data["more_results"],
+            hits=data["hits"],
+        )
+
+
+def get_redis_client() -> RedisCluster | StrictRedis:
+    cluster_key = settings.SENTRY_SEARCH_QUERY_STATE_REDIS_CLUSTER
+    return redis.redis_clusters.get(cluster_key)  # type: ignore[return-value]
+
+
+def build_query_state_key(
+    organization_id: int,
+    project_ids: Sequence[int],
+    environment_ids: Sequence[int] | None,
+    sort_by: str,
+    search_filters: Sequence[Any] | None,
+    date_from: datetime | None,
+    date_to: datetime | None,
+    actor_id: int | None,
+    aggregate_kwargs: Any | None,
+) -> str:
+    """
+    Builds a key identifying everything that determines a query's ranking. Paging
+    parameters (cursor and limit) are intentionally excluded so that all pages of a query
+    share the same state.
+    """
+    return QUERY_STATE_KEY.format(
+        hash_values(
+            [
+                organization_id,
+                sorted(project_ids),
+                sorted(environment_ids) if environment_ids is not None else None,
+                sort_by,
+                [repr(search_filter) for search_filter in search_filters or ()],
+                date_from.isoformat() if date_from else None,
+                date_to.isoformat() if date_to else None,
+                actor_id,
+                repr(aggregate_kwargs) if aggregate_kwargs else None,
+            ]
+        )
+    )
+
+
+def get_query_state(key: str) -> SearchQueryState | None:
+    value = get_redis_client().get(key)
+    if value is None:
+        metrics.incr("snuba.search.query_state.miss")
+        return None
+
+    metrics.incr("snuba.search.query_state.hit")
+    return SearchQueryState.from_bytes(value)
+
+
+def set_query_state(key: str, state: SearchQueryState) -> None:
+    value = state.to_bytes()
+    metrics.distribution("snuba.search.query_state.size", len(value), unit="byte")
+    get_redis_client().set(key, value, ex=options.get("snuba.search.query-state.ttl"))
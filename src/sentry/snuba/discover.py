@@ -185,6 +185,7 @@ def query(
     fallback_to_transactions: bool = False,
     query_source: QuerySource | None = None,
     debug: bool = False,
+    columnar_results: bool = False,
 ) -> EventsResponse:
     """
     High-level API for doing arbitrary user queries against events.
@@ -218,6 +219,8 @@ def query(
     sample - The sample rate to run the query with
     fallback_to_transactions - Whether to fallback to the transactions dataset if the query
                     fails in metrics enhanced requests. To be removed once the discover dataset is split.
+    columnar_results - Return the data as `ColumnarData` rather than a list of rows, which
+                    is cheaper for large results.
     """
     if not selected_columns:
         raise InvalidSearchQuery("No columns selected")
@@ -247,6 +250,7 @@ def query(
             has_metrics=has_metrics,
             transform_alias_to_input_format=transform_alias_to_input_format,
             skip_tag_resolution=skip_tag_resolution,
+            columnar_results=columnar_results,
         ),
     )
     if conditions is not None:
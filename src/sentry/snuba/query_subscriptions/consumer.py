@@ -1,5 +1,6 @@
 import logging
-from collections.abc import Callable
+from collections import defaultdict
+from collections.abc import Callable, Sequence
 from datetime import timezone
 
 import sentry_sdk
@@ -16,8 +17,12 @@ from sentry.utils import metrics
 
 logger = logging.getLogger(__name__)
 TQuerySubscriptionCallable = Callable[[QuerySubscriptionUpdate, QuerySubscription], None]
+TQuerySubscriptionBatchCallable = Callable[
+    [Sequence[tuple[QuerySubscriptionUpdate, QuerySubscription]]], None
+]
 
 subscriber_registry: dict[str, TQuerySubscriptionCallable] = {}
+batch_subscriber_registry: dict[str, TQuerySubscriptionBatchCallable] = {}
 
 
 def register_subscriber(
@@ -32,6 +37,24 @@ def register_subscriber(
     return inner
 
 
+def register_batch_subscriber(
+    subscriber_key: str,
+) -> Callable[[TQuerySubscriptionBatchCallable], TQuerySubscriptionBatchCallable]:
+    """
+    Registers a callback that processes a batch of updates for a subscription type at
+    once. A batch callback is only used by consumers running in batched mode, and must
+    process updates for the same subscription in the order they are passed.
+    """
+
+    def inner(func: TQuerySubscriptionBatchCallable) -> TQuerySubscriptionBatchCallable:
+        if subscriber_key in batch_subscriber_registry:
+            raise Exception("Batch handler already registered for %s" % subscriber_key)
+        batch_subscriber_registry[subscriber_key] = func
+        return func
+
+    return inner
+
+
 def parse_message_value(
     value: bytes, jsoncodec: Codec[SubscriptionResult]
 ) -> QuerySubscriptionUpdate:
@@ -176,6 +199,69 @@ def handle_message(
             callback(contents, subscription)
 
 
+def handle_message_batch(
+    messages: Sequence[tuple[bytes, int, int]],
+    topic: str,
+    dataset: str,
+    jsoncodec: Codec[SubscriptionResult],
+) -> None:
+    """
+    Batched version of `handle_message`. Accepts a sequence of
+    `(message_value, message_offset, message_partition)` tuples, fetches all of their
+    subscriptions with one query and passes the updates to the batch callback
+    registered for each subscription type.
+
+    Messages that can't be handled in bulk (invalid payloads, missing or inactive
+    subscriptions, or subscription types without a batch callback) are passed to
+    `handle_message` one at a time so that they are handled exactly as they would be
+    outside of batched mode.
+    """
+    parsed: list[tuple[tuple[bytes, int, int], QuerySubscriptionUpdate]] = []
+    for message in messages:
+        message_value = message[0]
+        try:
+            parsed.append((message, parse_message_value(message_value, jsoncodec)))
+        except InvalidMessageError:
+            handle_message(*message, topic, dataset, jsoncodec)
+
+    with metrics.timer(
+        "snuba_query_subscriber.fetch_subscriptions_batch", tags={"dataset": dataset}
+    ):
+        subscriptions = {
+            subscription.subscription_id: subscription
+            for subscription in QuerySubscription.objects.filter(
+                subscription_id__in={contents["subscription_id"] for _, contents in parsed},
+                status=QuerySubscription.Status.ACTIVE.value,
+            ).select_related("snuba_query", "project", "project__organization")
+        }
+
+    batches: dict[str, list[tuple[QuerySubscriptionUpdate, QuerySubscription]]] = defaultdict(list)
+    for message, contents in parsed:
+        subscription = subscriptions.get(contents["subscription_id"])
+        if subscription is None or subscription.type not in batch_subscriber_registry:
+            handle_message(*message, topic, dataset, jsoncodec)
+            continue
+        batches[subscription.type].append((contents, subscription))
+
+    for subscription_type, updates in batches.items():
+        with (
+            sentry_sdk.start_span(op="process_message_batch") as span,
+            metrics.timer(
+                "snuba_query_subscriber.batch_callback.duration",
+                instance=subscription_type,
+                tags={"dataset": dataset},
+            ),
+        ):
+            span.set_data("batch_size", len(updates))
+            metrics.distribution(
+                "snuba_query_subscriber.batch_size",
+                len(updates),
+                tags={"dataset": dataset},
+                unit="element",
+            )
+            batch_subscriber_registry[subscription_type](updates)
+
+
 class InvalidMessageError(Exception):
     pass
 
@@ -1,6 +1,7 @@
 import logging
 from collections.abc import Mapping
 from functools import partial
+from typing import Literal
 
 import sentry_sdk
 from arroyo.backends.kafka.consumer import KafkaPayload
@@ -10,6 +11,7 @@ from arroyo.processing.strategies import (
     ProcessingStrategyFactory,
     RunTask,
 )
+from arroyo.processing.strategies.batching import BatchStep, ValuesBatch
 from arroyo.types import BrokerValue, Commit, Message, Partition
 from sentry_kafka_schemas import get_codec
 
@@ -34,6 +36,7 @@ class QuerySubscriptionStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         output_block_size: int | None,
         multi_proc: bool = True,
         topic_override: str | None = None,
+        mode: Literal["parallel", "batched"] = "parallel",
     ):
         self.dataset = Dataset(dataset)
         self.logical_topic = dataset_to_logical_topic[self.dataset]
@@ -46,6 +49,7 @@ class QuerySubscriptionStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         self.input_block_size = input_block_size
         self.output_block_size = output_block_size
         self.multi_proc = multi_proc
+        self.batched = mode == "batched"
         self.pool = MultiprocessingPool(num_processes)
 
     def create_with_partitions(
@@ -53,6 +57,28 @@ class QuerySubscriptionStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         commit: Commit,
         partitions: Mapping[Partition, int],
     ) -> ProcessingStrategy[KafkaPayload]:
+        if self.batched:
+            batch_callable = partial(process_batch, self.dataset, self.topic, self.logical_topic)
+            if self.multi_proc:
+                batch_processor = run_task_with_multiprocessing(
+                    function=batch_callable,
+                    next_step=CommitOffsets(commit),
+                    # Each message at this point is already a batch of updates, so
+                    # we don't batch any further before handing off to the pool.
+                    max_batch_size=1,
+                    max_batch_time=self.max_batch_time,
+                    pool=self.pool,
+                    input_block_size=self.input_block_size,
+                    output_block_size=self.output_block_size,
+                )
+            else:
+                batch_processor = RunTask(batch_callable, CommitOffsets(commit))
+            return BatchStep(
+                max_batch_size=self.max_batch_size,
+                max_batch_time=self.max_batch_time,
+                next_step=batch_processor,
+            )
+
         callable = partial(process_message, self.dataset, self.topic, self.logical_topic)
         if self.multi_proc:
             return run_task_with_multiprocessing(
@@ -111,3 +137,40 @@ def process_message(
                     "value": message_value,
                 },
             )
+
+
+def process_batch(
+    dataset: Dataset,
+    topic: str,
+    logical_topic: str,
+    message: Message[ValuesBatch[KafkaPayload]],
+) -> None:
+    from sentry.snuba.query_subscriptions.consumer import handle_message_batch
+    from sentry.utils import metrics
+
+    messages = []
+    for value in message.payload:
+        assert isinstance(value, BrokerValue)
+        messages.append((value.payload.value, value.offset, value.partition.index))
+
+    with (
+        sentry_sdk.start_transaction(
+            op="handle_message_batch",
+            name="query_subscription_consumer_process_batch",
+            custom_sampling_context={"sample_rate": options.get("subscriptions-query.sample-rate")},
+        ),
+        metrics.timer(
+            "snuba_query_subscriber.handle_message_batch", tags={"dataset": dataset.value}
+        ),
+    ):
+        try:
+            handle_message_batch(messages, topic, dataset.value, get_codec(logical_topic))
+        except Exception:
+            # Same failsafe as `process_message`, applied to the whole batch.
+            logger.exception(
+                "Unexpected error while handling message batch in QuerySubscriptionStrategy. Skipping batch.",
+                extra={
+                    "batch_size": len(messages),
+                    "first_offset": messages[0][1] if messages else None,
+                },
+            )
@@ -16,6 +16,7 @@ from django.utils import timezone
 from sentry.api.serializers import serialize
 from sentry.constants import ObjectStatus
 from sentry.debug_files.artifact_bundles import (
+    BULK_INSERT_BATCH_SIZE,
     INDEXING_THRESHOLD,
     get_bundles_indexing_state,
     index_artifact_bundles_for_release,
@@ -446,40 +447,14 @@ class ArtifactBundlePostAssembler:
                     defaults=new_date_added,
                 )
 
-            for project_id in self.project_ids:
-                ProjectArtifactBundle.objects.create_or_update(
-                    organization_id=self.organization.id,
-                    project_id=project_id,
-                    artifact_bundle=artifact_bundle,
-                    values=new_date_added,
-                    defaults=new_date_added,
-                )
-
-            # Instead of doing a `create_or_update` one-by-one, we will instead:
-            # - Use a `bulk_create` with `ignore_conflicts` to insert new rows efficiently
-            #   if the artifact bundle was newly inserted. This is based on the assumption
-            #   that the `bundle_id` is deterministic and the `created` flag signals that
-            #   this identical bundle was already inserted.
-            # - Otherwise, update all the affected/conflicting rows with a single query.
-            if created:
-                debug_id_to_insert = [
-                    DebugIdArtifactBundle(
-                        organization_id=self.organization.id,
-                        debug_id=debug_id,
-                        artifact_bundle=artifact_bundle,
-                        source_file_type=source_file_type.value,
-                        date_added=date_snapshot,
-                    )
-                    for debug_id, source_file_type in self.archive.get_all_debug_ids()
-                ]
-                DebugIdArtifactBundle.objects.bulk_create(
-                    debug_id_to_insert, batch_size=50, ignore_conflicts=True
-                )
-            else:
-                DebugIdArtifactBundle.objects.filter(
-                    organization_id=self.organization.id,
-                    artifact_bundle=artifact_bundle,
-                ).update(date_added=date_snapshot)
+            # Instead of doing a `create_or_update` one-by-one for every project and debug id, we
+            # update all the existing rows with a single query and `bulk_create` the missing ones.
+            self._create_or_update_project_artifact_bundles(
+                artifact_bundle, created=created, date_added=date_snapshot
+            )
+            self._create_or_update_debug_id_artifact_bundles(
+                artifact_bundle, created=created, date_added=date_snapshot
+            )
 
         metrics.incr("sourcemaps.upload.artifact_bundle")
 
@@ -569,6 +544,77 @@ class ArtifactBundlePostAssembler:
 
             return existing_artifact_bundle, False
 
+    @sentry_sdk.tracing.trace
+    def _create_or_update_project_artifact_bundles(
+        self, artifact_bundle: ArtifactBundle, created: bool, date_added: datetime
+    ) -> None:
+        project_ids = set(self.project_ids)
+
+        # A newly created bundle can not be associated with any project yet.
+        if not created:
+            existing_rows = ProjectArtifactBundle.objects.filter(
+                organization_id=self.organization.id,
+                artifact_bundle=artifact_bundle,
+                project_id__in=project_ids,
+            )
+            existing_project_ids = set(existing_rows.values_list("project_id", flat=True))
+            if existing_project_ids:
+                existing_rows.update(date_added=date_added)
+            project_ids -= existing_project_ids
+
+        ProjectArtifactBundle.objects.bulk_create(
+            [
+                ProjectArtifactBundle(
+                    organization_id=self.organization.id,
+                    project_id=project_id,
+                    artifact_bundle=artifact_bundle,
+                    date_added=date_added,
+                )
+                for project_id in project_ids
+            ],
+            batch_size=BULK_INSERT_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+    @sentry_sdk.tracing.trace
+    def _create_or_update_debug_id_artifact_bundles(
+        self, artifact_bundle: ArtifactBundle, created: bool, date_added: datetime
+    ) -> None:
+        debug_ids = {
+            (debug_id, source_file_type.value)
+            for debug_id, source_file_type in self.archive.get_all_debug_ids()
+        }
+
+        # A re-uploaded bundle keeps its existing rows, and we only insert the debug ids which
+        # were not part of the bundle before.
+        if not created:
+            existing_rows = DebugIdArtifactBundle.objects.filter(
+                organization_id=self.organization.id,
+                artifact_bundle=artifact_bundle,
+            )
+            existing_rows.update(date_added=date_added)
+            debug_ids -= {
+                (str(debug_id), source_file_type)
+                for debug_id, source_file_type in existing_rows.values_list(
+                    "debug_id", "source_file_type"
+                )
+            }
+
+        DebugIdArtifactBundle.objects.bulk_create(
+            [
+                DebugIdArtifactBundle(
+                    organization_id=self.organization.id,
+                    debug_id=debug_id,
+                    artifact_bundle=artifact_bundle,
+                    source_file_type=source_file_type,
+                    date_added=date_added,
+                )
+                for debug_id, source_file_type in debug_ids
+            ],
+            batch_size=BULK_INSERT_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
     def _remove_duplicate_artifact_bundles(self, ids: list[int]):
         # In case there are no ids to delete, we don't want to run the query, otherwise it will result in a deletion of
         # all ArtifactBundle(s) with the specific bundle_id.
@@ -4,6 +4,8 @@ import time
 import sentry_sdk
 from django.db import router, transaction
 
+from sentry import options
+from sentry.constants import ObjectStatus
 from sentry.models.organization import Organization
 from sentry.relay import projectconfig_cache, projectconfig_debounce_cache
 from sentry.silo.base import SiloMode
@@ -109,11 +111,14 @@ def validate_args(organization_id=None, project_id=None, public_key=None):
         raise TypeError("Must provide exactly one of organzation_id, project_id or public_key")
 
 
-def compute_configs(organization_id=None, project_id=None, public_key=None):
+def compute_configs(organization_id=None, project_id=None, public_key=None, sections=None):
     """Computes all configs for the org, project or single public key.
 
     You must only provide one single argument, not all.
 
+    :param sections: If given, only these sections of the cached configs are recomputed,
+       see :data:`sentry.relay.config.CONFIG_SECTIONS`.
+
     :returns: A dict mapping all affected public keys to their config.  The dict will not
        contain keys which should be retained in the cache unchanged.
     """
@@ -130,23 +135,8 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
         # which might cause the key to disappear and trigger the task again.  Without this behavior
         # it could be possible that refrequent invalidations cause the task to take excessive time
         # to complete.
-        for organization in Organization.objects.filter(id=organization_id):
-            for project in Project.objects.filter(organization_id=organization_id):
-                project.set_cached_field_value("organization", organization)
-                for key in ProjectKey.objects.filter(project_id=project.id):
-                    key.set_cached_field_value("project", project)
-                    # If we find the config in the cache it means it was active.  As such we want to
-                    # recalculate it.  If the config was not there at all, we leave it and avoid the
-                    # cost of re-computation.
-                    if projectconfig_cache.backend.get(key.public_key) is not None:
-                        configs[key.public_key] = compute_projectkey_config(key)
-                        action = "recompute"
-                    else:
-                        action = "not-cached"
-                    metrics.incr(
-                        "relay.projectconfig_cache.invalidation.recompute",
-                        tags={"action": action, "scope": "organization"},
-                    )
+        for chunk in iter_organization_configs(organization_id, sections=sections):
+            configs.update(chunk)
     elif project_id:
         for project in Project.objects.filter(id=project_id):
             for key in ProjectKey.objects.filter(project_id=project_id):
@@ -154,9 +144,9 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
                 # If we find the config in the cache it means it was active.  As such we want to
                 # recalculate it.  If the config was not there at all, we leave it and avoid the
                 # cost of re-computation.
-                if projectconfig_cache.backend.get(key.public_key) is not None:
-                    configs[key.public_key] = compute_projectkey_config(key)
-                    action = "recompute"
+                cached_config = projectconfig_cache.backend.get(key.public_key)
+                if cached_config is not None:
+                    action = _recompute_projectkey_config(configs, key, cached_config, sections)
                 else:
                     action = "not-cached"
                     metrics.incr(
@@ -177,7 +167,11 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
             # bug was fixed in https://github.com/getsentry/sentry/pull/35671
             configs[public_key] = {"disabled": True}
         else:
-            configs[public_key] = compute_projectkey_config(key)
+            cached_config = projectconfig_cache.backend.get(public_key) if sections else None
+            if cached_config is not None:
+                _recompute_projectkey_config(configs, key, cached_config, sections)
+            else:
+                configs[public_key] = compute_projectkey_config(key)
 
     else:
         raise TypeError("One of the arguments must not be None")
@@ -185,9 +179,95 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     return configs
 
 
-def compute_projectkey_config(key):
+#: How many project keys :func:`iter_organization_configs` computes configs for at a time.
+ORGANIZATION_CONFIGS_CHUNK_SIZE = 500
+
+
+def iter_organization_configs(organization_id, sections=None):
+    """Computes the configs of all cached project keys of an organization.
+
+    Projects and keys are loaded with one query each, and organization-level data is
+    only looked up once for all projects.  Configs are computed in chunks of
+    :data:`ORGANIZATION_CONFIGS_CHUNK_SIZE` project keys, which bounds the memory used for
+    large organizations.
+
+    :param sections: See :func:`compute_configs`.
+    :returns: An iterator of dicts mapping public keys to their config, one per chunk.
+    """
+    from sentry.models.project import Project
+    from sentry.models.projectkey import ProjectKey
+    from sentry.relay.config import OrganizationConfigData
+
+    for organization in Organization.objects.filter(id=organization_id):
+        organization_data = OrganizationConfigData(organization)
+        projects = {}
+        for project in Project.objects.filter(organization_id=organization_id):
+            project.set_cached_field_value("organization", organization)
+            projects[project.id] = project
+
+        keys = list(ProjectKey.objects.filter(project_id__in=projects).order_by("project_id"))
+        for i in range(0, len(keys), ORGANIZATION_CONFIGS_CHUNK_SIZE):
+            chunk = keys[i : i + ORGANIZATION_CONFIGS_CHUNK_SIZE]
+            cached_configs = projectconfig_cache.backend.get_many([key.public_key for key in chunk])
+
+            configs = {}
+            for key in chunk:
+                key.set_cached_field_value("project", projects[key.project_id])
+                # If we find the config in the cache it means it was active.  As such we want to
+                # recalculate it.  If the config was not there at all, we leave it and avoid the
+                # cost of re-computation.
+                cached_config = cached_configs.get(key.public_key)
+                if cached_config is not None:
+                    action = _recompute_projectkey_config(
+                        configs, key, cached_config, sections, organization_data
+                    )
+                else:
+                    action = "not-cached"
+                metrics.incr(
+                    "relay.projectconfig_cache.invalidation.recompute",
+                    tags={"action": action, "scope": "organization"},
+                )
+            yield configs
+
+
+def _recompute_projectkey_config(configs, key, cached_config, sections, organization_data=None):
+    """Recomputes the cached config of a :class:`ProjectKey` into ``configs``.
+
+    Only ``sections`` are recomputed if given, in which case ``configs`` is left
+    unchanged if none of them changed.
+
+    :returns: The action taken, to tag metrics with.
+    """
+    from sentry.models.projectkey import ProjectKeyStatus
+    from sentry.relay.config import recompute_project_config_sections
+
+    if (
+        not sections
+        or cached_config.get("disabled")
+        or key.status != ProjectKeyStatus.ACTIVE
+        or key.project.status != ObjectStatus.ACTIVE
+    ):
+        configs[key.public_key] = compute_projectkey_config(key, organization_data)
+        return "recompute"
+
+    config = recompute_project_config_sections(
+        cached_config,
+        key.project,
+        sections,
+        project_keys=[key],
+        organization_data=organization_data,
+    )
+    if config is None:
+        return "unchanged"
+    configs[key.public_key] = config
+    return "recompute-sections"
+
+
+def compute_projectkey_config(key, organization_data=None):
     """Computes a single config for the given :class:`ProjectKey`.
 
+    :param organization_data: Organization-level data to share with the configs of other
+       keys of the same organization, see :func:`sentry.relay.config.get_project_config`.
     :returns: A dict with the project config.
     """
     from sentry.models.projectkey import ProjectKeyStatus
@@ -196,7 +276,9 @@ def compute_projectkey_config(key):
     if key.status != ProjectKeyStatus.ACTIVE:
         return {"disabled": True}
     else:
-        return get_project_config(key.project, project_keys=[key]).to_dict()
+        return get_project_config(
+            key.project, project_keys=[key], organization_data=organization_data
+        ).to_dict()
 
 
 @instrumented_task(
@@ -216,6 +298,7 @@ def invalidate_project_config(
     public_key=None,
     trigger="invalidated",
     trigger_details=None,
+    sections=None,
     **kwargs,
 ):
     """Task which re-computes an invalidated project config.
@@ -236,12 +319,15 @@ def invalidate_project_config(
 
     Both these mean that an outdated version of the project config could still end up in the
     cache.  These will be addressed in the future using config revisions tracked in Redis.
+
+    If ``sections`` is given, only those sections of the cached configs are recomputed.
     """
     # Make sure we start by deleting the deduplication key so that new invalidation triggers
     # can schedule a new message while we already started computing the project config.
-    projectconfig_debounce_cache.invalidation.mark_task_done(
-        organization_id=organization_id, project_id=project_id, public_key=public_key
-    )
+    for debounce_cache in _get_invalidation_debounce_caches(sections):
+        debounce_cache.mark_task_done(
+            organization_id=organization_id, project_id=project_id, public_key=public_key
+        )
 
     if project_id:
         set_current_event_project(project_id)
@@ -253,12 +339,44 @@ def invalidate_project_config(
         sentry_sdk.set_tag("public_key", public_key)
     sentry_sdk.set_tag("trigger", trigger)
     sentry_sdk.set_tag("trigger_details", trigger_details)
+    sentry_sdk.set_tag("sections", ",".join(sections) if sections else "all")
     sentry_sdk.set_context("kwargs", kwargs)
 
-    updated_configs = compute_configs(
-        organization_id=organization_id, project_id=project_id, public_key=public_key
-    )
-    projectconfig_cache.backend.set_many(updated_configs)
+    if not organization_id:
+        updated_configs = compute_configs(
+            project_id=project_id, public_key=public_key, sections=sections
+        )
+        projectconfig_cache.backend.set_many(updated_configs)
+        return
+
+    validate_args(organization_id, project_id, public_key)
+
+    # Write the configs of large organizations as they are computed, rather than keeping
+    # all of them in memory until the end.
+    num_configs = 0
+    with metrics.timer("relay.projectconfig_cache.invalidation.organization.duration"):
+        for configs in iter_organization_configs(organization_id, sections=sections):
+            if configs:
+                projectconfig_cache.backend.set_many(configs)
+                num_configs += len(configs)
+    metrics.distribution("relay.projectconfig_cache.invalidation.organization.configs", num_configs)
+
+
+def _get_invalidated_sections(trigger):
+    """Returns the sections of the project config an invalidation trigger affects, or
+    ``None`` if the whole config needs to be recomputed."""
+    from sentry.relay.config import INVALIDATION_TRIGGER_SECTIONS
+
+    sections = INVALIDATION_TRIGGER_SECTIONS.get(trigger)
+    if sections is None or not options.get("relay.project-config.section-invalidation.enabled"):
+        return None
+    return sorted(sections)
+
+
+def _get_invalidation_debounce_caches(sections):
+    if not sections:
+        return [projectconfig_debounce_cache.invalidation]
+    return [projectconfig_debounce_cache.get_section_invalidation(section) for section in sections]
 
 
 @sentry_sdk.tracing.trace
@@ -378,7 +496,16 @@ def _schedule_invalidate_project_config(
         else:
             check_debounce_keys["organization_id"] = org_id
 
-    if projectconfig_debounce_cache.invalidation.is_debounced(**check_debounce_keys):
+    # A scheduled invalidation of the whole config also covers invalidations of any of its
+    # sections, but not the other way around.
+    sections = _get_invalidated_sections(trigger)
+    if projectconfig_debounce_cache.invalidation.is_debounced(**check_debounce_keys) or (
+        sections
+        and all(
+            debounce_cache.is_debounced(**check_debounce_keys)
+            for debounce_cache in _get_invalidation_debounce_caches(sections)
+        )
+    ):
         # If this task is already in the queue, do not schedule another task.
         metrics.incr(
             "relay.projectconfig_cache.skipped",
@@ -395,18 +522,19 @@ def _schedule_invalidate_project_config(
         },
     )
 
-    invalidate_project_config.apply_async(
-        countdown=countdown,
-        kwargs={
-            "project_id": project_id,
-            "organization_id": organization_id,
-            "public_key": public_key,
-            "trigger": trigger,
-            "trigger_details": trigger_details,
-        },
-    )
+    task_kwargs = {
+        "project_id": project_id,
+        "organization_id": organization_id,
+        "public_key": public_key,
+        "trigger": trigger,
+        "trigger_details": trigger_details,
+    }
+    if sections:
+        task_kwargs["sections"] = sections
+    invalidate_project_config.apply_async(countdown=countdown, kwargs=task_kwargs)
 
     # Use the original arguments to this function to set the debounce key.
-    projectconfig_debounce_cache.invalidation.debounce(
-        organization_id=organization_id, project_id=project_id, public_key=public_key
-    )
+    for debounce_cache in _get_invalidation_debounce_caches(sections):
+        debounce_cache.debounce(
+            organization_id=organization_id, project_id=project_id, public_key=public_key
+        )
@@ -29,6 +29,12 @@ The size of multiprocessing.Queue used to communicate
 with child processes.
 """
 
+DEFAULT_FETCH_BATCH_SIZE = 1
+"""
+The number of task activations a worker prefetches at once.
+Values above 1 issue that many concurrent fetch RPCs per batch.
+"""
+
 DEFAULT_CHILD_TASK_COUNT = 10000
 """
 The number of tasks a worker child process will process
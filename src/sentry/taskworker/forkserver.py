@@ -0,0 +1,16 @@
+"""
+Preload module for the taskworker fork server.
+
+When taskworkers use the `forkserver` process type, this module is imported
+once by the fork server. Children forked from it start with django configured
+and task modules imported, instead of paying that cost on each restart.
+"""
+
+from django.conf import settings
+
+from sentry.runner import configure
+
+configure()
+
+for module in settings.TASKWORKER_IMPORTS:
+    __import__(module)
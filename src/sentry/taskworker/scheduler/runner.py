@@ -51,6 +51,21 @@ class RunStorage:
         result = self._redis.set(self._make_key(taskname), now.isoformat(), ex=duration, nx=True)
         return bool(result)
 
+    def set_many(self, next_runtimes: Mapping[str, datetime]) -> Mapping[str, bool]:
+        """
+        Record spawn times for several tasks in a single round trip.
+
+        Returns a mapping of taskname to the result of `set()` for that task.
+        """
+        now = timezone.now()
+        tasknames = list(next_runtimes)
+        with self._redis.pipeline(transaction=False) as pipeline:
+            for taskname in tasknames:
+                duration = next_runtimes[taskname] - now
+                pipeline.set(self._make_key(taskname), now.isoformat(), ex=duration, nx=True)
+            results = pipeline.execute()
+        return {taskname: bool(result) for taskname, result in zip(tasknames, results)}
+
     def read(self, taskname: str) -> datetime | None:
         """
         Retrieve the last run time of a task
@@ -90,6 +105,7 @@ class ScheduleEntry:
             scheduler = TimedeltaSchedule(schedule)
         self._schedule = scheduler
         self._last_run: datetime | None = None
+        self._next_run = self._compute_next_run()
 
     def __lt__(self, other: ScheduleEntry) -> bool:
         # Secondary sorting for heapq when remaining time is the same
@@ -101,6 +117,11 @@ class ScheduleEntry:
 
         return f"<ScheduleEntry key={self._key} fullname={self.fullname} last_run={last_run} remaining_seconds={remaining_seconds}>"
 
+    @property
+    def next_run(self) -> int:
+        """The timestamp (in whole seconds) this entry is next due at."""
+        return self._next_run
+
     @property
     def fullname(self) -> str:
         return self._task.fullname
@@ -115,12 +136,20 @@ class ScheduleEntry:
 
     def set_last_run(self, last_run: datetime | None) -> None:
         self._last_run = last_run
+        self._next_run = self._compute_next_run()
+
+    def _compute_next_run(self) -> int:
+        # The next runtime only changes when last_run does, so it is computed
+        # once here instead of re-evaluating the schedule on every tick.
+        return int(self._schedule.next_runtime(self._last_run).timestamp())
 
-    def is_due(self) -> bool:
-        return self._schedule.is_due(self._last_run)
+    def is_due(self, now: datetime | None = None) -> bool:
+        return self.remaining_seconds(now) <= 0
 
-    def remaining_seconds(self) -> int:
-        return self._schedule.remaining_seconds(self._last_run)
+    def remaining_seconds(self, now: datetime | None = None) -> int:
+        if now is None:
+            now = timezone.now()
+        return max(self._next_run - int(now.timestamp()), 0)
 
     def runtime_after(self, start: datetime) -> datetime:
         return self._schedule.runtime_after(start)
@@ -170,6 +199,10 @@ class ScheduleRunner:
     Contains a collection of ScheduleEntry objects which are composed
     using `ScheduleRunner.add()`. Once the scheduler is built, `tick()`
     is used in a while loop to spawn tasks and sleep.
+
+    Entries are kept in a heap ordered by their next runtime. Each tick only
+    pops the entries that are due, so entries that are not yet due are not
+    re-evaluated and don't cause reads from run storage.
     """
 
     def __init__(self, registry: TaskRegistry, run_storage: RunStorage) -> None:
@@ -200,59 +233,94 @@ class ScheduleRunner:
 
         Returns the number of seconds to sleep until the next task is due.
         """
-        self._update_heap()
-
-        if not self._heap:
+        if not self._entries:
             return 60
 
-        while True:
-            # Peek at the top, and if it is due, pop, spawn and update last run time
-            _, entry = self._heap[0]
-            if entry.is_due():
-                heapq.heappop(self._heap)
+        with metrics.timer("taskworker.scheduler.tick.duration"):
+            if not self._heap:
+                self._build_heap()
+
+            while True:
+                now = timezone.now()
+                due = self._pop_due(now)
+                if not due:
+                    # The top of the heap isn't ready, break for sleep
+                    break
                 try:
-                    self._try_spawn(entry)
+                    self._try_spawn_many(due, now)
                 except Exception as e:
                     # Trap errors from spawning/update state so that the heap stays consistent.
                     capture_exception(e)
-                heapq.heappush(self._heap, (entry.remaining_seconds(), entry))
-                continue
-            else:
-                # The top of the heap isn't ready, break for sleep
-                break
+                    self._push(due)
+                    break
+                self._push(due)
 
-        return self._heap[0][0]
+            return self._heap[0][1].remaining_seconds()
 
-    def _try_spawn(self, entry: ScheduleEntry) -> None:
-        now = timezone.now()
-        next_runtime = entry.runtime_after(now)
-        if self._run_storage.set(entry.fullname, next_runtime):
-            entry.delay_task()
+    def _pop_due(self, now: datetime) -> list[ScheduleEntry]:
+        now_ts = int(now.timestamp())
+        due = []
+        while self._heap and self._heap[0][0] <= now_ts:
+            _, entry = heapq.heappop(self._heap)
+            due.append(entry)
+        return due
+
+    def _push(self, entries: list[ScheduleEntry]) -> None:
+        for entry in entries:
+            heapq.heappush(self._heap, (entry.next_run, entry))
+
+    def _try_spawn_many(self, entries: list[ScheduleEntry], now: datetime) -> None:
+        """
+        Record spawn times for all due entries in one batch, then spawn the tasks
+        we won the key for. Entries that another scheduler has already spawned
+        are synchronized with storage.
+        """
+        acquired = self._run_storage.set_many(
+            {entry.fullname: entry.runtime_after(now) for entry in entries}
+        )
+        lost = []
+        for entry in entries:
+            if not acquired.get(entry.fullname):
+                lost.append(entry)
+                continue
+
+            lag = now.timestamp() - entry.next_run
+            try:
+                entry.delay_task()
+            except Exception as e:
+                # The key is set, so the next attempt will sync with storage.
+                capture_exception(e)
+                continue
             entry.set_last_run(now)
 
             logger.debug("taskworker.scheduler.delay_task", extra={"fullname": entry.fullname})
-            metrics.incr(
-                "taskworker.scheduler.delay_task",
-                tags={
-                    "taskname": entry.taskname,
-                    "namespace": entry.namespace,
-                },
+            tags = {
+                "taskname": entry.taskname,
+                "namespace": entry.namespace,
+            }
+            metrics.incr("taskworker.scheduler.delay_task", tags=tags)
+            metrics.distribution(
+                "taskworker.scheduler.dispatch_lag", max(lag, 0), tags=tags, unit="second"
             )
-        else:
-            # sync with last_run state in storage
-            entry.set_last_run(self._run_storage.read(entry.fullname))
+
+        if not lost:
+            return
+
+        # sync with last_run state in storage
+        last_run_times = self._run_storage.read_many([entry.fullname for entry in lost])
+        for entry in lost:
+            entry.set_last_run(last_run_times.get(entry.fullname))
 
             logger.debug(
                 "taskworker.scheduler.sync_with_storage", extra={"fullname": entry.fullname}
             )
             metrics.incr("taskworker.scheduler.sync_with_storage")
 
-    def _update_heap(self) -> None:
-        """update the heap to reflect current remaining time"""
-        if not self._heap:
-            self._load_last_run()
+    def _build_heap(self) -> None:
+        """build the heap from the next runtime of each entry"""
+        self._load_last_run()
 
-        heap_items = [(item.remaining_seconds(), item) for item in self._entries]
+        heap_items = [(item.next_run, item) for item in self._entries]
         heapq.heapify(heap_items)
         self._heap = heap_items
 
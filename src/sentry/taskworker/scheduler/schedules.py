@@ -37,6 +37,12 @@ class Schedule(metaclass=abc.ABCMeta):
         Get the next scheduled time after `start`
         """
 
+    @abc.abstractmethod
+    def next_runtime(self, last_run: datetime | None = None) -> datetime:
+        """
+        Get the time the schedule is next due based on last_run.
+        """
+
 
 class TimedeltaSchedule(Schedule):
     """
@@ -92,6 +98,15 @@ class TimedeltaSchedule(Schedule):
         """Get the next time a task should run after start"""
         return start + self._delta
 
+    def next_runtime(self, last_run: datetime | None = None) -> datetime:
+        """
+        Get the time the next task should spawn. Without a last_run
+        we have missed an interval, and are due now.
+        """
+        if last_run is None:
+            return timezone.now()
+        return last_run + self._delta
+
 
 class CrontabSchedule(Schedule):
     """
@@ -137,6 +152,20 @@ class CrontabSchedule(Schedule):
         if last_run is None:
             return 0
 
+        now = timezone.now().replace(second=0, microsecond=0)
+        next_run = self.next_runtime(last_run)
+
+        return max(int(next_run.timestamp() - now.timestamp()), 0)
+
+    def next_runtime(self, last_run: datetime | None = None) -> datetime:
+        """
+        Get the time this schedule is next due
+
+        Use the current time to find the next schedule time
+        """
+        if last_run is None:
+            return timezone.now()
+
         # This could result in missed beats, or increased load on redis.
         last_run = last_run.replace(second=0, microsecond=0)
         now = timezone.now().replace(second=0, microsecond=0)
@@ -154,8 +183,7 @@ class CrontabSchedule(Schedule):
                     "now": now,
                 },
             )
-            next_run = self._advance(last_run + timedelta(minutes=1))
-            return int(next_run.timestamp() - now.timestamp())
+            return self._advance(last_run + timedelta(minutes=1))
 
         # If last run is in the past, see if the next runtime
         # is in the future.
@@ -163,7 +191,7 @@ class CrontabSchedule(Schedule):
             next_run = self._advance(last_run + timedelta(minutes=1))
             # Our next runtime is in the future, or now
             if next_run >= now:
-                return int(next_run.timestamp() - now.timestamp())
+                return next_run
 
             # still in the past, we missed an interval :(
             missed = next_run
@@ -178,12 +206,10 @@ class CrontabSchedule(Schedule):
                     "next_run": next_run.isoformat(),
                 },
             )
-            return int(next_run.timestamp() - now.timestamp())
+            return next_run
 
         # last_run == now, we are on the beat, find the next interval
-        next_run = self._advance(now + timedelta(minutes=1))
-
-        return int(next_run.timestamp() - now.timestamp())
+        return self._advance(now + timedelta(minutes=1))
 
     def _advance(self, dt: datetime) -> datetime:
         self._cronsim.dt = dt
@@ -6,25 +6,75 @@ import queue
 import signal
 import threading
 import time
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
-from multiprocessing.context import ForkContext, SpawnContext
+from multiprocessing.context import ForkContext, ForkServerContext, SpawnContext
 from multiprocessing.process import BaseProcess
 from typing import Any
 
 import grpc
 from django.conf import settings
-from sentry_protos.taskbroker.v1.taskbroker_pb2 import FetchNextTask
+from sentry_protos.taskbroker.v1.taskbroker_pb2 import FetchNextTask, TaskActivation
 
 from sentry import options
+from sentry.conf.types.taskworker import ChildPoolConfigMap
 from sentry.taskworker.client.client import HostTemporarilyUnavailable, TaskworkerClient
 from sentry.taskworker.client.inflight_task_activation import InflightTaskActivation
 from sentry.taskworker.client.processing_result import ProcessingResult
-from sentry.taskworker.constants import DEFAULT_REBALANCE_AFTER, DEFAULT_WORKER_QUEUE_SIZE
+from sentry.taskworker.constants import (
+    DEFAULT_FETCH_BATCH_SIZE,
+    DEFAULT_REBALANCE_AFTER,
+    DEFAULT_WORKER_QUEUE_SIZE,
+)
 from sentry.taskworker.workerchild import child_process
 from sentry.utils import metrics
 
 logger = logging.getLogger("sentry.taskworker.worker")
 
+DEFAULT_CHILD_POOL = "default"
+
+
+class ChildPool:
+    """
+    A partition of the child processes of a TaskWorker.
+
+    Each pool has its own queue of tasks and its own children, so that
+    tasks assigned to one pool don't wait behind tasks in another.
+
+    Tasks that were fetched while the queue was full are held in `pending`
+    until the queue has room again. Once `max_pending` tasks are held, the
+    pool has no room for more tasks.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        child_tasks: multiprocessing.Queue[InflightTaskActivation],
+        concurrency: int,
+        max_child_task_count: int | None,
+        max_pending: int,
+        namespaces: list[str] | None = None,
+        tasks: list[str] | None = None,
+    ) -> None:
+        self.name = name
+        self.child_tasks = child_tasks
+        self.concurrency = concurrency
+        self.max_child_task_count = max_child_task_count
+        self.max_pending = max_pending
+        self.namespaces = namespaces or []
+        self.tasks = tasks or []
+        self.children: list[BaseProcess] = []
+        self.pending: deque[InflightTaskActivation] = deque()
+
+    def process_name(self, index: int) -> str:
+        if self.name == DEFAULT_CHILD_POOL:
+            return f"taskworker-child-{index}"
+        return f"taskworker-child-{self.name}-{index}"
+
+    def has_room(self) -> bool:
+        """Check if the pool can accept more tasks, in its queue or as pending tasks"""
+        return len(self.pending) < self.max_pending
+
 
 class TaskWorker:
     """
@@ -35,9 +85,19 @@ class TaskWorker:
     will be fetched.
 
     Taskworkers can be run with `sentry run taskworker`
+
+    With a `fetch_batch_size` above 1, tasks are prefetched in batches of concurrent
+    RPCs. This reduces the time spent waiting on the broker when processing many
+    short tasks.
+
+    Children can be partitioned into `child_pools` by namespace or task name. Each
+    pool has its own concurrency and `max_child_task_count`, and tasks that don't
+    belong to a pool are executed by the default children. With the `forkserver`
+    process type, children are forked from a server that has already configured
+    django and imported task modules, so that replacing a child is cheap.
     """
 
-    mp_context: ForkContext | SpawnContext
+    mp_context: ForkContext | ForkServerContext | SpawnContext
 
     def __init__(
         self,
@@ -51,6 +111,8 @@ class TaskWorker:
         rebalance_after: int = DEFAULT_REBALANCE_AFTER,
         processing_pool_name: str | None = None,
         process_type: str = "spawn",
+        fetch_batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+        child_pools: ChildPoolConfigMap | None = None,
         **options: dict[str, Any],
     ) -> None:
         self.options = options
@@ -62,17 +124,59 @@ class TaskWorker:
             self.mp_context = multiprocessing.get_context("fork")
         elif process_type == "spawn":
             self.mp_context = multiprocessing.get_context("spawn")
+        elif process_type == "forkserver":
+            self.mp_context = multiprocessing.get_context("forkserver")
+            self.mp_context.set_forkserver_preload(["sentry.taskworker.forkserver"])
         else:
             raise ValueError(f"Invalid process type: {process_type}")
         self._process_type = process_type
 
+        self._fetch_batch_size = max(fetch_batch_size, 1)
+        self._fetch_executor: ThreadPoolExecutor | None = None
+
+        # A prefetched batch needs to fit in the queue alongside the tasks
+        # the children are about to pick up.
+        if self._fetch_batch_size > 1:
+            child_tasks_queue_maxsize = max(
+                child_tasks_queue_maxsize, self._fetch_batch_size + concurrency
+            )
         self._child_tasks: multiprocessing.Queue[InflightTaskActivation] = self.mp_context.Queue(
             maxsize=child_tasks_queue_maxsize
         )
         self._processed_tasks: multiprocessing.Queue[ProcessingResult] = self.mp_context.Queue(
             maxsize=result_queue_maxsize
         )
-        self._children: list[BaseProcess] = []
+        self._child_pools = [
+            ChildPool(
+                DEFAULT_CHILD_POOL,
+                self._child_tasks,
+                concurrency,
+                max_child_task_count,
+                max_pending=child_tasks_queue_maxsize,
+            )
+        ]
+        for name, pool_config in (child_pools or {}).items():
+            pool_queue_maxsize = pool_config.get("queue_maxsize", child_tasks_queue_maxsize)
+            self._child_pools.append(
+                ChildPool(
+                    name,
+                    self.mp_context.Queue(maxsize=pool_queue_maxsize),
+                    pool_config["concurrency"],
+                    pool_config.get("max_child_task_count", max_child_task_count),
+                    max_pending=pool_queue_maxsize,
+                    namespaces=pool_config.get("namespaces"),
+                    tasks=pool_config.get("tasks"),
+                )
+            )
+        # Task names take precedence over namespaces when routing to a pool.
+        self._child_pools_by_namespace: dict[str, ChildPool] = {}
+        self._child_pools_by_task: dict[str, ChildPool] = {}
+        for pool in self._child_pools:
+            for pool_namespace in pool.namespaces:
+                self._child_pools_by_namespace[pool_namespace] = pool
+            for pool_task in pool.tasks:
+                self._child_pools_by_task[pool_task] = pool
+
         self._shutdown_event = self.mp_context.Event()
         self._result_thread: threading.Thread | None = None
         self._spawn_children_thread: threading.Thread | None = None
@@ -129,11 +233,15 @@ class TaskWorker:
             self._spawn_children_thread.join()
 
         logger.info("taskworker.worker.shutdown.children")
-        for child in self._children:
+        children = [child for pool in self._child_pools for child in pool.children]
+        for child in children:
             child.terminate()
-        for child in self._children:
+        for child in children:
             child.join()
 
+        if self._fetch_executor:
+            self._fetch_executor.shutdown(wait=False, cancel_futures=True)
+
         logger.info("taskworker.worker.shutdown.result")
         if self._result_thread:
             # Use a timeout as sometimes this thread can deadlock on the Event.
@@ -153,7 +261,8 @@ class TaskWorker:
         """
         Add a task to child tasks queue. Returns False if no new task was fetched.
         """
-        if self._child_tasks.full():
+        self._put_pending_tasks()
+        if self._child_tasks_full():
             # I want to see how this differs between pools that operate well,
             # and those that are not as effective. I suspect that with a consistent
             # load of slowish tasks (like 5-15 seconds) that this will happen
@@ -169,31 +278,62 @@ class TaskWorker:
             time.sleep(0.1)
             return False
 
-        inflight = self.fetch_task()
-        if inflight:
+        if self._fetch_batch_size > 1:
+            inflight_tasks = self.fetch_tasks(self._fetch_batch_size)
+        else:
+            inflight = self.fetch_task()
+            inflight_tasks = [inflight] if inflight else []
+
+        for inflight in inflight_tasks:
+            self._put_child_task(inflight)
+        return bool(inflight_tasks)
+
+    def _put_child_task(self, inflight: InflightTaskActivation) -> bool:
+        """
+        Add a task to the queue of its child pool without blocking.
+
+        If the queue is full, the task is held in the pool's pending tasks
+        instead, so that a busy pool can't stall the worker or other pools.
+        Returns False if the task is pending.
+        """
+        pool = self._get_child_pool(inflight.activation)
+        if not pool.pending:
             try:
                 start_time = time.monotonic()
-                self._child_tasks.put(inflight)
+                pool.child_tasks.put_nowait(inflight)
                 metrics.distribution(
                     "taskworker.worker.child_task.put.duration",
                     time.monotonic() - start_time,
                     tags={"processing_pool": self._processing_pool_name},
                 )
+                return True
             except queue.Full:
-                metrics.incr(
-                    "taskworker.worker.child_tasks.put.full",
-                    tags={"processing_pool": self._processing_pool_name},
-                )
-                logger.warning(
-                    "taskworker.add_task.child_task_queue_full",
-                    extra={
-                        "task_id": inflight.activation.id,
-                        "processing_pool": self._processing_pool_name,
-                    },
-                )
-            return True
-        else:
-            return False
+                pass
+
+        metrics.incr(
+            "taskworker.worker.child_tasks.put.full",
+            tags={"processing_pool": self._processing_pool_name, "child_pool": pool.name},
+        )
+        logger.warning(
+            "taskworker.add_task.child_task_queue_full",
+            extra={
+                "task_id": inflight.activation.id,
+                "processing_pool": self._processing_pool_name,
+                "child_pool": pool.name,
+            },
+        )
+        pool.pending.append(inflight)
+        return False
+
+    def _put_pending_tasks(self) -> None:
+        """Move pending tasks into the queues of their child pools as they have room"""
+        for pool in self._child_pools:
+            while pool.pending:
+                try:
+                    pool.child_tasks.put_nowait(pool.pending[0])
+                except queue.Full:
+                    break
+                pool.pending.popleft()
 
     def start_result_thread(self) -> None:
         """
@@ -208,7 +348,9 @@ class TaskWorker:
 
         def result_thread() -> None:
             logger.debug("taskworker.worker.result_thread.started")
-            iopool = ThreadPoolExecutor(max_workers=self._concurrency)
+            iopool = ThreadPoolExecutor(
+                max_workers=sum(pool.concurrency for pool in self._child_pools)
+            )
             with iopool as executor:
                 while not self._shutdown_event.is_set():
                     fetch_next = self._processing_pool_name not in options.get(
@@ -245,27 +387,12 @@ class TaskWorker:
 
         if fetch:
             fetch_next = None
-            if not self._child_tasks.full():
+            if not self._child_tasks_full():
                 fetch_next = FetchNextTask(namespace=self._namespace)
 
             next = self._send_update_task(result, fetch_next)
             if next:
-                try:
-                    start_time = time.monotonic()
-                    self._child_tasks.put(next)
-                    metrics.distribution(
-                        "taskworker.worker.child_task.put.duration",
-                        time.monotonic() - start_time,
-                        tags={"processing_pool": self._processing_pool_name},
-                    )
-                except queue.Full:
-                    logger.warning(
-                        "taskworker.send_result.child_task_queue_full",
-                        extra={
-                            "task_id": next.activation.id,
-                            "processing_pool": self._processing_pool_name,
-                        },
-                    )
+                self._put_child_task(next)
             return True
 
         self._send_update_task(result, fetch_next=None)
@@ -309,39 +436,103 @@ class TaskWorker:
             self._processed_tasks.put(result)
             return None
 
+    def _get_child_pool(self, activation: TaskActivation) -> ChildPool:
+        """Get the child pool that executes an activation"""
+        pool = self._child_pools_by_task.get(f"{activation.namespace}:{activation.taskname}")
+        if pool is None:
+            pool = self._child_pools_by_namespace.get(activation.namespace, self._child_pools[0])
+        return pool
+
+    def _child_tasks_full(self) -> bool:
+        """
+        Check if no child pool can accept more tasks. While any pool has room,
+        tasks are fetched so that a busy pool doesn't hold up the others.
+        """
+        return not any(pool.has_room() for pool in self._child_pools)
+
     def start_spawn_children_thread(self) -> None:
         def spawn_children_thread() -> None:
             logger.debug("taskworker.worker.spawn_children_thread.started")
             while not self._shutdown_event.is_set():
-                self._children = [child for child in self._children if child.is_alive()]
-                if len(self._children) >= self._concurrency:
+                spawned = False
+                for pool in self._child_pools:
+                    pool.children = [child for child in pool.children if child.is_alive()]
+                    for i in range(pool.concurrency - len(pool.children)):
+                        process = self.mp_context.Process(
+                            name=pool.process_name(i),
+                            target=child_process,
+                            args=(
+                                pool.child_tasks,
+                                self._processed_tasks,
+                                self._shutdown_event,
+                                pool.max_child_task_count,
+                                self._processing_pool_name,
+                                self._process_type,
+                            ),
+                        )
+                        process.start()
+                        pool.children.append(process)
+                        spawned = True
+                        logger.info(
+                            "taskworker.spawn_child",
+                            extra={
+                                "pid": process.pid,
+                                "processing_pool": self._processing_pool_name,
+                                "child_pool": pool.name,
+                            },
+                        )
+                if not spawned:
                     time.sleep(0.1)
-                    continue
-                for i in range(self._concurrency - len(self._children)):
-                    process = self.mp_context.Process(
-                        name=f"taskworker-child-{i}",
-                        target=child_process,
-                        args=(
-                            self._child_tasks,
-                            self._processed_tasks,
-                            self._shutdown_event,
-                            self._max_child_task_count,
-                            self._processing_pool_name,
-                            self._process_type,
-                        ),
-                    )
-                    process.start()
-                    self._children.append(process)
-                    logger.info(
-                        "taskworker.spawn_child",
-                        extra={"pid": process.pid, "processing_pool": self._processing_pool_name},
-                    )
 
         self._spawn_children_thread = threading.Thread(
             name="spawn-children", target=spawn_children_thread, daemon=True
         )
         self._spawn_children_thread.start()
 
+    def fetch_tasks(self, count: int) -> list[InflightTaskActivation]:
+        """
+        Fetch up to `count` tasks with concurrent RPCs, so that the
+        round trips to the broker overlap instead of adding up.
+        """
+        if self._fetch_executor is None:
+            self._fetch_executor = ThreadPoolExecutor(
+                max_workers=self._fetch_batch_size, thread_name_prefix="fetch-task"
+            )
+
+        # Use the shutdown_event as a sleep mechanism
+        self._shutdown_event.wait(self._gettask_backoff_seconds)
+        futures = [
+            self._fetch_executor.submit(self.client.get_task, self._namespace) for _ in range(count)
+        ]
+        activations: list[InflightTaskActivation] = []
+        for future in futures:
+            try:
+                activation = future.result()
+            except grpc.RpcError as e:
+                logger.info(
+                    "taskworker.fetch_task.failed",
+                    extra={"error": e, "processing_pool": self._processing_pool_name},
+                )
+                continue
+            if activation:
+                activations.append(activation)
+
+        metrics.distribution(
+            "taskworker.worker.fetch_tasks.batch_size",
+            len(activations),
+            tags={"processing_pool": self._processing_pool_name},
+        )
+        if not activations:
+            metrics.incr(
+                "taskworker.worker.fetch_task.not_found",
+                tags={"processing_pool": self._processing_pool_name},
+            )
+            self._gettask_backoff_seconds = min(self._gettask_backoff_seconds + 1, 5)
+            return []
+
+        self._gettask_backoff_seconds = 0
+        return activations
+
     def fetch_task(self) -> InflightTaskActivation | None:
         # Use the shutdown_event as a sleep mechanism
         self._shutdown_event.wait(self._gettask_backoff_seconds)
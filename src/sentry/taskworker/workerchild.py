@@ -43,12 +43,16 @@ def child_worker_init(process_type: str) -> None:
     Configure django and load task modules for workers
     Child worker processes are spawned and don't inherit db
     connections or configuration from the parent process.
+
+    Children of a fork server inherit the configuration and task
+    modules preloaded by `sentry.taskworker.forkserver`, which makes
+    these calls no-ops.
     """
     from django.conf import settings
 
     from sentry.runner import configure
 
-    if process_type == "spawn":
+    if process_type in ("spawn", "forkserver"):
         configure()
 
     for module in settings.TASKWORKER_IMPORTS:
@@ -119,6 +123,7 @@ def child_process(
     and not the module root. If modules that include django are imported at
     the module level the wrong django settings will be used.
     """
+    init_start = time.monotonic()
     child_worker_init(process_type)
 
     from django.core.cache import cache
@@ -132,6 +137,12 @@ def child_process(
     from sentry.utils import metrics
     from sentry.utils.memory import track_memory_usage
 
+    metrics.distribution(
+        "taskworker.worker.child_init.duration",
+        time.monotonic() - init_start,
+        tags={"processing_pool": processing_pool_name, "process_type": process_type},
+    )
+
     def _get_known_task(activation: TaskActivation) -> Task[Any, Any] | None:
         if not taskregistry.contains(activation.namespace):
             logger.error(
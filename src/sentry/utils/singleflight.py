@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Coalesces concurrent work for the same key within a process.
+
+    The first caller to `claim` a key becomes its leader and is responsible for
+    resolving it once the work is done. Callers that claim the key while it is still in
+    flight get the leader's future back, and wait on it instead of repeating the work.
+
+    The same result object is handed to every waiter. `resolve` returns the number of
+    waiters so that leaders can avoid sharing mutable results that nobody else is
+    waiting for.
+
+    >>> flight = SingleFlight()
+    >>> is_leader, future = flight.claim("key")
+    >>> if is_leader:
+    >>>     flight.resolve("key", do_work())
+    >>> result = future.result()
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: dict[K, Future[V]] = {}
+        self._waiters: dict[K, int] = {}
+
+    def claim(self, key: K) -> tuple[bool, Future[V]]:
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._waiters[key] += 1
+                return False, future
+
+            future = Future()
+            self._in_flight[key] = future
+            self._waiters[key] = 0
+            return True, future
+
+    def resolve(self, key: K, result: V) -> int:
+        with self._lock:
+            future = self._in_flight.pop(key)
+            waiters = self._waiters.pop(key)
+        future.set_result(result)
+        return waiters
+
+    def fail(self, key: K, exception: BaseException) -> int:
+        with self._lock:
+            future = self._in_flight.pop(key)
+            waiters = self._waiters.pop(key)
+        future.set_exception(exception)
+        return waiters
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
@@ -9,7 +9,7 @@ import re
 import time
 from collections import namedtuple
 from collections.abc import Callable, Collection, Mapping, MutableMapping, Sequence
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime, timedelta, timezone
@@ -17,16 +17,20 @@ from hashlib import sha1
 from typing import Any
 from urllib.parse import urlparse
 
+import orjson
 import sentry_sdk
 import sentry_sdk.scope
 import urllib3
 from dateutil.parser import parse as parse_datetime
 from django.conf import settings
 from django.core.cache import cache
+from sentry_redis_tools.clients import RedisCluster, StrictRedis
+from sentry_sdk.tracing import Span
 from snuba_sdk import Column, DeleteQuery, Function, MetricsQuery, Request
 from snuba_sdk.legacy import json_to_snql
 from snuba_sdk.query import SelectableExpression
 
+from sentry import options
 from sentry.api.helpers.error_upsampling import UPSAMPLED_ERROR_AGGREGATION
 from sentry.models.environment import Environment
 from sentry.models.group import Group
@@ -41,8 +45,10 @@ from sentry.snuba.dataset import Dataset
 from sentry.snuba.events import Columns
 from sentry.snuba.query_sources import QuerySource
 from sentry.snuba.referrer import validate_referrer
-from sentry.utils import json, metrics
+from sentry.utils import json, metrics, redis
 from sentry.utils.dates import outside_retention_with_modified_start
+from sentry.utils.singleflight import SingleFlight
+from sentry.utils.snuba_columnar import ColumnarData, to_serializable
 
 logger = logging.getLogger(__name__)
 
@@ -953,6 +959,8 @@ class SnubaRequest:
     referrer: str | None  # TODO: this should use the referrer Enum
     forward: Translator
     reverse: Translator
+    # Decode the result's rows into `ColumnarData` instead of a list of dicts
+    columnar: bool = False
 
     def __post_init__(self) -> None:
         self.validate()
@@ -980,6 +988,7 @@ def raw_snql_query(
     query_source: (
         QuerySource | None
     ) = None,  # TODO: @athena Make this field required after updated all the callsites
+    columnar: bool = False,
 ) -> Mapping[str, Any]:
     """
     Alias for `bulk_snuba_queries`, kept for backwards compatibility.
@@ -992,6 +1001,7 @@ def raw_snql_query(
         referrer=referrer,
         use_cache=use_cache,
         query_source=query_source,
+        columnar=columnar,
     )[0]
 
 
@@ -1002,6 +1012,7 @@ def bulk_snuba_queries(
     query_source: (
         QuerySource | None
     ) = None,  # TODO: @athena Make this field required after updated all the callsites
+    columnar: bool = False,
 ) -> ResultSet:
     """
     Alias for `bulk_snuba_queries_with_referrers` that uses the same referrer for every request.
@@ -1013,6 +1024,7 @@ def bulk_snuba_queries(
         [(request, referrer) for request in requests],
         use_cache=use_cache,
         query_source=query_source,
+        columnar=columnar,
     )
 
 
@@ -1022,14 +1034,26 @@ def bulk_snuba_queries_with_referrers(
     query_source: (
         QuerySource | None
     ) = None,  # TODO: @athena Make this field required after updated all the callsites
+    columnar: bool = False,
 ) -> ResultSet:
     """
     The main entrypoint to running queries in Snuba. This function accepts
     Requests for either MQL or SnQL queries and runs them on the appropriate endpoint.
 
     Every request is paired with a referrer to be used for that request.
+
+    With `columnar`, the `data` of each result is a `ColumnarData` rather than a list
+    of row dicts. This is much cheaper for results with many rows.
     """
+    snuba_requests = _build_snuba_requests(requests_with_referrers, query_source, columnar)
+    return _apply_cache_and_build_results(snuba_requests, use_cache=use_cache)
+
 
+def _build_snuba_requests(
+    requests_with_referrers: list[tuple[Request, str | None]],
+    query_source: QuerySource | None = None,
+    columnar: bool = False,
+) -> list[SnubaRequest]:
     if "consistent" in OVERRIDE_OPTIONS:
         for request, _ in requests_with_referrers:
             request.flags.consistent = OVERRIDE_OPTIONS["consistent"]
@@ -1042,16 +1066,16 @@ def bulk_snuba_queries_with_referrers(
             if query_source:
                 request.tenant_ids["query_source"] = query_source.value
 
-    snuba_requests = [
+    return [
         SnubaRequest(
             request=request,
             referrer=referrer,
             forward=lambda x: x,
             reverse=lambda x: x,
+            columnar=columnar,
         )
         for request, referrer in requests_with_referrers
     ]
-    return _apply_cache_and_build_results(snuba_requests, use_cache=use_cache)
 
 
 # TODO: This is the endpoint that accepts legacy (non-SnQL/MQL queries)
@@ -1120,18 +1144,26 @@ def _apply_cache_and_build_results(
                 to_query.append((query_pos, snuba_request, cache_key))
             else:
                 metrics.incr("snuba.query_cache.hit", tags=metric_tags)
-                results.append((query_pos, json.loads(cached_result)))
+                result = json.loads(cached_result)
+                if snuba_request.columnar:
+                    result["data"] = ColumnarData.from_rows(result["data"])
+                results.append((query_pos, result))
     else:
         for query_pos, snuba_request in snuba_requests_list:
             to_query.append((query_pos, snuba_request, None))
 
     if to_query:
-        query_results = _bulk_snuba_query([item[1] for item in to_query])
+        if options.get("snuba.query-coalescing.enabled") and not any(
+            isinstance(item[1].request.query, DeleteQuery) or item[1].columnar for item in to_query
+        ):
+            query_results = _bulk_snuba_query_coalesced([item[1] for item in to_query])
+        else:
+            query_results = _bulk_snuba_query([item[1] for item in to_query])
         for result, (query_pos, _, opt_cache_key) in zip(query_results, to_query):
             if opt_cache_key:
                 cache.set(
                     opt_cache_key,
-                    json.dumps(result),
+                    json.dumps(to_serializable(result)),
                     settings.SENTRY_SNUBA_CACHE_TTL_SECONDS,
                 )
             results.append((query_pos, result))
@@ -1142,6 +1174,175 @@ def _apply_cache_and_build_results(
     return [result[1] for result in results]
 
 
+_snuba_single_flight: SingleFlight[str, Mapping[str, Any]] = SingleFlight()
+
+COALESCING_POLL_INTERVAL = 0.05
+
+
+def _get_coalescing_redis_client() -> RedisCluster | StrictRedis:
+    cluster_key = settings.SENTRY_SNUBA_QUERY_COALESCING_REDIS_CLUSTER
+    return redis.redis_clusters.get(cluster_key)  # type: ignore[return-value]
+
+
+def _get_coalescing_ttl(referrer: str | None) -> int:
+    referrer_ttls = options.get("snuba.query-coalescing.referrer-ttls")
+    return int(referrer_ttls.get(referrer or "", options.get("snuba.query-coalescing.default-ttl")))
+
+
+def _record_coalesced_queries(snuba_requests: Sequence[SnubaRequest], source: str) -> None:
+    for snuba_request in snuba_requests:
+        metrics.incr(
+            "snuba.query_coalescing.saved",
+            tags={"referrer": snuba_request.referrer or "unknown", "source": source},
+        )
+
+
+def _bulk_snuba_query_coalesced(snuba_requests: Sequence[SnubaRequest]) -> ResultSet:
+    """
+    Wraps `_bulk_snuba_query` so that identical queries (as identified by
+    `get_cache_key`) are only sent to Snuba once:
+
+    - duplicates within `snuba_requests` share one query,
+    - identical queries that are already in flight on another thread of this process
+      are waited on rather than sent again,
+    - if `snuba.query-coalescing.redis-lease.enabled` is set, the same is done across
+      processes, see `_query_with_redis_lease`.
+
+    Results are copied before being handed out more than once, since callers commonly
+    mutate them. If the query a caller is waiting on fails, the caller gets the same
+    error.
+    """
+    cache_keys = [get_cache_key(snuba_request.request) for snuba_request in snuba_requests]
+    requests_by_key: dict[str, SnubaRequest] = {}
+    duplicates: list[SnubaRequest] = []
+    for cache_key, snuba_request in zip(cache_keys, snuba_requests):
+        if cache_key in requests_by_key:
+            duplicates.append(snuba_request)
+        else:
+            requests_by_key[cache_key] = snuba_request
+    _record_coalesced_queries(duplicates, "batch")
+
+    leading: list[str] = []
+    following: dict[str, Future[Mapping[str, Any]]] = {}
+    for cache_key in requests_by_key:
+        is_leader, future = _snuba_single_flight.claim(cache_key)
+        if is_leader:
+            leading.append(cache_key)
+        else:
+            following[cache_key] = future
+    _record_coalesced_queries([requests_by_key[key] for key in following], "process")
+
+    results: dict[str, Mapping[str, Any]] = {}
+    shared: set[str] = set(following)
+    if leading:
+        try:
+            if options.get("snuba.query-coalescing.redis-lease.enabled"):
+                leader_results = _query_with_redis_lease(
+                    {cache_key: requests_by_key[cache_key] for cache_key in leading}
+                )
+            else:
+                leader_results = dict(
+                    zip(leading, _bulk_snuba_query([requests_by_key[key] for key in leading]))
+                )
+        except BaseException as e:
+            for cache_key in leading:
+                _snuba_single_flight.fail(cache_key, e)
+            raise
+
+        for cache_key in leading:
+            if _snuba_single_flight.resolve(cache_key, leader_results[cache_key]):
+                shared.add(cache_key)
+        results.update(leader_results)
+
+    for cache_key, future in following.items():
+        results[cache_key] = future.result()
+
+    output = []
+    for cache_key in cache_keys:
+        result = results[cache_key]
+        if cache_key in shared:
+            result = deepcopy(result)
+        # Any further duplicates within this batch need their own copy
+        shared.add(cache_key)
+        output.append(result)
+    return output
+
+
+def _query_with_redis_lease(
+    requests_by_key: Mapping[str, SnubaRequest],
+) -> dict[str, Mapping[str, Any]]:
+    """
+    Coalesces identical queries across processes. Results of recent identical queries
+    are read from the cache, and for the rest we try to take a short lease in redis.
+    Queries we hold a lease for are sent to Snuba and their results are published to
+    the cache for the referrer's TTL. For queries leased by another process, we wait for
+    the result to be published, and send the query ourselves if that doesn't happen
+    before the lease is released or expires.
+    """
+    result_keys = {cache_key: f"{cache_key}:coalesced" for cache_key in requests_by_key}
+    lease_ms = options.get("snuba.query-coalescing.lease-ms")
+    client = _get_coalescing_redis_client()
+
+    results: dict[str, Mapping[str, Any]] = {}
+
+    def read_published(cache_keys: Collection[str]) -> None:
+        published = cache.get_many([result_keys[cache_key] for cache_key in cache_keys])
+        for cache_key in cache_keys:
+            value = published.get(result_keys[cache_key])
+            if value is not None:
+                results[cache_key] = json.loads(value)
+
+    read_published(list(requests_by_key))
+    _record_coalesced_queries([requests_by_key[key] for key in results], "redis")
+
+    leased: list[str] = []
+    waiting: list[str] = []
+    for cache_key in requests_by_key:
+        if cache_key in results:
+            continue
+        if client.set(f"{cache_key}:lease", 1, nx=True, px=lease_ms):
+            leased.append(cache_key)
+        else:
+            waiting.append(cache_key)
+
+    # Run our own queries before waiting on anybody else's, so that we never hold a
+    # lease while waiting on another process.
+    if leased:
+        try:
+            leased_results = _bulk_snuba_query([requests_by_key[key] for key in leased])
+            for cache_key, result in zip(leased, leased_results):
+                results[cache_key] = result
+                ttl = _get_coalescing_ttl(requests_by_key[cache_key].referrer)
+                if ttl > 0:
+                    cache.set(result_keys[cache_key], json.dumps(result), ttl)
+        finally:
+            pipeline = client.pipeline(transaction=False)
+            for cache_key in leased:
+                pipeline.delete(f"{cache_key}:lease")
+            pipeline.execute()
+
+    deadline = time.monotonic() + lease_ms / 1000
+    while waiting and time.monotonic() < deadline:
+        time.sleep(COALESCING_POLL_INTERVAL)
+        read_published(waiting)
+        found = [cache_key for cache_key in waiting if cache_key in results]
+        _record_coalesced_queries([requests_by_key[key] for key in found], "redis")
+        waiting = [cache_key for cache_key in waiting if cache_key not in results]
+        if waiting:
+            # Check all leases in one round trip, however many queries are waiting.
+            pipeline = client.pipeline(transaction=False)
+            for cache_key in waiting:
+                pipeline.exists(f"{cache_key}:lease")
+            waiting = [cache_key for cache_key, held in zip(waiting, pipeline.execute()) if held]
+    waiting = [cache_key for cache_key in requests_by_key if cache_key not in results]
+
+    if waiting:
+        metrics.incr("snuba.query_coalescing.lease_fallback", amount=len(waiting))
+        results.update(zip(waiting, _bulk_snuba_query([requests_by_key[key] for key in waiting])))
+
+    return results
+
+
 def _is_rejected_query(body: Any) -> bool:
     return (
         "quota_allowance" in body
@@ -1154,6 +1355,15 @@ def _is_rejected_query(body: Any) -> bool:
 def _bulk_snuba_query(snuba_requests: Sequence[SnubaRequest]) -> ResultSet:
     snuba_requests_list = list(snuba_requests)
 
+    if (
+        len(snuba_requests_list) > 1
+        and options.get("snuba.async-transport.enabled")
+        and not any(isinstance(r.request.query, DeleteQuery) for r in snuba_requests_list)
+    ):
+        from sentry.utils.snuba_async import run_bulk_snuba_query
+
+        return run_bulk_snuba_query(snuba_requests_list)
+
     with sentry_sdk.start_span(op="snuba_query") as span:
         span.set_tag("snuba.num_queries", len(snuba_requests_list))
 
@@ -1183,83 +1393,113 @@ def _bulk_snuba_query(snuba_requests: Sequence[SnubaRequest]) -> ResultSet:
                 )
             ]
 
-        results = []
-        for index, item in enumerate(query_results):
-            referrer, response, _, reverse = item
-            try:
-                body = json.loads(response.data)
-                if SNUBA_INFO:
-                    if "sql" in body:
-                        log_snuba_info(
-                            "{}.sql:\n {}".format(
-                                referrer,
-                                sqlparse.format(body["sql"], reindent_aligned=True),
-                            )
-                        )
-                    if "error" in body:
-                        log_snuba_info("{}.err: {}".format(referrer, body["error"]))
-            except ValueError:
-                if response.status != 200:
-                    logger.exception(
-                        "snuba.query.invalid-json",
-                        extra={"response.data": response.data},
+        return [
+            _process_snuba_response(
+                snuba_request, referrer, response.status, response.data, reverse, span
+            )
+            for snuba_request, (referrer, response, _, reverse) in zip(
+                snuba_requests_list, query_results
+            )
+        ]
+
+
+def _process_snuba_response(
+    snuba_request: SnubaRequest,
+    referrer: str,
+    status: int,
+    data: bytes,
+    reverse: Translator,
+    span: Span,
+) -> Mapping[str, Any]:
+    """
+    Decodes a Snuba response and maps errors onto `QueryExecutionError` and its
+    subclasses. Shared by the thread pool and the asyncio transports.
+    """
+    try:
+        if snuba_request.columnar:
+            body = _loads_fast(data)
+        else:
+            body = json.loads(data)
+        if SNUBA_INFO:
+            if "sql" in body:
+                log_snuba_info(
+                    "{}.sql:\n {}".format(
+                        referrer,
+                        sqlparse.format(body["sql"], reindent_aligned=True),
                     )
-                    raise SnubaError("Failed to parse snuba error response")
-                raise UnexpectedResponseError(f"Could not decode JSON response: {response.data!r}")
-
-            allocation_policy_prefix = "allocation_policy."
-            bytes_scanned = body.get("profile", {}).get("progress_bytes", None)
-            if bytes_scanned is not None:
-                span.set_data(f"{allocation_policy_prefix}.bytes_scanned", bytes_scanned)
-            if _is_rejected_query(body):
-                quota_allowance_summary = body["quota_allowance"]["summary"]
-                for k, v in quota_allowance_summary.items():
-                    if isinstance(v, dict):
-                        for nested_k, nested_v in v.items():
-                            span.set_tag(allocation_policy_prefix + k + "." + nested_k, nested_v)
-                            sentry_sdk.set_tag(
-                                allocation_policy_prefix + k + "." + nested_k, nested_v
-                            )
-                    else:
-                        span.set_tag(allocation_policy_prefix + k, v)
-                        sentry_sdk.set_tag(allocation_policy_prefix + k, v)
-
-            if response.status != 200:
-                _log_request_query(snuba_requests_list[index].request)
-                metrics.incr(
-                    "snuba.client.api.error",
-                    tags={"status_code": response.status, "referrer": referrer},
                 )
-                if body.get("error"):
-                    error = body["error"]
-                    if response.status == 429:
-                        raise RateLimitExceeded(error["message"])
-                    elif error["type"] == "schema":
-                        raise SchemaValidationError(error["message"])
-                    elif error["type"] == "invalid_query":
-                        logger.warning(
-                            "UnqualifiedQueryError",
-                            extra={
-                                "error": error["message"],
-                                "has_data": "data" in body and body["data"] is not None,
-                                "query": snuba_requests_list[index].request.serialize(),
-                            },
-                        )
-                        raise UnqualifiedQueryError(error["message"])
-                    elif error["type"] == "clickhouse":
-                        raise clickhouse_error_codes_map.get(error["code"], QueryExecutionError)(
-                            error["message"]
-                        )
-                    else:
-                        raise SnubaError(error["message"])
-                else:
-                    raise SnubaError(f"HTTP {response.status}")
+            if "error" in body:
+                log_snuba_info("{}.err: {}".format(referrer, body["error"]))
+    except ValueError:
+        if status != 200:
+            logger.exception(
+                "snuba.query.invalid-json",
+                extra={"response.data": data},
+            )
+            raise SnubaError("Failed to parse snuba error response")
+        raise UnexpectedResponseError(f"Could not decode JSON response: {data!r}")
+
+    allocation_policy_prefix = "allocation_policy."
+    bytes_scanned = body.get("profile", {}).get("progress_bytes", None)
+    if bytes_scanned is not None:
+        span.set_data(f"{allocation_policy_prefix}.bytes_scanned", bytes_scanned)
+    if _is_rejected_query(body):
+        quota_allowance_summary = body["quota_allowance"]["summary"]
+        for k, v in quota_allowance_summary.items():
+            if isinstance(v, dict):
+                for nested_k, nested_v in v.items():
+                    span.set_tag(allocation_policy_prefix + k + "." + nested_k, nested_v)
+                    sentry_sdk.set_tag(allocation_policy_prefix + k + "." + nested_k, nested_v)
+            else:
+                span.set_tag(allocation_policy_prefix + k, v)
+                sentry_sdk.set_tag(allocation_policy_prefix + k, v)
+
+    if status != 200:
+        _log_request_query(snuba_request.request)
+        metrics.incr(
+            "snuba.client.api.error",
+            tags={"status_code": status, "referrer": referrer},
+        )
+        if body.get("error"):
+            error = body["error"]
+            if status == 429:
+                raise RateLimitExceeded(error["message"])
+            elif error["type"] == "schema":
+                raise SchemaValidationError(error["message"])
+            elif error["type"] == "invalid_query":
+                logger.warning(
+                    "UnqualifiedQueryError",
+                    extra={
+                        "error": error["message"],
+                        "has_data": "data" in body and body["data"] is not None,
+                        "query": snuba_request.request.serialize(),
+                    },
+                )
+                raise UnqualifiedQueryError(error["message"])
+            elif error["type"] == "clickhouse":
+                raise clickhouse_error_codes_map.get(error["code"], QueryExecutionError)(
+                    error["message"]
+                )
+            else:
+                raise SnubaError(error["message"])
+        else:
+            raise SnubaError(f"HTTP {status}")
+
+    # Forward and reverse translation maps from model ids to snuba keys, per column
+    if snuba_request.columnar:
+        body["data"] = ColumnarData.from_rows(body["data"], reverse)
+    else:
+        body["data"] = [reverse(d) for d in body["data"]]
+    return body
 
-            # Forward and reverse translation maps from model ids to snuba keys, per column
-            body["data"] = [reverse(d) for d in body["data"]]
-            results.append(body)
 
-        return results
+def _loads_fast(data: bytes) -> Any:
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # orjson is stricter than our default decoder, e.g. about NaN or integers
+        # that don't fit in 64 bits
+        return json.loads(data)
 
 
 def _log_request_query(req: Request) -> None:
@@ -0,0 +1,194 @@
+"""
+An asyncio transport for Snuba queries.
+
+`_bulk_snuba_query` runs concurrent queries on a thread pool, one thread per in-flight
+query. Endpoints that fan out to many queries end up bound by the size of that pool.
+This transport instead runs all queries of a batch concurrently on an event loop over
+a pool of keepalive HTTP connections.
+
+Async code can use `bulk_snuba_queries_async` directly. Sync callers go through
+`run_bulk_snuba_query`, which runs the batch on an event loop owned by a background
+thread, and which `_bulk_snuba_query` uses when `snuba.async-transport.enabled` is set.
+Responses are decoded by the same code as the sync transport, so callers see the same
+`QueryExecutionError` subclasses either way.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import httpx
+import sentry_sdk
+import sentry_sdk.scope
+from django.conf import settings
+from sentry_sdk.tracing import Span
+from snuba_sdk import DeleteQuery, MetricsQuery, Request
+
+from sentry.snuba.query_sources import QuerySource
+from sentry.utils import metrics
+from sentry.utils.snuba import (
+    SNUBA_INFO,
+    ResultSet,
+    SnubaError,
+    SnubaRequest,
+    _build_snuba_requests,
+    _process_snuba_response,
+    log_snuba_info,
+    timer,
+)
+
+
+class AsyncSnubaClient:
+    """
+    Sends queries to Snuba over a pool of keepalive HTTP/1.1 connections. A client must
+    only be used from the event loop it was first used on.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        timeout: float | None = None,
+        max_connections: int | None = None,
+    ) -> None:
+        if max_connections is None:
+            max_connections = settings.SENTRY_SNUBA_ASYNC_MAX_CONNECTIONS
+        limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections
+        )
+        self._client = httpx.AsyncClient(
+            base_url=base_url or settings.SENTRY_SNUBA,
+            timeout=timeout or settings.SENTRY_SNUBA_TIMEOUT,
+            # Only connection failures are retried, which matches `RetrySkipTimeout`:
+            # retrying after a read timeout only adds load to Snuba.
+            transport=httpx.AsyncHTTPTransport(limits=limits, retries=5),
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def bulk_query(self, snuba_requests: Sequence[SnubaRequest]) -> ResultSet:
+        with sentry_sdk.start_span(op="snuba_query") as span:
+            span.set_tag("snuba.num_queries", len(snuba_requests))
+            span.set_tag("snuba.transport", "async")
+            return list(
+                await asyncio.gather(
+                    *(self.query(snuba_request, span) for snuba_request in snuba_requests)
+                )
+            )
+
+    async def query(self, snuba_request: SnubaRequest, span: Span) -> Mapping[str, Any]:
+        request = snuba_request.request
+        if isinstance(request.query, DeleteQuery):
+            raise ValueError("Delete queries are not supported by the async transport")
+
+        headers = snuba_request.headers
+        referrer = headers.get("referer", "unknown")
+
+        if SNUBA_INFO:
+            import pprint
+
+            log_snuba_info(f"{referrer}.body:\n {pprint.pformat(request.to_dict())}")
+            request.flags.debug = True
+
+        sentry_sdk.set_tag("query.referrer", referrer)
+
+        query_type = "mql" if isinstance(request.query, MetricsQuery) else "snql"
+        body = request.serialize()
+        with timer(f"{query_type}_query"):
+            with sentry_sdk.start_span(op=f"snuba_{query_type}.run", name=body) as query_span:
+                query_span.set_tag("snuba.referrer", referrer)
+                try:
+                    response = await self._client.post(
+                        f"/{request.dataset}/{query_type}", content=body, headers=headers
+                    )
+                except httpx.HTTPError as err:
+                    raise SnubaError(err)
+
+        return _process_snuba_response(
+            snuba_request,
+            referrer,
+            response.status_code,
+            response.content,
+            snuba_request.reverse,
+            span,
+        )
+
+
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncSnubaClient] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_client() -> AsyncSnubaClient:
+    """
+    Returns the client for the running event loop, so that its connections are reused
+    across batches.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = AsyncSnubaClient()
+    return client
+
+
+async def bulk_snuba_queries_async(
+    requests: list[Request],
+    referrer: str | None = None,
+    query_source: QuerySource | None = None,
+) -> ResultSet:
+    """
+    Async equivalent of `bulk_snuba_queries`. Results are not cached.
+    """
+    metrics.incr("snql.sdk.api", tags={"referrer": referrer or "unknown"})
+    snuba_requests = _build_snuba_requests(
+        [(request, referrer) for request in requests], query_source
+    )
+    return await get_client().bulk_query(snuba_requests)
+
+
+class _EventLoopThread:
+    """
+    An event loop running forever on a daemon thread, which sync code can submit
+    coroutines to. The loop is recreated after a fork, since the thread running it
+    does not survive one.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pid: int | None = None
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="snuba-async-transport", daemon=True
+                ).start()
+                self._loop = loop
+                self._pid = os.getpid()
+            return self._loop
+
+
+_loop_thread = _EventLoopThread()
+
+
+def run_bulk_snuba_query(snuba_requests: Sequence[SnubaRequest]) -> ResultSet:
+    """
+    Runs a batch of queries on the async transport from sync code, blocking until all
+    of them have completed.
+    """
+    isolation_scope = sentry_sdk.get_isolation_scope()
+    current_scope = sentry_sdk.get_current_scope()
+
+    async def run() -> ResultSet:
+        with sentry_sdk.scope.use_isolation_scope(isolation_scope):
+            with sentry_sdk.scope.use_scope(current_scope):
+                return await get_client().bulk_query(snuba_requests)
+
+    return asyncio.run_coroutine_threadsafe(run(), _loop_thread.get_loop()).result()
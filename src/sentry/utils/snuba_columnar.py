@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from typing import Any, overload
+
+
+class ColumnarData(Sequence[dict[str, Any]]):
+    """
+    The rows of a Snuba result stored as one list per column rather than one dict per
+    row. For results with many rows this is a fraction of the size, and lets
+    post-processing work a column at a time.
+
+    It can be used wherever a list of row dicts is read: indexing and iterating build
+    row dicts on demand. Those rows are copies, so changes to them are not reflected
+    in the data. Use `columns` to modify it instead.
+    """
+
+    __slots__ = ("columns", "_length")
+
+    def __init__(self, columns: dict[str, list[Any]], length: int | None = None) -> None:
+        self.columns = columns
+        if length is None:
+            length = len(next(iter(columns.values()))) if columns else 0
+        self._length = length
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: list[Mapping[str, Any]],
+        translate: Callable[[Any], Any] | None = None,
+    ) -> ColumnarData:
+        """
+        Transposes `rows` into columns, applying `translate` to each row first. `rows`
+        is emptied in the process, so that each row can be freed as soon as it has been
+        copied instead of keeping the whole list alive until the end.
+        """
+        length = len(rows)
+        columns: dict[str, list[Any]] = {}
+        rows.reverse()
+        index = 0
+        while rows:
+            row = rows.pop()
+            if translate is not None:
+                row = translate(row)
+            for key, value in row.items():
+                column = columns.get(key)
+                if column is None:
+                    column = columns[key] = [None] * index
+                column.append(value)
+            index += 1
+            # Snuba rows all have the same keys, but don't rely on it
+            if len(row) != len(columns):
+                for column in columns.values():
+                    if len(column) < index:
+                        column.append(None)
+        return cls(columns, length)
+
+    def column(self, name: str) -> list[Any]:
+        return self.columns[name]
+
+    def to_rows(self) -> list[dict[str, Any]]:
+        return list(self)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> ColumnarData: ...
+
+    def __getitem__(self, index: int | slice) -> dict[str, Any] | ColumnarData:
+        if isinstance(index, slice):
+            return ColumnarData(
+                {key: values[index] for key, values in self.columns.items()},
+                len(range(*index.indices(self._length))),
+            )
+        if index < -self._length or index >= self._length:
+            raise IndexError("ColumnarData index out of range")
+        return {key: values[index] for key, values in self.columns.items()}
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        keys = list(self.columns)
+        for values in zip(*self.columns.values()):
+            yield dict(zip(keys, values))
+        if not keys:
+            for _ in range(self._length):
+                yield {}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ColumnarData):
+            return self._length == other._length and self.columns == other.columns
+        if isinstance(other, list):
+            return self.to_rows() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ColumnarData(columns={list(self.columns)!r}, length={self._length})"
+
+
+def to_serializable(result: Mapping[str, Any]) -> Mapping[str, Any]:
+    """
+    Returns `result` with columnar data converted back to rows, as it is stored in
+    caches shared with callers that don't ask for columnar results.
+    """
+    data = result.get("data")
+    if isinstance(data, ColumnarData):
+        return {**result, "data": data.to_rows()}
+    return result
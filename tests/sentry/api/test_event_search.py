@@ -15,9 +15,14 @@ from sentry.api.event_search import (
     SearchFilter,
     SearchKey,
     SearchValue,
+    SearchVisitor,
+    _fast_tokenize,
+    _parse_cache,
+    _parse_search_query,
     _RecursiveList,
     default_config,
     flatten,
+    get_search_config_fingerprint,
     parse_search_query,
     translate_wildcard_as_clickhouse_pattern,
 )
@@ -924,6 +929,127 @@ class ParseSearchQueryBackendTest(SimpleTestCase):
         assert search_filter.value.value == 'a"b'
 
 
+class ParseSearchQueryCacheTest(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        _parse_cache.clear()
+        self.addCleanup(_parse_cache.clear)
+
+    def parse_with_grammar(self, query, config=default_config):
+        return _parse_search_query(query, SearchVisitor(config), fast_path=False)[0]
+
+    def test_cached_tokens(self):
+        query = "user.email:foo@example.com (browser.name:Chrome OR os.name:Windows)"
+        first = parse_search_query(query)
+        assert len(_parse_cache) == 1
+        second = parse_search_query(query)
+        assert first == second == self.parse_with_grammar(query)
+        assert first is not second
+        assert isinstance(second[1], ParenExpression)
+        assert isinstance(second[1].children, list)
+
+        # Modifying the returned tokens doesn't modify the cache
+        second[1].children.clear()
+        second.pop()
+        assert parse_search_query(query) == first
+
+    def test_invalid_query_not_cached(self):
+        for _ in range(2):
+            with pytest.raises(InvalidSearchQuery):
+                parse_search_query("is:unresolved")
+        assert len(_parse_cache) == 0
+
+    def test_config_fingerprint(self):
+        config = SearchConfig.create_from(default_config, free_text_key="title")
+        assert get_search_config_fingerprint(config) != get_search_config_fingerprint(
+            default_config
+        )
+        assert get_search_config_fingerprint(
+            SearchConfig.create_from(default_config)
+        ) == get_search_config_fingerprint(default_config)
+
+        assert parse_search_query("foo", config=config) == [
+            SearchFilter(key=SearchKey(name="title"), operator="=", value=SearchValue("foo"))
+        ]
+        assert parse_search_query("foo") == [
+            SearchFilter(key=SearchKey(name="message"), operator="=", value=SearchValue("foo"))
+        ]
+
+    def test_field_type_lookups(self):
+        assert parse_search_query("foo:bar", get_field_type=lambda key: "string") == [
+            SearchFilter(key=SearchKey(name="foo"), operator="=", value=SearchValue("bar"))
+        ]
+        assert parse_search_query("foo:>10", get_field_type=lambda key: "integer") == [
+            SearchFilter(key=SearchKey(name="foo"), operator=">", value=SearchValue(10))
+        ]
+        # A caller with different field types doesn't get the cached tokens
+        assert parse_search_query("foo:>10", get_field_type=lambda key: "string") == [
+            SearchFilter(key=SearchKey(name="foo"), operator="=", value=SearchValue(">10"))
+        ]
+
+    def test_rel_time_filter_not_cached(self):
+        now = timezone.now()
+        with freeze_time(now):
+            assert parse_search_query("time:+7d")[0].value.raw_value == now - timedelta(days=7)
+        with freeze_time(now + timedelta(days=1)):
+            assert parse_search_query("time:+7d")[0].value.raw_value == now - timedelta(days=6)
+        assert len(_parse_cache) == 0
+
+    def test_fast_path(self):
+        config = SearchConfig.create_from(
+            default_config,
+            is_filter_translation={"unresolved": ("status", "unresolved")},
+            key_mappings={"user": ["user.email"]},
+        )
+        queries = [
+            "",
+            "   ",
+            "foo",
+            "foo bar  baz",
+            "is:unresolved",
+            "!is:unresolved foo",
+            "user.email:foo@example.com",
+            "!environment:production release:backend@1.2.3",
+            "foo browser.name:Chrome bar baz os.name:*Windows*",
+            "transaction:/api/0/organizations/*",
+        ]
+        for query in queries:
+            tokens = _fast_tokenize(query, SearchVisitor(config))
+            assert tokens is not None, query
+            assert tokens == self.parse_with_grammar(query, config), query
+
+        for query in [
+            "foo OR bar",
+            "(foo)",
+            'message:"foo bar"',
+            "count():>10",
+            "has:user",
+            "error.handled:true",
+            "transaction.duration:>2s",
+            "project.id:[1,2]",
+            "foo\tbar",
+        ]:
+            assert _fast_tokenize(query, SearchVisitor(config)) is None, query
+
+    def test_fast_path_fixtures(self):
+        for file in os.listdir(abs_fixtures_path):
+            with open(os.path.join(abs_fixtures_path, file)) as fp:
+                cases = json.load(fp)
+            for case in cases:
+                query = case["query"]
+                try:
+                    expected = self.parse_with_grammar(query)
+                except InvalidSearchQuery:
+                    expected = None
+                try:
+                    tokens = _fast_tokenize(query, SearchVisitor(default_config))
+                except InvalidSearchQuery:
+                    assert expected is None, query
+                    continue
+                if tokens is not None:
+                    assert tokens == expected, query
+
+
 @pytest.mark.parametrize(
     "raw,result",
     [
@@ -1,6 +1,8 @@
 import copy
 
-from sentry.attachments.base import BaseAttachmentCache, CachedAttachment
+import pytest
+
+from sentry.attachments.base import BaseAttachmentCache, CachedAttachment, MissingAttachmentChunks
 
 
 class InMemoryCache:
@@ -128,3 +130,23 @@ def test_basic_rate_limited():
     assert att2.id == att.id == 0
     assert att2.data == att.data == b"Hello World! Bye."
     assert att2.rate_limited is True
+
+
+def test_iter_data():
+    data = InMemoryCache()
+    cache = BaseAttachmentCache(data)
+
+    cache.set_chunk("c:foo", 123, 0, b"Hello World! ")
+    cache.set_chunk("c:foo", 123, 1, b"Bye.")
+
+    att = cache.get_from_chunks(key="c:foo", id=123, chunks=3)
+    chunks = att.iter_data()
+    assert next(chunks) == b"Hello World! "
+    assert next(chunks) == b"Bye."
+    # Missing chunks are only noticed when reaching them
+    with pytest.raises(MissingAttachmentChunks):
+        next(chunks)
+
+    att = CachedAttachment(name="lol.txt", content_type="text/plain", data=b"Hello World!")
+    assert list(att.iter_data()) == [b"Hello World!"]
+    assert list(CachedAttachment(data=b"").iter_data()) == []
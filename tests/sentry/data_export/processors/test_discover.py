@@ -5,6 +5,7 @@ from sentry.data_export.base import ExportError
 from sentry.data_export.processors.discover import DiscoverProcessor
 from sentry.testutils.cases import PerformanceIssueTestCase, SnubaTestCase, TestCase
 from sentry.utils.samples import load_data
+from sentry.utils.snuba_columnar import ColumnarData
 
 
 class DiscoverProcessorTest(TestCase, SnubaTestCase):
@@ -82,6 +83,52 @@ class DiscoverProcessorTest(TestCase, SnubaTestCase):
         assert new_result_list[0]["count(id) / fake(field)"] == 5
         assert new_result_list[0]["count(id) / 2"] == 8
 
+    def test_handle_columnar_fields(self):
+        self.discover_query["field"] = ["issue", "transaction.status"]
+        self.discover_query["equations"] = ["count(id) / 2"]
+        processor = DiscoverProcessor(organization=self.org, discover_query=self.discover_query)
+        data = ColumnarData(
+            {
+                "issue.id": [self.group.id, -1],
+                "transaction.status": [
+                    SPAN_STATUS_NAME_TO_CODE.get("ok"),
+                    SPAN_STATUS_NAME_TO_CODE.get("not_found"),
+                ],
+                "equation[0]": [5, 8],
+            }
+        )
+        assert [dict(row) for row in processor.handle_fields(data)] == [
+            {
+                "issue.id": self.group.id,
+                "issue": self.group.qualified_short_id,
+                "transaction.status": "ok",
+                "equation[0]": 5,
+                "count(id) / 2": 5,
+            },
+            {
+                "issue.id": -1,
+                "issue": "unknown",
+                "transaction.status": "not_found",
+                "equation[0]": 8,
+                "count(id) / 2": 8,
+            },
+        ]
+
+    def test_columnar_results(self):
+        error_event = self.store_event(load_data("python"), project_id=self.project1.id)
+        self.discover_query = {**self.discover_query, "field": ["title"]}
+        with self.options({"data-export.discover.columnar-results": True}):
+            processor = DiscoverProcessor(organization=self.org, discover_query=self.discover_query)
+        data = processor.data_fn(offset=0, limit=2)["data"]
+        assert isinstance(data, ColumnarData)
+        assert data.to_rows() == [
+            {
+                "title": error_event.message,
+                "id": error_event.event_id,
+                "project.name": self.project1.slug,
+            }
+        ]
+
     def test_handle_transactions_dataset(self):
         # Store an error event to show we're querying transactions
         self.store_event(load_data("python"), project_id=self.project1.id)
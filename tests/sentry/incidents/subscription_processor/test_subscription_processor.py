@@ -41,14 +41,19 @@ from sentry.incidents.models.incident import (
     TriggerStatus,
 )
 from sentry.incidents.subscription_processor import (
+    AlertRuleStatsUpdate,
     SubscriptionProcessor,
     build_alert_rule_stat_keys,
     build_alert_rule_trigger_stat_key,
     build_trigger_stat_keys,
     get_alert_rule_stats,
+    get_alert_rule_stats_many,
     get_redis_client,
     partition,
+    prefetch_alert_rule_states,
+    process_subscription_updates,
     update_alert_rule_stats,
+    update_alert_rule_stats_many,
 )
 from sentry.models.project import Project
 from sentry.seer.anomaly_detection.get_anomaly_data import get_anomaly_data_from_seer_legacy
@@ -68,6 +73,7 @@ from sentry.testutils.helpers.alert_rule import TemporaryAlertRuleTriggerActionR
 from sentry.testutils.helpers.datetime import freeze_time
 from sentry.testutils.helpers.features import with_feature
 from sentry.utils import json
+from sentry.utils.dates import to_datetime
 
 EMPTY = object()
 pytestmark = [pytest.mark.sentry_metrics]
@@ -4548,6 +4554,139 @@ class MetricsCrashRateAlertProcessUpdateTest(ProcessUpdateBaseClass, BaseMetrics
         )
 
 
+@freeze_time()
+class ProcessSubscriptionUpdatesTest(ProcessUpdateBaseClass):
+    @cached_property
+    def other_project(self):
+        return self.create_project()
+
+    @cached_property
+    def rule(self):
+        rule = self.create_alert_rule(
+            projects=[self.project, self.other_project],
+            name="some rule",
+            query="",
+            aggregate="count()",
+            time_window=1,
+            threshold_type=AlertRuleThresholdType.ABOVE,
+            resolve_threshold=10,
+            threshold_period=2,
+        )
+        trigger = create_alert_rule_trigger(rule, CRITICAL_TRIGGER_LABEL, 100)
+        create_alert_rule_trigger_action(
+            trigger,
+            AlertRuleTriggerAction.Type.EMAIL,
+            AlertRuleTriggerAction.TargetType.USER,
+            str(self.user.id),
+        )
+        return rule
+
+    @cached_property
+    def trigger(self):
+        return self.rule.alertruletrigger_set.get()
+
+    @cached_property
+    def sub(self):
+        return self.rule.snuba_query.subscriptions.filter(project=self.project).get()
+
+    @cached_property
+    def other_sub(self):
+        return self.rule.snuba_query.subscriptions.filter(project=self.other_project).get()
+
+    def build_update(self, subscription, value, time_delta):
+        return {
+            "subscription_id": subscription.subscription_id,
+            "values": {"data": [{"some_col_name": value}]},
+            "timestamp": (timezone.now() + time_delta).replace(microsecond=0),
+        }
+
+    def send_updates(self, updates):
+        with (
+            self.feature(["organizations:incidents", "organizations:performance-view"]),
+            self.capture_on_commit_callbacks(execute=True),
+        ):
+            process_subscription_updates(
+                [
+                    (self.build_update(subscription, value, time_delta), subscription)
+                    for subscription, value, time_delta in updates
+                ]
+            )
+
+    def test_prefetch(self):
+        states = prefetch_alert_rule_states([self.sub, self.other_sub])
+        assert set(states) == {self.sub.id, self.other_sub.id}
+        state = states[self.sub.id]
+        assert state.alert_rule == self.rule
+        assert state.triggers == [self.trigger]
+        assert state.active_incident is None
+        assert state.incident_triggers == {}
+        # Each subscription gets its own list of triggers
+        assert state.triggers is not states[self.other_sub.id].triggers
+
+    def test_prefetch_no_alert_rule(self):
+        sub = self.sub
+        self.rule.delete()
+        assert prefetch_alert_rule_states([sub]) == {}
+
+    def test_threshold_period_within_batch(self):
+        self.send_updates(
+            [
+                (self.sub, self.trigger.alert_threshold + 1, timedelta(minutes=-2)),
+                (self.other_sub, self.trigger.alert_threshold + 1, timedelta(minutes=-2)),
+                (self.sub, self.trigger.alert_threshold + 1, timedelta(minutes=-1)),
+            ]
+        )
+        incident = self.assert_active_incident(self.rule, self.sub)
+        self.assert_trigger_exists_with_status(incident, self.trigger, TriggerStatus.ACTIVE)
+        last_update, alert_counts, _ = get_alert_rule_stats(self.rule, self.sub, [self.trigger])
+        assert last_update == (timezone.now() - timedelta(minutes=1)).replace(microsecond=0)
+        assert alert_counts == {self.trigger.id: 0}
+        _, alert_counts, _ = get_alert_rule_stats(self.rule, self.other_sub, [self.trigger])
+        assert alert_counts == {self.trigger.id: 1}
+
+    def test_resolve_uses_prefetched_incident(self):
+        self.send_updates(
+            [
+                (self.sub, self.trigger.alert_threshold + 1, timedelta(minutes=-4)),
+                (self.sub, self.trigger.alert_threshold + 1, timedelta(minutes=-3)),
+            ]
+        )
+        incident = self.assert_active_incident(self.rule, self.sub)
+
+        self.send_updates(
+            [
+                (self.sub, self.rule.resolve_threshold - 1, timedelta(minutes=-2)),
+                (self.sub, self.rule.resolve_threshold - 1, timedelta(minutes=-1)),
+            ]
+        )
+        self.assert_no_active_incident(self.rule, self.sub)
+        self.assert_trigger_exists_with_status(incident, self.trigger, TriggerStatus.RESOLVED)
+
+    def test_skips_already_processed_updates(self):
+        self.send_updates([(self.sub, self.trigger.alert_threshold + 1, timedelta())])
+        self.send_updates([(self.sub, self.trigger.alert_threshold + 1, timedelta(minutes=-1))])
+        self.metrics.incr.assert_any_call("incidents.alert_rules.skipping_already_processed_update")
+        _, alert_counts, _ = get_alert_rule_stats(self.rule, self.sub, [self.trigger])
+        assert alert_counts == {self.trigger.id: 1}
+
+    def test_failure_falls_back_to_single_processing(self):
+        with mock.patch.object(
+            SubscriptionProcessor,
+            "get_aggregation_value",
+            side_effect=[self.trigger.alert_threshold + 1, Exception("boom"), 0.0],
+        ):
+            self.send_updates(
+                [
+                    (self.sub, self.trigger.alert_threshold + 1, timedelta(minutes=-3)),
+                    (self.sub, self.trigger.alert_threshold + 1, timedelta(minutes=-2)),
+                    (self.sub, 0, timedelta(minutes=-1)),
+                ]
+            )
+        last_update, alert_counts, _ = get_alert_rule_stats(self.rule, self.sub, [self.trigger])
+        assert last_update == (timezone.now() - timedelta(minutes=1)).replace(microsecond=0)
+        assert alert_counts == {self.trigger.id: 0}
+
+
 class TestBuildAlertRuleStatKeys(unittest.TestCase):
     def test(self):
         stat_keys = build_alert_rule_stat_keys(AlertRule(id=1), QuerySubscription(project_id=2))
@@ -4632,3 +4771,62 @@ class TestUpdateAlertRuleStats(TestCase):
         ]
 
         assert results == [int(date.timestamp()), 20, 10, 3, 15]
+
+
+class TestGetAlertRuleStatsMany(TestCase):
+    def test(self):
+        alert_rule = AlertRule(id=1)
+        triggers = [AlertRuleTrigger(id=3), AlertRuleTrigger(id=4)]
+        timestamp = timezone.now().replace(microsecond=0)
+        update_alert_rule_stats(
+            alert_rule, QuerySubscription(project_id=2), timestamp, {3: 1, 4: 3}, {3: 2, 4: 4}
+        )
+
+        results = get_alert_rule_stats_many(
+            [
+                (alert_rule, QuerySubscription(project_id=2), triggers),
+                (alert_rule, QuerySubscription(project_id=5), triggers),
+            ]
+        )
+        assert results == [
+            (timestamp, {3: 1, 4: 3}, {3: 2, 4: 4}),
+            (to_datetime(0), {3: 0, 4: 0}, {3: 0, 4: 0}),
+        ]
+
+    def test_empty(self):
+        assert get_alert_rule_stats_many([]) == []
+
+
+class TestUpdateAlertRuleStatsMany(TestCase):
+    def test(self):
+        alert_rule = AlertRule(id=1)
+        triggers = [AlertRuleTrigger(id=3)]
+        date = timezone.now().replace(microsecond=0)
+        update_alert_rule_stats_many(
+            [
+                AlertRuleStatsUpdate(
+                    alert_rule=alert_rule,
+                    subscription=QuerySubscription(project_id=2),
+                    last_update=date,
+                    alert_counts={3: 20},
+                    resolve_counts={},
+                ),
+                AlertRuleStatsUpdate(
+                    alert_rule=alert_rule,
+                    subscription=QuerySubscription(project_id=5),
+                    last_update=date,
+                    alert_counts={},
+                    resolve_counts={3: 10},
+                ),
+            ]
+        )
+        assert get_alert_rule_stats(alert_rule, QuerySubscription(project_id=2), triggers) == (
+            date,
+            {3: 20},
+            {3: 0},
+        )
+        assert get_alert_rule_stats(alert_rule, QuerySubscription(project_id=5), triggers) == (
+            date,
+            {3: 0},
+            {3: 10},
+        )
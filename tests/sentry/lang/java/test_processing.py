@@ -0,0 +1,152 @@
+from unittest import mock
+
+import orjson
+import pytest
+
+from sentry.attachments import CachedAttachment
+from sentry.lang.java.processing import clear_class_name_cache, process_jvm_stacktraces
+
+PROGUARD_UUID = "a1b2c3d4-0000-0000-0000-000000000000"
+
+
+@pytest.fixture(autouse=True)
+def class_name_cache():
+    clear_class_name_cache()
+    yield
+    clear_class_name_cache()
+
+
+@pytest.fixture
+def attachment_cache():
+    with mock.patch("sentry.lang.java.processing.attachment_cache") as attachment_cache:
+        attachment_cache.get.return_value = []
+        yield attachment_cache
+
+
+def make_symbolicator(errors=None):
+    def process_jvm(stacktraces, exceptions, classes, **kwargs):
+        return {
+            "status": "completed",
+            "stacktraces": [
+                {
+                    "frames": [
+                        {**frame, "function": f"original_{frame['function']}"}
+                        for frame in stacktrace["frames"]
+                    ]
+                }
+                for stacktrace in stacktraces
+            ],
+            "exceptions": exceptions,
+            "classes": {class_name: f"original.{class_name}" for class_name in classes},
+            "errors": errors or [],
+        }
+
+    symbolicator = mock.Mock()
+    symbolicator.project.id = 1
+    symbolicator.process_jvm.side_effect = process_jvm
+    return symbolicator
+
+
+def make_data(threads):
+    return {
+        "event_id": "a" * 32,
+        "platform": "java",
+        "debug_meta": {"images": [{"type": "proguard", "uuid": PROGUARD_UUID}]},
+        "threads": {
+            "values": [
+                {"id": i, "stacktrace": {"frames": frames}} for i, frames in enumerate(threads)
+            ]
+        },
+    }
+
+
+def make_frames(*functions):
+    return [{"module": "a.b", "function": function, "lineno": 1} for function in functions]
+
+
+def get_functions(data):
+    return [
+        [frame["function"] for frame in thread["stacktrace"]["frames"]]
+        for thread in data["threads"]["values"]
+    ]
+
+
+def make_view_hierarchy_attachment(attachment_cache, *class_names):
+    view_hierarchy = {"windows": [{"type": class_name} for class_name in class_names]}
+    attachment_cache.get_data.return_value = orjson.dumps(view_hierarchy)
+    attachment_cache.get.return_value = [
+        CachedAttachment(
+            type="event.view_hierarchy",
+            name="view-hierarchy.json",
+            content_type="application/json",
+            data=orjson.dumps(view_hierarchy),
+        )
+    ]
+
+
+def get_deobfuscated_windows(attachment_cache):
+    (attachment,) = attachment_cache.set.call_args.kwargs["attachments"]
+    view_hierarchy = orjson.loads(attachment.data)
+    return sorted(window["type"] for window in view_hierarchy["windows"])
+
+
+def test_identical_stacktraces_are_symbolicated_once(attachment_cache):
+    symbolicator = make_symbolicator()
+    data = make_data([make_frames("a", "b"), make_frames("c"), make_frames("a", "b")])
+
+    data = process_jvm_stacktraces(symbolicator, data)
+
+    sent_stacktraces = symbolicator.process_jvm.call_args.kwargs["stacktraces"]
+    assert [[frame["function"] for frame in st["frames"]] for st in sent_stacktraces] == [
+        ["a", "b"],
+        ["c"],
+    ]
+    assert get_functions(data) == [
+        ["original_a", "original_b"],
+        ["original_c"],
+        ["original_a", "original_b"],
+    ]
+    assert data["threads"]["values"][2]["raw_stacktrace"]["frames"] == make_frames("a", "b")
+
+
+def test_exception_stacktraces_are_not_deduplicated(attachment_cache):
+    symbolicator = make_symbolicator()
+    data = make_data([make_frames("a"), make_frames("a")])
+    data["exception"] = {
+        "values": [{"type": "A", "module": "a", "stacktrace": {"frames": make_frames("a")}}]
+    }
+
+    data = process_jvm_stacktraces(symbolicator, data)
+
+    assert len(symbolicator.process_jvm.call_args.kwargs["stacktraces"]) == 2
+    assert data["exception"]["values"][0]["stacktrace"]["frames"][0]["function"] == "original_a"
+    assert get_functions(data) == [["original_a"], ["original_a"]]
+
+
+def test_window_class_names_are_cached(attachment_cache):
+    symbolicator = make_symbolicator()
+    make_view_hierarchy_attachment(attachment_cache, "a.a", "a.b")
+
+    process_jvm_stacktraces(symbolicator, make_data([]))
+    assert sorted(symbolicator.process_jvm.call_args.kwargs["classes"]) == ["a.a", "a.b"]
+    assert get_deobfuscated_windows(attachment_cache) == ["original.a.a", "original.a.b"]
+
+    # All classes are cached, so symbolicator is not called again
+    process_jvm_stacktraces(symbolicator, make_data([]))
+    assert symbolicator.process_jvm.call_count == 1
+    assert get_deobfuscated_windows(attachment_cache) == ["original.a.a", "original.a.b"]
+
+    # Only uncached classes are sent
+    make_view_hierarchy_attachment(attachment_cache, "a.a", "a.c")
+    process_jvm_stacktraces(symbolicator, make_data([make_frames("a")]))
+    assert symbolicator.process_jvm.call_args.kwargs["classes"] == ["a.c"]
+    assert get_deobfuscated_windows(attachment_cache) == ["original.a.a", "original.a.c"]
+
+
+def test_window_class_names_are_not_cached_on_errors(attachment_cache):
+    symbolicator = make_symbolicator(errors=[{"type": "missing", "uuid": PROGUARD_UUID}])
+    make_view_hierarchy_attachment(attachment_cache, "a.a")
+
+    process_jvm_stacktraces(symbolicator, make_data([]))
+    process_jvm_stacktraces(symbolicator, make_data([]))
+    assert symbolicator.process_jvm.call_count == 2
@@ -1,7 +1,8 @@
-from unittest import TestCase
 from unittest.mock import Mock
 
+from sentry.lang.javascript import frame_cache
 from sentry.lang.javascript.processing import NODE_MODULES_RE, is_in_app, process_js_stacktraces
+from sentry.testutils.cases import TestCase
 
 
 class JavaScriptProcessingTest(TestCase):
@@ -265,3 +266,118 @@ class JavaScriptProcessingTest(TestCase):
         self.assertIsNone(
             result["symbolicated_in_app"]
         )  # Should be None since no frames are in_app
+
+
+class JavaScriptFrameCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        frame_cache.clear_local_cache()
+        self.addCleanup(frame_cache.clear_local_cache)
+
+    def make_frame(self, lineno, colno=1):
+        return {
+            "abs_path": "https://example.com/static/app.min.js",
+            "lineno": lineno,
+            "colno": colno,
+            "function": f"f{lineno}",
+            "platform": "javascript",
+        }
+
+    def make_data(self, frames):
+        return {
+            "platform": "javascript",
+            "release": "1.0",
+            "exception": {"values": [{"type": "Error", "stacktrace": {"frames": frames}}]},
+        }
+
+    def make_symbolicator(self, symbolicated=True):
+        def process_js(stacktraces, **kwargs):
+            return {
+                "status": "completed",
+                "stacktraces": [
+                    {
+                        "frames": [
+                            {
+                                **frame,
+                                "abs_path": "webpack:///src/app.js",
+                                "function": f"original_{frame['function']}",
+                                "data": {"symbolicated": symbolicated},
+                            }
+                            for frame in stacktrace["frames"]
+                        ]
+                    }
+                    for stacktrace in stacktraces
+                ],
+                "raw_stacktraces": [
+                    {"frames": [dict(frame) for frame in stacktrace["frames"]]}
+                    for stacktrace in stacktraces
+                ],
+            }
+
+        symbolicator = Mock()
+        symbolicator.project = self.project
+        symbolicator.process_js.side_effect = process_js
+        return symbolicator
+
+    def get_functions(self, data):
+        frames = data["exception"]["values"][0]["stacktrace"]["frames"]
+        return [frame["function"] for frame in frames]
+
+    def test_only_uncached_frames_are_symbolicated(self):
+        symbolicator = self.make_symbolicator()
+
+        with self.options({"symbolicator.sourcemaps-frame-cache-ttl": 3600}):
+            data = process_js_stacktraces(
+                symbolicator, self.make_data([self.make_frame(1), self.make_frame(2)])
+            )
+            assert self.get_functions(data) == ["original_f1", "original_f2"]
+
+            data = process_js_stacktraces(
+                symbolicator, self.make_data([self.make_frame(3), self.make_frame(1)])
+            )
+            assert self.get_functions(data) == ["original_f3", "original_f1"]
+            sent_frames = symbolicator.process_js.call_args.kwargs["stacktraces"][0]["frames"]
+            assert sent_frames == [self.make_frame(3)]
+
+            # Frames are read from redis once they are gone from the local cache
+            frame_cache.clear_local_cache()
+            data = process_js_stacktraces(
+                symbolicator, self.make_data([self.make_frame(2), self.make_frame(3)])
+            )
+            assert self.get_functions(data) == ["original_f2", "original_f3"]
+            assert symbolicator.process_js.call_count == 2
+
+            # The same position in a different release is a different frame
+            other_release = self.make_data([self.make_frame(1)])
+            other_release["release"] = "2.0"
+            process_js_stacktraces(symbolicator, other_release)
+            assert symbolicator.process_js.call_count == 3
+
+    def test_unsymbolicated_frames_are_not_cached(self):
+        symbolicator = self.make_symbolicator(symbolicated=False)
+
+        with self.options({"symbolicator.sourcemaps-frame-cache-ttl": 3600}):
+            process_js_stacktraces(symbolicator, self.make_data([self.make_frame(1)]))
+            process_js_stacktraces(symbolicator, self.make_data([self.make_frame(1)]))
+
+        assert symbolicator.process_js.call_count == 2
+
+    def test_frames_without_release_are_not_cached(self):
+        symbolicator = self.make_symbolicator()
+
+        with self.options({"symbolicator.sourcemaps-frame-cache-ttl": 3600}):
+            for _ in range(2):
+                data = self.make_data([self.make_frame(1)])
+                del data["release"]
+                process_js_stacktraces(symbolicator, data)
+
+        assert symbolicator.process_js.call_count == 2
+
+    def test_disabled(self):
+        symbolicator = self.make_symbolicator()
+
+        with self.options({"symbolicator.sourcemaps-frame-cache-ttl": 0}):
+            process_js_stacktraces(symbolicator, self.make_data([self.make_frame(1)]))
+            process_js_stacktraces(symbolicator, self.make_data([self.make_frame(1)]))
+
+        assert symbolicator.process_js.call_count == 2
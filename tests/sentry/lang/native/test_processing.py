@@ -18,6 +18,7 @@ from sentry.lang.native.processing import (
     process_native_stacktraces,
 )
 from sentry.models.eventerror import EventError
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils.safe import get_path
 
@@ -415,3 +416,151 @@ def test_il2cpp_symbolication(mock_symbolicator, default_project):
         == "/Users/swatinem/Coding/sentry-unity/samples/unity-of-bugs/Assets/Scripts/BugFarmButtons.cs"
     )
     assert frame["lineno"] == 51
+
+
+def symbolicate_payload(stacktraces, modules, **kwargs):
+    """Symbolicates frames by naming them after their image-relative address, like
+    Symbolicator would, and reports the images referenced by frames as found."""
+
+    used_images = set()
+    complete_stacktraces = []
+    for stacktrace in stacktraces:
+        complete_frames = []
+        for idx, frame in enumerate(stacktrace["frames"]):
+            addr = int(frame["instruction_addr"], 16)
+            image_idx, image = next(
+                (i, image)
+                for i, image in enumerate(modules)
+                if int(image["image_addr"], 16) <= addr
+                and addr < int(image["image_addr"], 16) + image["image_size"]
+            )
+            used_images.add(image_idx)
+            relative_addr = addr - int(image["image_addr"], 16)
+            complete_frames.append(
+                {
+                    "original_index": idx,
+                    "instruction_addr": frame["instruction_addr"],
+                    "function": f"function_{relative_addr:x}",
+                    "package": image["code_file"],
+                    "status": "symbolicated",
+                }
+            )
+        complete_stacktraces.append({"frames": complete_frames})
+
+    return {
+        "status": "completed",
+        "stacktraces": complete_stacktraces,
+        "modules": [
+            {"debug_status": "found" if idx in used_images else "unused"}
+            for idx in range(len(modules))
+        ],
+    }
+
+
+def make_native_event(project_id, image_addr, relative_addrs):
+    return {
+        "platform": "native",
+        "project": project_id,
+        "event_id": "1",
+        "debug_meta": {
+            "images": [
+                {
+                    "type": "macho",
+                    "image_addr": hex(image_addr),
+                    "image_size": 0x10000,
+                    "debug_id": "a9669c0c-72b3-3d2c-952b-d9096f65bc4f",
+                    "code_file": f"/private/var/containers/{image_addr:x}/App",
+                }
+            ]
+        },
+        "exception": {
+            "values": [
+                {
+                    "stacktrace": {
+                        "frames": [
+                            {"instruction_addr": hex(image_addr + relative_addr)}
+                            for relative_addr in reversed(relative_addrs)
+                        ]
+                    }
+                }
+            ]
+        },
+    }
+
+
+@pytest.fixture
+def native_frame_cache():
+    from sentry.lang.native.frame_cache import native_frame_cache
+
+    native_frame_cache.clear_local_cache()
+    yield native_frame_cache
+    native_frame_cache.clear_local_cache()
+
+
+@django_db_all
+@override_options({"symbolicator.native-frame-cache-ttl": 3600})
+def test_native_frame_cache(default_project, native_frame_cache):
+    symbolicator = mock.Mock()
+    symbolicator.project = default_project
+    symbolicator.process_payload.side_effect = symbolicate_payload
+
+    data = make_native_event(default_project.id, 0x1000, [0x10, 0x20, 0x30])
+    process_native_stacktraces(symbolicator, data)
+    assert len(symbolicator.process_payload.call_args.kwargs["stacktraces"][0]["frames"]) == 3
+
+    # The same image loaded at another address, with one new frame
+    data = make_native_event(default_project.id, 0x5000, [0x10, 0x20, 0x30, 0x40])
+    process_native_stacktraces(symbolicator, data)
+
+    # Only the crashing frame, which is never cached, and the new frame are sent
+    sent_frames = symbolicator.process_payload.call_args.kwargs["stacktraces"][0]["frames"]
+    assert [frame["instruction_addr"] for frame in sent_frames] == ["0x5010", "0x5040"]
+
+    frames = get_path(data, "exception", "values", 0, "stacktrace", "frames")
+    assert [frame["function"] for frame in reversed(frames)] == [
+        "function_10",
+        "function_20",
+        "function_30",
+        "function_40",
+    ]
+    assert [frame["instruction_addr"] for frame in reversed(frames)] == [
+        "0x5010",
+        "0x5020",
+        "0x5030",
+        "0x5040",
+    ]
+    assert {frame["package"] for frame in frames} == {"/private/var/containers/5000/App"}
+    assert get_path(data, "debug_meta", "images", 0, "debug_status") == "found"
+
+
+@django_db_all
+@override_options({"symbolicator.native-frame-cache-ttl": 3600})
+def test_native_frame_cache_image_only_referenced_by_cached_frames(
+    default_project, native_frame_cache
+):
+    symbolicator = mock.Mock()
+    symbolicator.project = default_project
+    symbolicator.process_payload.side_effect = symbolicate_payload
+
+    process_native_stacktraces(
+        symbolicator, make_native_event(default_project.id, 0x1000, [0x10, 0x20])
+    )
+
+    data = make_native_event(default_project.id, 0x1000, [0x10, 0x20])
+    data["debug_meta"]["images"].append(
+        {
+            "type": "macho",
+            "image_addr": "0x100000",
+            "image_size": 0x1000,
+            "debug_id": "b9669c0c-72b3-3d2c-952b-d9096f65bc4f",
+            "code_file": "/usr/lib/libcrash.dylib",
+        }
+    )
+    # The crashing frame moves to the second image, the first image is only referenced
+    # by a cached frame.
+    frames = get_path(data, "exception", "values", 0, "stacktrace", "frames")
+    frames[-1]["instruction_addr"] = "0x100010"
+    process_native_stacktraces(symbolicator, data)
+
+    assert get_path(data, "debug_meta", "images", 0, "debug_status") == "found"
+    assert get_path(data, "debug_meta", "images", 1, "debug_status") == "found"
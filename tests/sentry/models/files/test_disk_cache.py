@@ -0,0 +1,75 @@
+import os
+import tempfile
+from io import BytesIO
+from unittest.mock import patch
+
+from sentry.models.files.abstractfile import AbstractFile
+from sentry.models.files.disk_cache import file_cache
+from sentry.models.files.file import File
+from sentry.testutils.cases import TestCase
+
+
+class FileDiskCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.cache_path = tempdir.name
+
+    def create_file(self, contents: bytes) -> File:
+        file = File.objects.create(name="bundle.zip", type="artifact.bundle")
+        file.putfile(BytesIO(contents))
+        return file
+
+    def test_disabled(self):
+        file = self.create_file(b"foo")
+
+        with self.options({"filestore.cache-path": self.cache_path, "filestore.cache-limit": 0}):
+            with file_cache.open(file) as fp:
+                assert fp.read() == b"foo"
+
+        assert os.listdir(self.cache_path) == []
+
+    def test_open_caches_by_checksum(self):
+        file = self.create_file(b"foo")
+        # A second file with the same contents shares the cache entry
+        other_file = self.create_file(b"foo")
+
+        with (
+            self.options({"filestore.cache-path": self.cache_path, "filestore.cache-limit": 100}),
+            patch.object(
+                AbstractFile, "save_to", autospec=True, side_effect=AbstractFile.save_to
+            ) as save_to,
+        ):
+            with file_cache.open(file) as fp:
+                assert fp.read() == b"foo"
+            with file_cache.open(other_file) as fp:
+                assert fp.read() == b"foo"
+
+            assert save_to.call_count == 1
+            assert os.path.exists(file_cache.get_entry_path(file.checksum))
+
+    def test_evicts_least_recently_used(self):
+        first = self.create_file(b"a" * 40)
+        second = self.create_file(b"b" * 40)
+        third = self.create_file(b"c" * 40)
+
+        with self.options({"filestore.cache-path": self.cache_path, "filestore.cache-limit": 100}):
+            file_cache.open(first).close()
+            file_cache.open(second).close()
+            os.utime(file_cache.get_entry_path(first.checksum), (1, 1))
+            os.utime(file_cache.get_entry_path(second.checksum), (2, 2))
+
+            # Reading the first file makes the second one the least recently used
+            file_cache.open(first).close()
+            file_cache.open(third).close()
+
+            assert os.path.exists(file_cache.get_entry_path(first.checksum))
+            assert not os.path.exists(file_cache.get_entry_path(second.checksum))
+            assert os.path.exists(file_cache.get_entry_path(third.checksum))
+
+            # Files larger than the cache are not cached
+            large = self.create_file(b"d" * 200)
+            with file_cache.open(large) as fp:
+                assert fp.read() == b"d" * 200
+            assert not os.path.exists(file_cache.get_entry_path(large.checksum))
@@ -0,0 +1,59 @@
+import os
+from hashlib import sha1
+
+import pytest
+
+from sentry.attachments.base import BaseAttachmentCache, MissingAttachmentChunks
+from sentry.models.eventattachment import EventAttachment
+from sentry.testutils.pytest.fixtures import django_db_all
+from tests.sentry.attachments.test_base import InMemoryCache
+
+
+def make_attachment(chunks, num_chunks=None):
+    cache = BaseAttachmentCache(InMemoryCache())
+    for chunk_index, chunk in enumerate(chunks):
+        cache.set_chunk("c:foo", 0, chunk_index, chunk)
+    return cache.get_from_chunks(
+        key="c:foo",
+        id=0,
+        name="foo.bin",
+        content_type="application/octet-stream",
+        chunks=len(chunks) if num_chunks is None else num_chunks,
+    )
+
+
+def read_stored(result):
+    with EventAttachment(blob_path=result.blob_path).getfile() as f:
+        return f.read()
+
+
+@django_db_all
+def test_putfile_chunked():
+    chunks = [os.urandom(64 * 1024) for _ in range(8)]
+    data = b"".join(chunks)
+
+    result = EventAttachment.putfile(1, make_attachment(chunks))
+
+    assert result.blob_path.startswith("eventattachments/v1/")
+    assert result.size == len(data)
+    assert result.sha1 == sha1(data).hexdigest()
+    assert read_stored(result) == data
+
+
+@django_db_all
+def test_putfile_inline():
+    result = EventAttachment.putfile(1, make_attachment([b"Hello ", b"World!"]))
+
+    assert result.blob_path == ":Hello World!"
+    assert result.size == 12
+    assert result.sha1 == sha1(b"Hello World!").hexdigest()
+
+    result = EventAttachment.putfile(1, make_attachment([b"", b""]))
+    assert result.blob_path is None
+    assert result.size == 0
+
+
+@django_db_all
+def test_putfile_missing_chunks():
+    with pytest.raises(MissingAttachmentChunks):
+        EventAttachment.putfile(1, make_attachment([os.urandom(1024)], num_chunks=2))
@@ -9,6 +9,7 @@ from django.core.files.base import ContentFile
 from django.db import DatabaseError
 from django.utils import timezone
 
+from sentry.models.files.abstractfile import _read_blob
 from sentry.models.files.file import File
 from sentry.models.files.fileblob import FileBlob
 from sentry.models.files.fileblobindex import FileBlobIndex
@@ -188,6 +189,38 @@ class FileTest(TestCase):
         f = file.getfile(prefetch=True)
         assert f.read() == random_data
 
+    def test_random_access_caches_blobs(self):
+        data = b"abcdefghijklmnopqrstuvwxyz"
+        file1 = File.objects.create(name="baz.js", type="default", size=26)
+        file1.putfile(BytesIO(data), 5)
+
+        with patch("sentry.models.files.abstractfile._read_blob", wraps=_read_blob) as read_blob:
+            with file1.getfile() as fp:
+                fp.seek(22)
+                assert fp.read(2) == b"wx"
+                fp.seek(1)
+                assert fp.read(3) == b"bcd"
+                fp.seek(23)
+                assert fp.read() == b"xyz"
+                fp.seek(2)
+                assert fp.read(3) == b"cde"
+
+            # The blobs read from and the ones following them are downloaded once
+            assert read_blob.call_count == 4
+
+    def test_getbuffer(self):
+        data = b"abcdefghijklmnopqrstuvwxyz"
+        file1 = File.objects.create(name="baz.js", type="default", size=26)
+        file1.putfile(BytesIO(data), 10)
+
+        with file1.getfile(prefetch=True) as fp:
+            assert fp.file.getbuffer()[:] == data
+
+        with file1.getfile() as fp:
+            assert fp.file.getbuffer() is None
+            assert fp.read() == data
+            assert bytes(fp.file.getbuffer()) == data
+
 
 @django_db_all
 def test_large_files():
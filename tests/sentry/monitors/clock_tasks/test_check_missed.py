@@ -1,4 +1,4 @@
-from datetime import UTC, timedelta
+from datetime import UTC, datetime, timedelta
 from unittest import mock
 from zoneinfo import ZoneInfo
 
@@ -8,6 +8,7 @@ from django.utils import timezone
 from sentry_kafka_schemas.schema_types.monitors_clock_tasks_v1 import MarkMissing
 
 from sentry.constants import ObjectStatus
+from sentry.monitors import schedule_index
 from sentry.monitors.clock_tasks.check_missed import (
     dispatch_check_missing,
     mark_environment_missing,
@@ -22,6 +23,7 @@ from sentry.monitors.models import (
     ScheduleType,
 )
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
 
 
 class MonitorClockTasksCheckMissingTest(TestCase):
@@ -746,3 +748,116 @@ class MonitorClockTasksCheckMissingTest(TestCase):
         assert not MonitorCheckIn.objects.filter(
             monitor_environment=monitor_environment.id, status=CheckInStatus.MISSED
         ).exists()
+
+    @mock.patch("sentry.monitors.clock_tasks.check_missed.produce_task")
+    @override_options(
+        {
+            "crons.schedule_index.write_enabled": True,
+            "crons.schedule_index.read_enabled": True,
+            "crons.schedule_index.reconcile_interval": 10,
+        }
+    )
+    def test_missing_checkin_schedule_index(self, mock_produce_task):
+        org = self.create_organization()
+        project = self.create_project(organization=org)
+
+        # Not a reconciliation tick
+        ts = timezone.now().replace(minute=5, second=0, microsecond=0)
+
+        monitor = Monitor.objects.create(
+            organization_id=org.id,
+            project_id=project.id,
+            config={
+                "schedule_type": ScheduleType.CRONTAB,
+                "schedule": "* * * * *",
+                "max_runtime": None,
+                "checkin_margin": None,
+            },
+        )
+
+        def make_environment(name: str, next_checkin_latest: datetime):
+            return MonitorEnvironment.objects.create(
+                monitor=monitor,
+                environment_id=self.create_environment(project, name=name).id,
+                last_checkin=next_checkin_latest - timedelta(minutes=2),
+                next_checkin=next_checkin_latest - timedelta(minutes=1),
+                next_checkin_latest=next_checkin_latest,
+                status=MonitorStatus.OK,
+            )
+
+        indexed_env = make_environment("indexed", ts)
+        unindexed_env = make_environment("unindexed", ts)
+        moved_env = make_environment("moved", ts + timedelta(minutes=3))
+
+        schedule_index.schedule_missed(indexed_env.id, ts)
+        # Indexed before its next_checkin_latest was moved forward
+        schedule_index.schedule_missed(moved_env.id, ts)
+
+        dispatch_check_missing(ts)
+
+        # Only the indexed and still overdue environment is dispatched
+        assert mock_produce_task.call_count == 1
+        message = MONITORS_CLOCK_TASKS_CODEC.decode(mock_produce_task.mock_calls[0].args[0].value)
+        assert message["monitor_environment_id"] == indexed_env.id
+
+        # The moved environment is re-scheduled at its real time
+        assert schedule_index.pop_due_missed(ts + timedelta(minutes=2)) == []
+        assert schedule_index.pop_due_missed(ts + timedelta(minutes=3)) == [moved_env.id]
+
+        # The reconciliation tick picks up the environment missing from the
+        # index from postgres
+        mock_produce_task.reset_mock()
+        dispatch_check_missing(ts + timedelta(minutes=5))
+
+        dispatched = {
+            MONITORS_CLOCK_TASKS_CODEC.decode(call.args[0].value)["monitor_environment_id"]
+            for call in mock_produce_task.mock_calls
+        }
+        assert dispatched == {indexed_env.id, unindexed_env.id, moved_env.id}
+
+    @mock.patch("sentry.monitors.clock_tasks.check_missed.MONITOR_LIMIT", 1)
+    @mock.patch("sentry.monitors.clock_tasks.check_missed.produce_task")
+    @override_options(
+        {
+            "crons.schedule_index.write_enabled": True,
+            "crons.schedule_index.read_enabled": True,
+            "crons.schedule_index.reconcile_interval": 10,
+        }
+    )
+    def test_reconcile_keeps_undispatched_index_entries(self, mock_produce_task):
+        org = self.create_organization()
+        project = self.create_project(organization=org)
+
+        # A reconciliation tick
+        ts = timezone.now().replace(minute=0, second=0, microsecond=0)
+
+        monitor = Monitor.objects.create(
+            organization_id=org.id,
+            project_id=project.id,
+            config={
+                "schedule_type": ScheduleType.CRONTAB,
+                "schedule": "* * * * *",
+                "max_runtime": None,
+                "checkin_margin": None,
+            },
+        )
+        env_ids = []
+        for name in ("first", "second"):
+            monitor_environment = MonitorEnvironment.objects.create(
+                monitor=monitor,
+                environment_id=self.create_environment(project, name=name).id,
+                last_checkin=ts - timedelta(minutes=2),
+                next_checkin=ts - timedelta(minutes=1),
+                next_checkin_latest=ts,
+                status=MonitorStatus.OK,
+            )
+            schedule_index.schedule_missed(monitor_environment.id, ts)
+            env_ids.append(monitor_environment.id)
+
+        dispatch_check_missing(ts)
+
+        # Only the dispatched environment is dropped from the index
+        assert mock_produce_task.call_count == 1
+        message = MONITORS_CLOCK_TASKS_CODEC.decode(mock_produce_task.mock_calls[0].args[0].value)
+        (remaining,) = set(env_ids) - {message["monitor_environment_id"]}
+        assert schedule_index.pop_due_missed(ts) == [remaining]
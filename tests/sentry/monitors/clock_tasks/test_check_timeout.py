@@ -1,10 +1,11 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 from unittest import mock
 
 from arroyo.backends.kafka import KafkaPayload
 from django.utils import timezone
 from sentry_kafka_schemas.schema_types.monitors_clock_tasks_v1 import MarkTimeout
 
+from sentry.monitors import schedule_index
 from sentry.monitors.clock_tasks.check_timeout import dispatch_check_timeout, mark_checkin_timeout
 from sentry.monitors.clock_tasks.producer import MONITORS_CLOCK_TASKS_CODEC
 from sentry.monitors.logic.mark_failed import mark_failed
@@ -17,6 +18,7 @@ from sentry.monitors.models import (
     ScheduleType,
 )
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
 
 
 class MonitorClockTasksCheckTimeoutTest(TestCase):
@@ -493,3 +495,91 @@ class MonitorClockTasksCheckTimeoutTest(TestCase):
         # Second call does NOT trigger a mark_failed
         mark_checkin_timeout(checkin.id, ts + timedelta(minutes=31))
         assert mock_mark_failed.call_count == 1
+
+    @mock.patch("sentry.monitors.clock_tasks.check_timeout.produce_task")
+    @override_options(
+        {
+            "crons.schedule_index.write_enabled": True,
+            "crons.schedule_index.read_enabled": True,
+            "crons.schedule_index.reconcile_interval": 10,
+        }
+    )
+    def test_timeout_schedule_index(self, mock_produce_task):
+        org = self.create_organization()
+        project = self.create_project(organization=org)
+
+        ts = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        monitor = Monitor.objects.create(
+            organization_id=org.id,
+            project_id=project.id,
+            config={
+                "schedule_type": ScheduleType.CRONTAB,
+                "schedule": "0 0 * * *",
+                "checkin_margin": None,
+                "max_runtime": 5,
+            },
+        )
+        monitor_environment = MonitorEnvironment.objects.create(
+            monitor=monitor,
+            environment_id=self.environment.id,
+            last_checkin=ts,
+            next_checkin=ts + timedelta(hours=24),
+            next_checkin_latest=ts + timedelta(hours=24, minutes=1),
+            status=MonitorStatus.OK,
+        )
+
+        def make_checkin(status: int, timeout_at: datetime):
+            checkin = MonitorCheckIn.objects.create(
+                monitor=monitor,
+                monitor_environment=monitor_environment,
+                project_id=project.id,
+                status=status,
+                date_added=ts,
+                date_updated=ts,
+                timeout_at=timeout_at,
+            )
+            schedule_index.schedule_timeout(checkin.id, ts + timedelta(minutes=5))
+            return checkin
+
+        timed_out = make_checkin(CheckInStatus.IN_PROGRESS, ts + timedelta(minutes=5))
+        # Completed after it was indexed
+        make_checkin(CheckInStatus.OK, ts + timedelta(minutes=5))
+        # Heart-beat pushed the timeout back after it was indexed
+        extended = make_checkin(CheckInStatus.IN_PROGRESS, ts + timedelta(minutes=8))
+
+        dispatch_check_timeout(ts + timedelta(minutes=5))
+
+        message: MarkTimeout = {
+            "type": "mark_timeout",
+            "ts": (ts + timedelta(minutes=5)).timestamp(),
+            "monitor_environment_id": monitor_environment.id,
+            "checkin_id": timed_out.id,
+        }
+        payload = KafkaPayload(
+            str(monitor_environment.id).encode(),
+            MONITORS_CLOCK_TASKS_CODEC.encode(message),
+            [],
+        )
+        assert mock_produce_task.mock_calls == [mock.call(payload)]
+
+        # The extended check-in is re-scheduled at its real timeout
+        mock_produce_task.reset_mock()
+        dispatch_check_timeout(ts + timedelta(minutes=7))
+        assert mock_produce_task.call_count == 0
+
+        dispatch_check_timeout(ts + timedelta(minutes=8))
+        message = {
+            "type": "mark_timeout",
+            "ts": (ts + timedelta(minutes=8)).timestamp(),
+            "monitor_environment_id": monitor_environment.id,
+            "checkin_id": extended.id,
+        }
+        payload = KafkaPayload(
+            str(monitor_environment.id).encode(),
+            MONITORS_CLOCK_TASKS_CODEC.encode(message),
+            [],
+        )
+        # The first check-in was never marked as timed out, so it is still
+        # due, but it was already popped from the index
+        assert mock_produce_task.mock_calls == [mock.call(payload)]
@@ -0,0 +1,92 @@
+import uuid
+from datetime import datetime
+
+from sentry.models.environment import Environment
+from sentry.monitors.consumers.batch_state import CheckinBatchState
+from sentry.monitors.models import (
+    CheckInStatus,
+    Monitor,
+    MonitorCheckIn,
+    MonitorEnvironment,
+    ScheduleType,
+)
+from sentry.monitors.types import CheckinItem
+from sentry.testutils.cases import TestCase
+from sentry.utils import json
+
+
+class CheckinBatchStateTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.monitor = Monitor.objects.create(
+            organization_id=self.organization.id,
+            project_id=self.project.id,
+            slug="my-monitor",
+            config={"schedule": "* * * * *", "schedule_type": ScheduleType.CRONTAB},
+        )
+        self.environment = Environment.get_or_create(project=self.project, name="production")
+        self.monitor_environment = MonitorEnvironment.objects.create(
+            monitor=self.monitor, environment_id=self.environment.id
+        )
+
+    def make_item(self, monitor_slug: str, check_in_id: str) -> CheckinItem:
+        payload = {"monitor_slug": monitor_slug, "status": "ok", "check_in_id": check_in_id}
+        return CheckinItem(
+            ts=datetime.now(),
+            partition=0,
+            message={
+                "message_type": "check_in",
+                "start_time": datetime.now().timestamp(),
+                "project_id": self.project.id,
+                "payload": json.dumps(payload).encode(),
+                "sdk": "test/1.0",
+                "retention_days": 90,
+            },
+            payload=json.loads(json.dumps(payload)),
+        )
+
+    def test_load(self) -> None:
+        existing = MonitorCheckIn.objects.create(
+            monitor=self.monitor,
+            monitor_environment=self.monitor_environment,
+            project_id=self.project.id,
+            status=CheckInStatus.IN_PROGRESS,
+        )
+        new_guid = uuid.uuid4()
+        items = [
+            self.make_item("my-monitor", new_guid.hex),
+            self.make_item("my-monitor", existing.guid.hex),
+            self.make_item("my-monitor", uuid.UUID(int=0).hex),
+            self.make_item("missing-monitor", "not-a-guid"),
+        ]
+
+        with self.assertNumQueries(3):
+            state = CheckinBatchState.load(items)
+
+        assert state.take_monitor(self.project, "my-monitor") == (True, self.monitor)
+        assert state.take_monitor(self.project, "missing-monitor") == (True, None)
+        # Values are only handed out once
+        assert state.take_monitor(self.project, "my-monitor") == (False, None)
+        assert state.take_monitor(self.project, "unknown") == (False, None)
+
+        monitor_environment = state.take_monitor_environment(
+            self.project, self.monitor, "production"
+        )
+        assert monitor_environment == self.monitor_environment
+        assert monitor_environment is not None
+        assert monitor_environment.monitor is self.monitor
+        assert state.take_monitor_environment(self.project, self.monitor, None) is None
+        assert state.take_monitor_environment(self.project, self.monitor, "other") is None
+
+        assert state.take_new_guid(new_guid)
+        assert not state.take_new_guid(new_guid)
+        assert not state.take_new_guid(existing.guid)
+        assert not state.take_new_guid(uuid.UUID(int=0))
+
+    def test_take_monitor_other_organization(self) -> None:
+        state = CheckinBatchState.load([self.make_item("my-monitor", uuid.uuid4().hex)])
+
+        other_project = self.create_project(organization=self.create_organization())
+        # The project id matches, but the organization does not
+        other_project.id = self.project.id
+        assert state.take_monitor(other_project, "my-monitor") == (False, None)
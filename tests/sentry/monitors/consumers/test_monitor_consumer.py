@@ -32,6 +32,7 @@ from sentry.monitors.processing_errors.errors import ProcessingErrorsException,
 from sentry.monitors.types import CheckinItem
 from sentry.testutils.asserts import assert_org_audit_log_exists
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.outbox import outbox_runner
 from sentry.utils import json
 from sentry.utils.outcomes import Outcome
@@ -1203,6 +1204,52 @@ class MonitorConsumerTest(TestCase):
 
         assert try_monitor_clock_tick.call_count == 1
 
+    @override_options({"crons.consumer.prefetch-batch-state": True})
+    def test_parallel_batch_state(self) -> None:
+        factory = StoreMonitorCheckInStrategyFactory(mode="batched-parallel", max_batch_size=4)
+        commit = mock.Mock()
+        consumer = factory.create_with_partitions(commit, {self.partition: 0})
+
+        monitor_1 = self._create_monitor(slug="my-monitor-1")
+        monitor_2 = self._create_monitor(slug="my-monitor-2")
+        now = datetime.now().replace(second=5)
+
+        # An in-progress check-in and its completion in the same batch
+        guid = uuid.uuid4().hex
+        self.send_checkin(
+            monitor_1.slug, guid=guid, status="in_progress", consumer=consumer, ts=now
+        )
+        self.send_checkin(
+            monitor_1.slug, guid=guid, consumer=consumer, ts=now + timedelta(seconds=10)
+        )
+        # A check-in for an environment that does not exist yet
+        self.send_checkin(monitor_2.slug, environment="test", consumer=consumer, ts=now)
+        # A check-in upserting a new monitor
+        self.send_checkin(
+            "my-new-monitor",
+            consumer=consumer,
+            ts=now,
+            monitor_config={"schedule": {"type": "crontab", "value": "* * * * *"}},
+        )
+
+        # One more check-in to process the batch
+        self.send_checkin(monitor_1.slug, consumer=consumer, ts=now + timedelta(minutes=1))
+
+        checkin = MonitorCheckIn.objects.get(guid=guid)
+        assert checkin.status == CheckInStatus.OK
+        assert checkin.date_in_progress == now.replace(tzinfo=UTC)
+        assert MonitorCheckIn.objects.filter(monitor=monitor_1).count() == 1
+
+        env = Environment.objects.get(organization_id=self.organization.id, name="test")
+        monitor_environment = MonitorEnvironment.objects.get(
+            monitor=monitor_2, environment_id=env.id
+        )
+        assert monitor_environment.status == MonitorStatus.OK
+        assert MonitorCheckIn.objects.filter(monitor_environment=monitor_environment).exists()
+
+        new_monitor = Monitor.objects.get(project_id=self.project.id, slug="my-new-monitor")
+        assert MonitorCheckIn.objects.filter(monitor=new_monitor).count() == 1
+
     @mock.patch("sentry.quotas.backend.check_accept_monitor_checkin")
     def test_monitor_quotas_accept(self, check_accept_monitor_checkin):
         check_accept_monitor_checkin.return_value = PermitCheckInStatus.ACCEPT
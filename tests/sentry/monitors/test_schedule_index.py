@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from sentry.monitors.schedule_index import (
+    MONITOR_MISSED_INDEX,
+    MONITOR_TIMEOUT_INDEX,
+    pop_due_missed,
+    pop_due_timeouts,
+    schedule_missed,
+    schedule_missed_many,
+    schedule_timeout,
+    unschedule_missed_many,
+    unschedule_timeout,
+    unschedule_timeout_many,
+    use_schedule_index,
+)
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.utils import redis
+
+redis_client = redis.redis_clusters.get(settings.SENTRY_MONITORS_REDIS_CLUSTER)
+
+
+@django_db_all
+@override_options({"crons.schedule_index.write_enabled": True})
+def test_pop_due_missed():
+    ts = timezone.now().replace(second=0, microsecond=0)
+
+    schedule_missed(1, ts - timedelta(minutes=1))
+    schedule_missed(2, ts)
+    schedule_missed(3, ts + timedelta(minutes=1))
+
+    assert sorted(pop_due_missed(ts)) == [1, 2]
+    assert pop_due_missed(ts) == []
+
+    # Re-scheduling moves the entry instead of adding a second one
+    schedule_missed_many([(3, ts + timedelta(minutes=5)), (4, ts + timedelta(minutes=1))])
+    assert pop_due_missed(ts + timedelta(minutes=1)) == [4]
+    assert pop_due_missed(ts + timedelta(minutes=5)) == [3]
+    assert redis_client.zcard(MONITOR_MISSED_INDEX) == 0
+
+
+@django_db_all
+@override_options({"crons.schedule_index.write_enabled": True})
+def test_pop_due_timeouts():
+    ts = timezone.now().replace(second=0, microsecond=0)
+
+    schedule_timeout(10, ts)
+    schedule_timeout(11, ts)
+    unschedule_timeout(11)
+    schedule_timeout(12, ts + timedelta(minutes=30))
+
+    assert pop_due_timeouts(ts) == [10]
+    assert redis_client.zcard(MONITOR_TIMEOUT_INDEX) == 1
+
+
+@django_db_all
+@override_options({"crons.schedule_index.write_enabled": False})
+def test_schedule_disabled():
+    ts = timezone.now().replace(second=0, microsecond=0)
+
+    schedule_missed(1, ts)
+    schedule_timeout(10, ts)
+
+    assert redis_client.zcard(MONITOR_MISSED_INDEX) == 0
+    assert redis_client.zcard(MONITOR_TIMEOUT_INDEX) == 0
+
+
+@django_db_all
+def test_use_schedule_index():
+    ts = timezone.now().replace(minute=0, second=0, microsecond=0)
+
+    with override_options({"crons.schedule_index.read_enabled": False}):
+        assert not use_schedule_index(ts + timedelta(minutes=1))
+
+    with override_options(
+        {
+            "crons.schedule_index.read_enabled": True,
+            "crons.schedule_index.reconcile_interval": 10,
+        }
+    ):
+        # Every 10th tick reconciles against postgres
+        assert not use_schedule_index(ts)
+        assert use_schedule_index(ts + timedelta(minutes=1))
+        assert use_schedule_index(ts + timedelta(minutes=9))
+        assert not use_schedule_index(ts + timedelta(minutes=10))
+
+
+@django_db_all
+def test_unschedule_many():
+    ts = timezone.now().replace(second=0, microsecond=0)
+
+    with override_options({"crons.schedule_index.write_enabled": True}):
+        schedule_missed_many([(1, ts), (2, ts)])
+        schedule_timeout(10, ts)
+        schedule_timeout(11, ts)
+
+    # Nothing is removed while writes are disabled
+    with override_options({"crons.schedule_index.write_enabled": False}):
+        unschedule_missed_many([1])
+        unschedule_timeout_many([10])
+    assert redis_client.zcard(MONITOR_MISSED_INDEX) == 2
+    assert redis_client.zcard(MONITOR_TIMEOUT_INDEX) == 2
+
+    with override_options({"crons.schedule_index.write_enabled": True}):
+        unschedule_missed_many([1])
+        unschedule_timeout_many([10])
+        assert pop_due_missed(ts) == [2]
+        assert pop_due_timeouts(ts) == [11]
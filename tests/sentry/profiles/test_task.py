@@ -29,6 +29,8 @@ from sentry.profiles.task import (
     _process_symbolicator_results_for_sample,
     _set_frames_platform,
     _symbolicate_profile,
+    get_stack_remapper,
+    get_stack_truncator,
     process_profile_task,
 )
 from sentry.profiles.utils import Profile
@@ -497,6 +499,48 @@ def test_process_symbolicator_results_for_sample_js():
     assert profile["profile"]["stacks"] == [[0, 1, 2, 3]]
 
 
+def test_get_stack_remapper():
+    # Nothing to remap when every frame maps onto itself
+    assert get_stack_remapper({0: [0], 1: [1]}, 2) is None
+
+    # One to one mapping
+    remap = get_stack_remapper({0: [1], 1: [0]}, 3)
+    assert remap is not None
+    assert remap([0, 1, 2]) == [1, 0, 2]
+    # Indices outside of the known frames are kept as they are
+    assert remap([0, 5]) == [1, 5]
+
+    # Inlined frames
+    remap = get_stack_remapper({0: [0, 1], 1: [2], 2: [3, 4, 5]}, 3)
+    assert remap is not None
+    assert remap([0, 1, 2]) == [0, 1, 2, 3, 4, 5]
+    assert remap([2, 0]) == [3, 4, 5, 0, 1]
+    assert remap([2, 7]) == [3, 4, 5, 7]
+
+
+def test_get_stack_truncator():
+    frames: list[dict[str, Any]] = [
+        {"function": "perf_signal_handler"},
+        {"function": "handler"},
+        {"function": "main"},
+        {"function": ""},
+        {"function": "start", "instruction_addr": "0xffffffffc"},
+    ]
+
+    assert get_stack_truncator(frames, "python") is None
+
+    truncate_rust = get_stack_truncator(frames, "rust")
+    assert truncate_rust is not None
+    assert truncate_rust([0, 1, 2, 2, 2]) == [2, 2, 2]
+    assert truncate_rust([0, 1, 2, 3, 4]) == [2]
+    assert truncate_rust([2, 2]) == [2, 2]
+
+    truncate_cocoa = get_stack_truncator(frames, "cocoa")
+    assert truncate_cocoa is not None
+    assert truncate_cocoa([1, 2, 3, 4]) == [1, 2]
+    assert truncate_cocoa([1, 2]) == [1, 2]
+
+
 @django_db_all
 def test_decode_signature(project, android_profile):
     android_profile.update(
@@ -20,7 +20,13 @@ from sentry.dynamic_sampling.rules.base import NEW_MODEL_THRESHOLD_IN_MINUTES
 from sentry.models.projectkey import ProjectKey
 from sentry.models.projectteam import ProjectTeam
 from sentry.models.transaction_threshold import TransactionMetric
-from sentry.relay.config import ProjectConfig, TransactionNameRule, get_project_config
+from sentry.relay.config import (
+    CONFIG_SECTIONS,
+    ProjectConfig,
+    TransactionNameRule,
+    get_project_config,
+    recompute_project_config_sections,
+)
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.factories import Factories
 from sentry.testutils.helpers import Feature
@@ -28,6 +34,7 @@ from sentry.testutils.helpers.datetime import freeze_time
 from sentry.testutils.helpers.options import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.testutils.silo import region_silo_test
+from sentry.utils import json
 from sentry.utils.safe import get_path
 
 PII_CONFIG = """
@@ -1252,3 +1259,33 @@ def test_project_config_with_transaction_name_clustering_disabled(
         config = get_project_config(default_project).to_dict()
         _validate_project_config(config["config"])
         assert "txNameRules" not in config["config"]
+
+
+@django_db_all
+@region_silo_test
+def test_recompute_project_config_sections(default_project):
+    keys = ProjectKey.objects.filter(project=default_project)
+    with Feature({"organizations:transaction-metrics-extraction": True}):
+        cached = json.loads(json.dumps(get_project_config(default_project, keys).to_dict()))
+
+        # A config round-tripped through the cache has the same fingerprints
+        assert (
+            recompute_project_config_sections(cached, default_project, CONFIG_SECTIONS, keys)
+            is None
+        )
+
+        cached["config"]["transactionMetrics"] = {"version": 0}
+        cached["config"]["sampling"] = {"version": 2, "rules": []}
+        with Feature({"organizations:dynamic-sampling": True}):
+            config = recompute_project_config_sections(
+                cached, default_project, ["metricExtraction"], keys
+            )
+
+    assert config is not None
+    assert config["rev"] != cached["rev"]
+    assert config["config"]["transactionMetrics"]["version"] != 0
+    # Other sections are left as they were
+    assert config["config"]["sampling"] == {"version": 2, "rules": []}
+    assert {
+        key: value for key, value in config["config"].items() if key != "transactionMetrics"
+    } == {key: value for key, value in cached["config"].items() if key != "transactionMetrics"}
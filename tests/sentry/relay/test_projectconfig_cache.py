@@ -2,7 +2,7 @@ from unittest import mock
 
 from sentry.relay.projectconfig_cache import redis
 from sentry.testutils.pytest.fixtures import django_db_all
-from sentry.utils import metrics
+from sentry.utils import json, metrics
 
 
 def test_delete_count(monkeypatch):
@@ -34,3 +34,49 @@ def test_read_write():
 
     assert cache.get_rev(dsn1) == "my_rev_123"
     assert cache.get_rev(dsn2) is None
+
+
+@django_db_all
+def test_get_many():
+    cache = redis.RedisProjectConfigCache()
+    cache.set_many({"fake-dsn-1": {"my-value": "foo"}, "fake-dsn-2": {"my-value": "bar"}})
+
+    assert cache.get_many(["fake-dsn-1", "fake-dsn-2", "fake-dsn-3"]) == {
+        "fake-dsn-1": {"my-value": "foo"},
+        "fake-dsn-2": {"my-value": "bar"},
+        "fake-dsn-3": None,
+    }
+    assert cache.get_many([]) == {}
+
+
+def test_config_serializer():
+    profiles = [{"name": "Chrome", "scoreComponents": [{"measurement": "lcp", "weight": 0.3}]}]
+    serializer = redis._ConfigSerializer()
+    configs = [
+        {
+            "disabled": False,
+            "rev": str(i),
+            "config": {"performanceScore": {"profiles": profiles}, "allowedDomains": ["*"]},
+        }
+        for i in range(3)
+    ]
+    shared = {"profiles": profiles}
+    for config in configs:
+        config["config"]["performanceScore"] = shared
+
+    for config in [*configs, {"disabled": True}, {"config": None}]:
+        assert serializer.serialize(config) == json.dumps(config)
+    assert serializer.reused == 2
+
+
+@django_db_all
+def test_read_write_compression_level():
+    cache = redis.RedisProjectConfigCache(compression_level=19)
+    shared = {"profiles": [{"name": "Chrome"}]}
+    configs = {
+        f"fake-dsn-{i}": {"rev": f"rev-{i}", "config": {"performanceScore": shared}}
+        for i in range(3)
+    }
+    cache.set_many(configs)
+
+    assert cache.get_many(list(configs)) == configs
@@ -2,13 +2,16 @@ import datetime
 import uuid
 import zlib
 from collections import namedtuple
+from unittest import mock
 
 from django.urls import reverse
 
 from sentry.replays.lib.storage import FilestoreBlob, RecordingSegmentStorageMeta, StorageBlob
 from sentry.replays.testutils import mock_replay
 from sentry.replays.usecases.pack import pack
+from sentry.replays.usecases.reader import segment_cache
 from sentry.testutils.cases import APITestCase, ReplaysSnubaTestCase, TransactionTestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.helpers.response import close_streaming_response
 
 Message = namedtuple("Message", ["project_id", "replay_id"])
@@ -114,6 +117,39 @@ class FilestoreProjectReplayRecordingSegmentIndexTestCase(TransactionTestCase):
         assert response.get("Content-Type") == "application/json"
         assert b'[[{"test":"hello 0"}],[{"test":"hello 1"}]]' == close_streaming_response(response)
 
+    @override_options(
+        {
+            "replay.storage.download-read-ahead": 2,
+            "replay.storage.download-cache-size": 1_000_000,
+        }
+    )
+    def test_index_download_read_ahead_cached(self):
+        """Test segments are streamed in order with fewer workers than segments."""
+        for i in range(0, 7):
+            self.save_recording_segment(i, f'[{{"test":"hello {i}"}}]'.encode())
+
+        expected = b"[" + b",".join(f'[{{"test":"hello {i}"}}]'.encode() for i in range(7)) + b"]"
+
+        try:
+            with self.feature("organizations:session-replay"):
+                response = self.client.get(self.url + "?download=true")
+            assert response.status_code == 200
+            assert close_streaming_response(response) == expected
+
+            # The second download is served from the segment cache.
+            with (
+                self.feature("organizations:session-replay"),
+                mock.patch.object(FilestoreBlob, "get") as filestore_get,
+                mock.patch.object(StorageBlob, "get") as storage_get,
+            ):
+                response = self.client.get(self.url + "?download=true")
+            assert response.status_code == 200
+            assert close_streaming_response(response) == expected
+            assert filestore_get.call_count == 0
+            assert storage_get.call_count == 0
+        finally:
+            segment_cache.clear()
+
 
 class StorageProjectReplayRecordingSegmentIndexTestCase(
     FilestoreProjectReplayRecordingSegmentIndexTestCase, APITestCase, ReplaysSnubaTestCase
@@ -1,9 +1,12 @@
+from unittest import mock
+
 import pytest
 
 from sentry.replays.usecases.ingest.event_parser import (
     EventType,
     _get_testid,
     _parse_classes,
+    load_events,
     parse_highlighted_events,
     which,
 )
@@ -737,3 +740,22 @@ def test_which():
 def test_parse_highlighted_events_fault_tolerance(event):
     # If the test raises an exception we fail. All of these events are invalid.
     parse_highlighted_events([event], True)
+
+
+def test_load_events():
+    payload = b'[{"type":5,"timestamp":1,"data":{"tag":"breadcrumb"}},{"type":2,"data":{}}]'
+    assert load_events(payload) == json.loads(payload)
+
+    # orjson does not decode integers larger than 64 bits, the default decoder does.
+    payload = b'[{"type":5,"timestamp":123456789012345678901234567890}]'
+    assert load_events(payload) == [{"type": 5, "timestamp": 123456789012345678901234567890}]
+
+
+def test_parse_highlighted_events_unsampled_canvas_not_measured():
+    events = [{"type": 3, "data": {"source": 9, "id": 2440, "type": 0, "commands": []}}]
+
+    with mock.patch("sentry.replays.usecases.ingest.event_parser.json.dumps") as dumps:
+        result = parse_highlighted_events(events, sampled=False)
+
+    assert result.canvas_sizes == []
+    assert dumps.call_count == 0
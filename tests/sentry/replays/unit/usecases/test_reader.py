@@ -0,0 +1,70 @@
+import threading
+import zlib
+from unittest import mock
+
+from sentry.replays.lib.storage import RecordingSegmentStorageMeta
+from sentry.replays.usecases.reader import SegmentCache, iter_segment_data
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+
+
+def test_segment_cache_evicts_least_recently_used():
+    cache = SegmentCache()
+    cache.set("a", b"1" * 4, max_size=10)
+    cache.set("b", b"2" * 4, max_size=10)
+    assert cache.get("a") == b"1" * 4
+
+    # "b" was used least recently and is evicted to fit "c".
+    cache.set("c", b"3" * 4, max_size=10)
+    assert cache.get("a") == b"1" * 4
+    assert cache.get("b") is None
+    assert cache.get("c") == b"3" * 4
+
+    # Blobs larger than the cache are not stored.
+    cache.set("d", b"4" * 11, max_size=10)
+    assert cache.get("d") is None
+    assert cache.get("a") == b"1" * 4
+
+
+@django_db_all
+@override_options(
+    {"replay.storage.download-read-ahead": 3, "replay.storage.download-cache-size": 0}
+)
+def test_iter_segment_data_in_order():
+    segments = [
+        RecordingSegmentStorageMeta(
+            project_id=1, replay_id="a" * 32, segment_id=i, retention_days=30
+        )
+        for i in range(10)
+    ]
+
+    first_segment_released = threading.Event()
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def get(segment):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+
+        # Later segments complete before the first one.
+        if segment.segment_id == 0:
+            first_segment_released.wait(timeout=5)
+        elif segment.segment_id == 2:
+            first_segment_released.set()
+
+        with lock:
+            in_flight -= 1
+
+        if segment.segment_id == 5:
+            return None
+        return zlib.compress(f'[{{"segment":{segment.segment_id}}}]'.encode())
+
+    with mock.patch("sentry.replays.usecases.reader.storage") as storage:
+        storage.get.side_effect = get
+        results = [(i, bytes(data)) for i, data in iter_segment_data(segments)]
+
+    assert results == [(i, b"[]" if i == 5 else f'[{{"segment":{i}}}]'.encode()) for i in range(10)]
+    assert max_in_flight <= 3
@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from sentry.search.snuba.query_state import (
+    SearchQueryState,
+    build_query_state_key,
+    get_query_state,
+    set_query_state,
+)
+from sentry.testutils.cases import TestCase
+
+
+class SearchQueryStateTest(TestCase):
+    def build_state(self, **kwargs):
+        now = timezone.now().replace(microsecond=0)
+        return SearchQueryState(
+            **{
+                "start": now - timedelta(days=14),
+                "end": now,
+                "group_ids": [1005, 3, 1001, 1002],
+                "too_many_candidates": False,
+                "result_groups": [(1001, 50), (3, 20)],
+                "offset": 2,
+                "more_results": True,
+                "hits": 4,
+                **kwargs,
+            }
+        )
+
+    def test_round_trip(self):
+        state = self.build_state()
+        result = SearchQueryState.from_bytes(state.to_bytes())
+        assert result.start == state.start
+        assert result.end == state.end
+        assert result.group_ids == [3, 1001, 1002, 1005]
+        assert result.result_groups == state.result_groups
+        assert result.offset == 2
+        assert result.more_results
+        assert result.hits == 4
+
+    def test_round_trip_too_many_candidates(self):
+        state = self.build_state(group_ids=[], too_many_candidates=True, hits=None)
+        result = SearchQueryState.from_bytes(state.to_bytes())
+        assert result.group_ids == []
+        assert result.too_many_candidates
+        assert result.hits is None
+
+    def test_get_set(self):
+        key = build_query_state_key(1, [2], None, "date", [], None, None, None, None)
+        assert get_query_state(key) is None
+        with self.options({"snuba.search.query-state.ttl": 60}):
+            set_query_state(key, self.build_state())
+        state = get_query_state(key)
+        assert state is not None
+        assert state.result_groups == [(1001, 50), (3, 20)]
+
+    def test_key_ignores_project_order(self):
+        assert build_query_state_key(
+            1, [2, 3], [4], "date", [], None, None, 5, None
+        ) == build_query_state_key(1, [3, 2], [4], "date", [], None, None, 5, None)
+
+    def test_key_includes_query_parameters(self):
+        base = build_query_state_key(1, [2], None, "date", [], None, None, None, None)
+        assert base != build_query_state_key(1, [2], None, "freq", [], None, None, None, None)
+        assert base != build_query_state_key(1, [2], [3], "date", [], None, None, None, None)
+        assert base != build_query_state_key(1, [2], None, "date", [], None, None, 4, None)
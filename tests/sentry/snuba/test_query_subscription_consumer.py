@@ -16,7 +16,9 @@ from sentry.snuba.dataset import Dataset
 from sentry.snuba.models import SnubaQuery
 from sentry.snuba.query_subscriptions.consumer import (
     InvalidSchemaError,
+    batch_subscriber_registry,
     parse_message_value,
+    register_batch_subscriber,
     register_subscriber,
     subscriber_registry,
 )
@@ -138,6 +140,70 @@ class HandleMessageTest(BaseQuerySubscriptionTest, TestCase):
         )
         mock_callback.assert_called_once_with(data["payload"], sub)
 
+    def test_arroyo_consumer_batched(self):
+        topic_defn = get_topic_definition(Topic.EVENTS)
+        create_topics(topic_defn["cluster"], [topic_defn["real_topic_name"]])
+
+        registration_key = "registered_test_batched"
+        mock_callback = mock.Mock()
+        mock_batch_callback = mock.Mock()
+        register_subscriber(registration_key)(mock_callback)
+        register_batch_subscriber(registration_key)(mock_batch_callback)
+        with self.tasks():
+            snuba_query = create_snuba_query(
+                SnubaQuery.Type.ERROR,
+                Dataset.Events,
+                "hello",
+                "count()",
+                timedelta(minutes=10),
+                timedelta(minutes=1),
+                None,
+            )
+            sub = create_snuba_subscription(self.project, registration_key, snuba_query)
+        sub.refresh_from_db()
+
+        data = self.valid_wrapper
+        data["payload"]["subscription_id"] = sub.subscription_id
+        commit = mock.Mock()
+        partition = Partition(ArroyoTopic("test"), 0)
+        strategy = QuerySubscriptionStrategyFactory(
+            self.dataset.value,
+            2,
+            1,
+            1,
+            DEFAULT_BLOCK_SIZE,
+            DEFAULT_BLOCK_SIZE,
+            multi_proc=False,
+            mode="batched",
+        ).create_with_partitions(commit, {partition: 0})
+        message = self.build_mock_message(data, topic=self.topic)
+
+        for offset in (1, 2):
+            strategy.submit(
+                Message(
+                    BrokerValue(
+                        KafkaPayload(b"key", message.value().encode("utf-8"), []),
+                        partition,
+                        offset,
+                        datetime.now(),
+                    )
+                )
+            )
+        strategy.poll()
+        strategy.join()
+
+        data = deepcopy(data)
+        data["payload"]["values"] = data["payload"]["result"]
+        data["payload"].pop("result")
+        data["payload"].pop("request")
+        data["payload"]["timestamp"] = datetime.fromisoformat(data["payload"]["timestamp"]).replace(
+            tzinfo=timezone.utc
+        )
+        mock_batch_callback.assert_called_once_with(
+            [(data["payload"], sub), (data["payload"], sub)]
+        )
+        assert not mock_callback.called
+
 
 class ParseMessageValueTest(BaseQuerySubscriptionTest, unittest.TestCase):
     def run_test(self, message):
@@ -210,3 +276,24 @@ class RegisterSubscriberTest(unittest.TestCase):
         with pytest.raises(Exception) as excinfo:
             register_subscriber("hello")(other_callback)
         assert str(excinfo.value) == "Handler already registered for hello"
+
+
+class RegisterBatchSubscriberTest(unittest.TestCase):
+    def setUp(self):
+        self.orig_registry = deepcopy(batch_subscriber_registry)
+
+    def tearDown(self):
+        batch_subscriber_registry.clear()
+        batch_subscriber_registry.update(self.orig_registry)
+
+    def test_register(self):
+        callback = lambda updates: None
+        register_batch_subscriber("hello")(callback)
+        assert batch_subscriber_registry["hello"] is callback
+
+    def test_already_registered(self):
+        callback = lambda updates: None
+        register_batch_subscriber("hello")(callback)
+        with pytest.raises(Exception) as excinfo:
+            register_batch_subscriber("hello")(callback)
+        assert str(excinfo.value) == "Batch handler already registered for hello"
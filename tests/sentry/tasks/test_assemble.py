@@ -19,6 +19,7 @@ from sentry.models.artifactbundle import (
 from sentry.models.debugfile import ProjectDebugFile
 from sentry.models.files.file import File
 from sentry.models.files.fileblob import FileBlob
+from sentry.models.files.fileblobindex import FileBlobIndex
 from sentry.models.files.fileblobowner import FileBlobOwner
 from sentry.tasks.assemble import (
     ArtifactBundlePostAssembler,
@@ -183,6 +184,55 @@ class AssembleDifTest(BaseAssembleTest):
         assert f.checksum == file_checksum.hexdigest()
         assert f.type == "dummy.type"
 
+    def test_assemble_read_ahead(self):
+        blobs = [os.urandom(1024 * 64 + i) for i in range(5)]
+        files = [(io.BytesIO(blob), sha1(blob).hexdigest()) for blob in blobs]
+        # The first blob is repeated at the end of the file
+        chunks = [checksum for _, checksum in files] + [files[0][1]]
+        contents = b"".join(blobs) + blobs[0]
+
+        FileBlob.from_files(files, organization=self.organization)
+
+        with self.options({"filestore.assemble-read-ahead": 2}):
+            rv = assemble_file(
+                AssembleTask.DIF,
+                self.project,
+                "testfile",
+                sha1(contents).hexdigest(),
+                chunks,
+                "dummy.type",
+            )
+
+        assert rv is not None
+        f, tmp = rv
+        assert tmp.read() == contents
+        tmp.close()
+
+        assert f.size == len(contents)
+        chunk_sizes = [len(blob) for blob in blobs] + [len(blobs[0])]
+        assert [idx.offset for idx in f._blob_index_records()] == [
+            sum(chunk_sizes[:i]) for i in range(len(chunk_sizes))
+        ]
+        with f.getfile() as fp:
+            assert fp.read() == contents
+
+    def test_assemble_checksum_mismatch_creates_no_indexes(self):
+        blob = os.urandom(1024)
+        FileBlob.from_files([(io.BytesIO(blob), sha1(blob).hexdigest())], self.organization)
+
+        rv = assemble_file(
+            AssembleTask.DIF,
+            self.project,
+            "testfile",
+            "a" * 40,
+            [sha1(blob).hexdigest()],
+            "dummy.type",
+        )
+
+        assert rv is None
+        assert not File.objects.filter(name="testfile").exists()
+        assert not FileBlobIndex.objects.exists()
+
     def test_assemble_debug_id_override(self):
         sym_file = self.load_fixture("crash.sym")
         blob1 = FileBlob.from_file_with_organization(ContentFile(sym_file), self.organization)
@@ -560,6 +610,44 @@ class AssembleArtifactsTest(BaseAssembleTest):
         project_artifact_bundle = ProjectArtifactBundle.objects.filter(project_id=self.project.id)
         assert len(project_artifact_bundle) == 1
 
+    def test_upload_same_bundle_id_to_more_projects(self):
+        bundle_file = self.create_artifact_bundle_zip(
+            fixture_path="artifact_bundle_debug_ids", project=self.project.id
+        )
+        blob1 = FileBlob.from_file_with_organization(ContentFile(bundle_file), self.organization)
+        total_checksum = sha1(bundle_file).hexdigest()
+        other_project = self.create_project(organization=self.organization)
+
+        for time, project_ids in (
+            ("2023-05-31T10:00:00", [self.project.id]),
+            ("2023-05-31T11:00:00", [self.project.id, other_project.id, other_project.id]),
+        ):
+            with freeze_time(time):
+                assemble_artifacts(
+                    org_id=self.organization.id,
+                    project_ids=project_ids,
+                    version="1.0",
+                    dist="android",
+                    checksum=total_checksum,
+                    chunks=[blob1.checksum],
+                )
+
+        expected_updated_date = datetime.fromisoformat("2023-05-31T11:00:00+00:00")
+
+        project_artifact_bundles = ProjectArtifactBundle.objects.filter(
+            organization_id=self.organization.id
+        )
+        assert sorted(pab.project_id for pab in project_artifact_bundles) == sorted(
+            [self.project.id, other_project.id]
+        )
+        assert {pab.date_added for pab in project_artifact_bundles} == {expected_updated_date}
+
+        debug_id_artifact_bundles = DebugIdArtifactBundle.objects.filter(
+            organization_id=self.organization.id
+        )
+        assert len(debug_id_artifact_bundles) == 2
+        assert {dab.date_added for dab in debug_id_artifact_bundles} == {expected_updated_date}
+
     def test_upload_multiple_artifacts_with_existing_bundle_id_duplicate(
         self,
     ):
@@ -569,7 +657,7 @@ class AssembleArtifactsTest(BaseAssembleTest):
         blob1 = FileBlob.from_file_with_organization(ContentFile(bundle_file), self.organization)
         total_checksum = sha1(bundle_file).hexdigest()
         bundle_id = "67429b2f-1d9e-43bb-a626-771a1e37555c"
-        # debug_id = "eb6e60f1-65ff-4f6f-adff-f1bbeded627b"
+        debug_id = "eb6e60f1-65ff-4f6f-adff-f1bbeded627b"
 
         # We simulate the existence of a two ArtifactBundles already with the same bundle_id.
         ArtifactBundle.objects.create(
@@ -600,11 +688,10 @@ class AssembleArtifactsTest(BaseAssembleTest):
         files = File.objects.filter()
         assert len(files) == 1
 
-        # FIXME(swatinem): The test assumed that we re-index debug-ids in case the bundle was already
-        # in the database.
-        # debug_id_artifact_bundles = DebugIdArtifactBundle.objects.filter(debug_id=debug_id)
+        # The debug ids missing for the existing bundle are indexed.
+        debug_id_artifact_bundles = DebugIdArtifactBundle.objects.filter(debug_id=debug_id)
         # We have two entries, since we have multiple files in the artifact bundle.
-        # assert len(debug_id_artifact_bundles) == 2
+        assert len(debug_id_artifact_bundles) == 2
 
         project_artifact_bundle = ProjectArtifactBundle.objects.filter(project_id=self.project.id)
         assert len(project_artifact_bundle) == 1
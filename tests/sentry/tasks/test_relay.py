@@ -13,10 +13,13 @@ from sentry.relay.projectconfig_debounce_cache.redis import RedisProjectConfigDe
 from sentry.tasks.relay import (
     _schedule_invalidate_project_config,
     build_project_config,
+    compute_projectkey_config,
     invalidate_project_config,
+    iter_organization_configs,
     schedule_build_project_config,
     schedule_invalidate_project_config,
 )
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.helpers.task_runner import BurstTaskRunner
 from sentry.testutils.hybrid_cloud import simulated_transaction_watermarks
 from sentry.testutils.pytest.fixtures import django_db_all
@@ -460,6 +463,142 @@ class TestInvalidationTask:
             assert new_cfg is not None
             assert new_cfg != cfg
 
+    def test_invalidate_org_chunks(
+        self,
+        monkeypatch,
+        default_project,
+        default_organization,
+        default_projectkey,
+        redis_cache,
+        task_runner,
+        django_cache,
+        factories,
+    ):
+        other_project = factories.create_project(organization=default_organization)
+        other_key = ProjectKey.objects.get(project=other_project)
+        not_cached_project = factories.create_project(organization=default_organization)
+
+        cfg = {"dummy-key": "val"}
+        redis_cache.set_many({default_projectkey.public_key: cfg, other_key.public_key: cfg})
+        redis_cache.delete_many(list(_cache_keys_for_project(not_cached_project)))
+
+        monkeypatch.setattr("sentry.tasks.relay.ORGANIZATION_CONFIGS_CHUNK_SIZE", 1)
+        with mock.patch(
+            "sentry.quotas.backend.get_event_retention", return_value=90
+        ) as get_event_retention:
+            chunks = list(iter_organization_configs(default_organization.id))
+
+        # Organization-level data is only looked up once
+        assert get_event_retention.call_count == 1
+        assert len(chunks) == 3
+        configs = {}
+        for chunk in chunks:
+            configs.update(chunk)
+        assert set(configs) == {default_projectkey.public_key, other_key.public_key}
+        assert configs[other_key.public_key]["projectId"] == other_project.id
+        assert configs[other_key.public_key]["config"]["eventRetention"] == 90
+
+        with task_runner():
+            schedule_invalidate_project_config(
+                organization_id=default_organization.id, trigger="test"
+            )
+
+        for public_key in (default_projectkey.public_key, other_key.public_key):
+            assert redis_cache.get(public_key)["disabled"] is False
+        for public_key in _cache_keys_for_project(not_cached_project):
+            assert redis_cache.get(public_key) is None
+
+    @override_options({"relay.project-config.section-invalidation.enabled": True})
+    def test_invalidate_sections(
+        self,
+        default_project,
+        default_projectkey,
+        redis_cache,
+        task_runner,
+        django_cache,
+    ):
+        cfg = compute_projectkey_config(default_projectkey)
+        cfg["rev"] = "cached"
+        cfg["config"]["dummy-key"] = "val"
+        cfg["config"]["sampling"] = {"version": 2, "rules": "stale"}
+        redis_cache.set_many({default_projectkey.public_key: cfg})
+
+        with task_runner():
+            schedule_invalidate_project_config(
+                project_id=default_project.id, trigger="dynamic_sampling:custom_rule_upsert"
+            )
+
+        new_cfg = redis_cache.get(default_projectkey.public_key)
+        # Only the sampling section was recomputed
+        assert new_cfg["rev"] != "cached"
+        assert new_cfg["config"]["dummy-key"] == "val"
+        assert new_cfg["config"].get("sampling") != {"version": 2, "rules": "stale"}
+
+        with task_runner():
+            schedule_invalidate_project_config(
+                project_id=default_project.id, trigger="dynamic_sampling:custom_rule_upsert"
+            )
+
+        # Nothing changed, so the cached config was kept
+        assert redis_cache.get(default_projectkey.public_key)["rev"] == new_cfg["rev"]
+
+        with task_runner():
+            schedule_invalidate_project_config(project_id=default_project.id, trigger="test")
+
+        assert "dummy-key" not in redis_cache.get(default_projectkey.public_key)["config"]
+
+    @override_options({"relay.project-config.section-invalidation.enabled": True})
+    def test_debounce_sections(
+        self,
+        monkeypatch,
+        default_project,
+        invalidation_debounce_cache,
+        django_cache,
+    ):
+        tasks = []
+
+        def apply_async(args=None, kwargs=None, countdown=None):
+            tasks.append(kwargs)
+
+        monkeypatch.setattr("sentry.tasks.relay.invalidate_project_config.apply_async", apply_async)
+
+        sampling_debounce_cache = RedisProjectConfigDebounceCache(
+            key_prefix="relayconfig-section-invalidation-dedup:sampling"
+        )
+        monkeypatch.setattr(
+            "sentry.relay.projectconfig_debounce_cache.get_section_invalidation",
+            lambda section: sampling_debounce_cache,
+        )
+
+        for debounce_cache in (invalidation_debounce_cache, sampling_debounce_cache):
+            debounce_cache.mark_task_done(
+                public_key=None, project_id=default_project.id, organization_id=None
+            )
+        trigger = "dynamic_sampling:custom_rule_upsert"
+        schedule_invalidate_project_config(project_id=default_project.id, trigger=trigger)
+        schedule_invalidate_project_config(project_id=default_project.id, trigger=trigger)
+        # A pending invalidation of a section doesn't prevent a full one
+        schedule_invalidate_project_config(project_id=default_project.id, trigger="test")
+        # But a pending full invalidation covers all sections
+        schedule_invalidate_project_config(
+            project_id=default_project.id, trigger="alerts:create-on-demand-metric"
+        )
+
+        assert [(task["trigger"], task.get("sections")) for task in tasks] == [
+            (trigger, ["sampling"]),
+            ("test", None),
+        ]
+
+        for task in tasks:
+            invalidate_project_config(**task)
+
+        assert not sampling_debounce_cache.is_debounced(
+            public_key=None, project_id=default_project.id, organization_id=None
+        )
+        assert not invalidation_debounce_cache.is_debounced(
+            public_key=None, project_id=default_project.id, organization_id=None
+        )
+
     @mock.patch(
         "sentry.tasks.relay._schedule_invalidate_project_config",
         wraps=_schedule_invalidate_project_config,
@@ -124,7 +124,7 @@ def test_schedulerunner_tick_one_task_spawned(
     run_storage.read_many.return_value = {
         "test:valid": datetime(2025, 1, 24, 14, 19, 55),
     }
-    run_storage.set.return_value = True
+    run_storage.set_many.return_value = {"test:valid": True}
 
     namespace = taskregistry.get("test")
     with freeze_time("2025-01-24 14:25:00"), patch.object(namespace, "send_task") as mock_send:
@@ -132,9 +132,11 @@ def test_schedulerunner_tick_one_task_spawned(
         assert sleep_time == 300
         assert mock_send.call_count == 1
 
-    assert run_storage.set.call_count == 1
-    # set() is called with the correct next_run time
-    run_storage.set.assert_called_with("test:valid", datetime(2025, 1, 24, 14, 30, 0, tzinfo=UTC))
+    assert run_storage.set_many.call_count == 1
+    # set_many() is called with the correct next_run time
+    run_storage.set_many.assert_called_with(
+        {"test:valid": datetime(2025, 1, 24, 14, 30, 0, tzinfo=UTC)}
+    )
 
 
 @pytest.mark.django_db
@@ -156,7 +158,7 @@ def test_schedulerunner_tick_create_checkin(
     run_storage.read_many.return_value = {
         "test:valid": datetime(2025, 1, 24, 14, 19, 55),
     }
-    run_storage.set.return_value = True
+    run_storage.set_many.return_value = {"test:valid": True}
     mock_capture_checkin.return_value = "checkin-id"
 
     namespace = taskregistry.get("test")
@@ -398,5 +400,63 @@ def test_schedulerunner_tick_fast_and_slow(
         ]
 
 
+@pytest.mark.django_db
+def test_schedulerunner_tick_batches_storage(
+    taskregistry: TaskRegistry, run_storage: RunStorage
+) -> None:
+    run_storage = Mock(spec=RunStorage)
+    schedule_set = ScheduleRunner(registry=taskregistry, run_storage=run_storage)
+    schedule_set.add("valid", {"task": "test:valid", "schedule": timedelta(minutes=5)})
+    schedule_set.add("second", {"task": "test:second", "schedule": crontab(minute="*/2")})
+
+    # Neither task has run, but another scheduler spawns test:second first
+    run_storage.read_many.side_effect = [
+        {},
+        {"test:second": datetime(2025, 1, 24, 14, 24, 0, tzinfo=UTC)},
+    ]
+    run_storage.set_many.return_value = {"test:valid": True, "test:second": False}
+
+    namespace = taskregistry.get("test")
+    with patch.object(namespace, "send_task") as mock_send:
+        with freeze_time("2025-01-24 14:25:00"):
+            sleep_time = schedule_set.tick()
+            assert sleep_time == 60
+
+        assert extract_sent_tasks(mock_send) == ["valid"]
+        run_storage.set_many.assert_called_once_with(
+            {
+                "test:second": datetime(2025, 1, 24, 14, 26, 0, tzinfo=UTC),
+                "test:valid": datetime(2025, 1, 24, 14, 30, 0, tzinfo=UTC),
+            }
+        )
+        # Only the entry we lost is synchronized with storage
+        run_storage.read_many.assert_called_with(["test:second"])
+
+        # Nothing is due, so storage is not touched
+        run_storage.reset_mock()
+        with freeze_time("2025-01-24 14:25:30"):
+            sleep_time = schedule_set.tick()
+            assert sleep_time == 30
+
+        assert run_storage.set_many.call_count == 0
+        assert run_storage.read_many.call_count == 0
+        assert run_storage.read.call_count == 0
+
+
+@pytest.mark.django_db
+def test_runstorage_set_many(run_storage: RunStorage) -> None:
+    with freeze_time("2025-01-24 14:25:00"):
+        assert run_storage.set("test:valid", timezone.now() + timedelta(minutes=2))
+
+        result = run_storage.set_many(
+            {
+                "test:valid": timezone.now() + timedelta(minutes=5),
+                "test:second": timezone.now() + timedelta(minutes=5),
+            }
+        )
+    assert result == {"test:valid": False, "test:second": True}
+    assert run_storage.read("test:second") == datetime(2025, 1, 24, 14, 25, 0, tzinfo=UTC)
+
+
 def extract_sent_tasks(mock: Mock) -> list[str]:
     return [call[0][0].taskname for call in mock.call_args_list]
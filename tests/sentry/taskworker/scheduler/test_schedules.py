@@ -66,6 +66,18 @@ def test_timedeltaschedule_remaining_seconds() -> None:
     assert schedule.remaining_seconds(ten_min_ago) == 0
 
 
+@freeze_time("2025-01-24 14:25:00")
+def test_timedeltaschedule_next_runtime() -> None:
+    schedule = TimedeltaSchedule(timedelta(minutes=5))
+
+    now = timezone.now()
+    assert schedule.next_runtime(None) == now
+    assert schedule.next_runtime(now) == datetime(2025, 1, 24, 14, 30, 0, tzinfo=UTC)
+
+    ten_min_ago = now - timedelta(minutes=10)
+    assert schedule.next_runtime(ten_min_ago) == datetime(2025, 1, 24, 14, 20, 0, tzinfo=UTC)
+
+
 def test_crontabschedule_invalid() -> None:
     with pytest.raises(ValueError):
         CrontabSchedule("test", crontab(hour="99"))
@@ -176,6 +188,27 @@ def test_crontabschedule_runtime_after() -> None:
     assert schedule.runtime_after(now) == datetime(2025, 1, 24, 14, 26, 0, tzinfo=UTC)
 
 
+def test_crontabschedule_next_runtime() -> None:
+    schedule = CrontabSchedule("test", crontab(minute="*/5"))
+
+    with freeze_time("2025-01-24 14:25:10"):
+        now = timezone.now()
+        assert schedule.next_runtime(None) == now
+        # On the beat, the next interval is in 5 minutes
+        assert schedule.next_runtime(now) == datetime(2025, 1, 24, 14, 30, 0, tzinfo=UTC)
+
+        # Due now
+        five_min_ago = now - timedelta(minutes=5)
+        assert schedule.next_runtime(five_min_ago) == datetime(2025, 1, 24, 14, 25, 0, tzinfo=UTC)
+
+    # Missed intervals align to the next beat
+    with freeze_time("2025-01-24 14:23:00"):
+        twenty_two_min_ago = timezone.now() - timedelta(minutes=22)
+        assert schedule.next_runtime(twenty_two_min_ago) == datetime(
+            2025, 1, 24, 14, 25, 0, tzinfo=UTC
+        )
+
+
 def test_crontabschedule_monitor_value() -> None:
     schedule = CrontabSchedule("test", crontab(minute="*/5"))
     assert schedule.monitor_value() == "*/5 * * * *"
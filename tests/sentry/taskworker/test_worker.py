@@ -182,6 +182,165 @@ class TestTaskWorker(TestCase):
             mock_get.assert_called_once()
         assert task is None
 
+    def test_fetch_tasks_batch(self) -> None:
+        taskworker = TaskWorker(
+            rpc_host="127.0.0.1:50051",
+            num_brokers=1,
+            max_child_task_count=100,
+            process_type="fork",
+            fetch_batch_size=4,
+        )
+
+        err = grpc.RpcError("get task failed")
+        setattr(err, "code", lambda: grpc.StatusCode.UNAVAILABLE)
+
+        with mock.patch.object(taskworker.client, "get_task") as mock_get:
+            # The calls run concurrently, so each one takes the next response in any order
+            mock_get.side_effect = [SIMPLE_TASK, err, None, RETRY_TASK]
+            tasks = taskworker.fetch_tasks(4)
+
+            assert mock_get.call_count == 4
+        assert sorted(task.activation.id for task in tasks) == sorted(
+            [SIMPLE_TASK.activation.id, RETRY_TASK.activation.id]
+        )
+        assert taskworker._gettask_backoff_seconds == 0
+
+        with mock.patch.object(taskworker.client, "get_task") as mock_get:
+            mock_get.return_value = None
+            assert taskworker.fetch_tasks(4) == []
+        assert taskworker._gettask_backoff_seconds == 1
+
+    def test_add_task_batch(self) -> None:
+        taskworker = TaskWorker(
+            rpc_host="127.0.0.1:50051",
+            num_brokers=1,
+            max_child_task_count=100,
+            process_type="fork",
+            fetch_batch_size=3,
+        )
+        with mock.patch.object(taskworker.client, "get_task") as mock_get:
+            mock_get.return_value = SIMPLE_TASK
+            assert taskworker._add_task()
+            assert mock_get.call_count == 3
+
+        for _ in range(3):
+            task = taskworker._child_tasks.get(timeout=1)
+            assert task.activation.id == SIMPLE_TASK.activation.id
+
+    def test_child_pools_routing(self) -> None:
+        taskworker = TaskWorker(
+            rpc_host="127.0.0.1:50051",
+            num_brokers=1,
+            max_child_task_count=100,
+            process_type="fork",
+            child_pools={
+                "examples": {"namespaces": ["examples"], "concurrency": 1},
+                "retries": {
+                    "tasks": ["examples:examples.retry_task"],
+                    "concurrency": 2,
+                    "max_child_task_count": 5,
+                },
+            },
+        )
+        pools = {pool.name: pool for pool in taskworker._child_pools}
+        assert pools["default"].concurrency == 1
+        assert pools["default"].max_child_task_count == 100
+        assert pools["retries"].concurrency == 2
+        assert pools["retries"].max_child_task_count == 5
+
+        assert taskworker._get_child_pool(SIMPLE_TASK.activation).name == "examples"
+        assert taskworker._get_child_pool(RETRY_TASK.activation).name == "retries"
+        assert taskworker._get_child_pool(UNDEFINED_TASK.activation).name == "default"
+
+        with mock.patch.object(taskworker.client, "get_task") as mock_get:
+            mock_get.return_value = RETRY_TASK
+            assert taskworker._add_task()
+
+        task = pools["retries"].child_tasks.get(timeout=1)
+        assert task.activation.id == RETRY_TASK.activation.id
+        assert taskworker._child_tasks.empty()
+
+    def test_add_task_child_pool_full(self) -> None:
+        taskworker = TaskWorker(
+            rpc_host="127.0.0.1:50051",
+            num_brokers=1,
+            max_child_task_count=100,
+            process_type="fork",
+            child_tasks_queue_maxsize=1,
+            child_pools={
+                "retries": {
+                    "tasks": ["examples:examples.retry_task"],
+                    "concurrency": 1,
+                    "queue_maxsize": 1,
+                },
+            },
+        )
+        pools = {pool.name: pool for pool in taskworker._child_pools}
+        with mock.patch.object(taskworker.client, "get_task") as mock_get:
+            mock_get.return_value = RETRY_TASK
+            assert taskworker._add_task()
+            # The retries pool is full, so the next task is held without blocking
+            assert taskworker._add_task()
+            assert len(pools["retries"].pending) == 1
+            assert not pools["retries"].has_room()
+
+            # Tasks are still fetched while the default pool has room
+            assert not taskworker._child_tasks_full()
+            mock_get.return_value = SIMPLE_TASK
+            assert taskworker._add_task()
+            assert taskworker._add_task()
+            assert len(pools["default"].pending) == 1
+
+            # Nothing is fetched once every pool is full
+            assert taskworker._child_tasks_full()
+            mock_get.reset_mock()
+            assert not taskworker._add_task()
+            assert mock_get.call_count == 0
+
+        task = pools["retries"].child_tasks.get(timeout=1)
+        assert task.activation.id == RETRY_TASK.activation.id
+        # Pending tasks are moved into the queue once it has room
+        with mock.patch.object(taskworker.client, "get_task") as mock_get:
+            mock_get.return_value = None
+            taskworker._add_task()
+        assert not pools["retries"].pending
+        assert len(pools["default"].pending) == 1
+        task = pools["retries"].child_tasks.get(timeout=1)
+        assert task.activation.id == RETRY_TASK.activation.id
+
+    def test_run_once_child_pools(self) -> None:
+        max_runtime = 5
+        taskworker = TaskWorker(
+            rpc_host="127.0.0.1:50051",
+            num_brokers=1,
+            max_child_task_count=100,
+            process_type="fork",
+            child_pools={"examples": {"namespaces": ["examples"], "concurrency": 1}},
+        )
+        with mock.patch.object(taskworker, "client") as mock_client:
+            mock_client.get_task.return_value = SIMPLE_TASK
+            mock_client.update_task.return_value = None
+
+            taskworker.start_result_thread()
+            taskworker.start_spawn_children_thread()
+            start = time.time()
+            while True:
+                taskworker.run_once()
+                if mock_client.update_task.called:
+                    break
+                if time.time() - start > max_runtime:
+                    taskworker.shutdown()
+                    raise AssertionError("Timeout waiting for update_task to be called")
+
+            children = {pool.name: pool.children for pool in taskworker._child_pools}
+            taskworker.shutdown()
+            assert len(children["default"]) == 1
+            assert len(children["examples"]) == 1
+            assert mock_client.update_task.call_args.args[0].task_id == SIMPLE_TASK.activation.id
+            assert (
+                mock_client.update_task.call_args.args[0].status == TASK_ACTIVATION_STATUS_COMPLETE
+            )
+
     def test_run_once_no_next_task(self) -> None:
         max_runtime = 5
         taskworker = TaskWorker(
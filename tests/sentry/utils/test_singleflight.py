@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from sentry.utils.singleflight import SingleFlight
+
+
+def test_leader_and_followers():
+    flight: SingleFlight[str, int] = SingleFlight()
+    is_leader, future = flight.claim("a")
+    assert is_leader
+    is_follower_leader, follower_future = flight.claim("a")
+    assert not is_follower_leader
+    assert follower_future is future
+    assert len(flight) == 1
+
+    assert flight.resolve("a", 1) == 1
+    assert future.result() == 1
+    assert len(flight) == 0
+
+    # Once resolved, the next claim starts a new flight
+    is_leader, future = flight.claim("a")
+    assert is_leader
+    assert not future.done()
+    assert flight.resolve("a", 2) == 0
+
+
+def test_independent_keys():
+    flight: SingleFlight[str, int] = SingleFlight()
+    assert flight.claim("a")[0]
+    assert flight.claim("b")[0]
+    assert len(flight) == 2
+
+
+def test_fail():
+    flight: SingleFlight[str, int] = SingleFlight()
+    _, future = flight.claim("a")
+    flight.claim("a")
+    assert flight.fail("a", ValueError("boom")) == 1
+    with pytest.raises(ValueError):
+        future.result()
+    assert len(flight) == 0
+
+
+def test_concurrent_claims():
+    flight: SingleFlight[str, int] = SingleFlight()
+    barrier = threading.Barrier(8)
+    leaders = []
+    results = []
+
+    def worker():
+        barrier.wait()
+        is_leader, future = flight.claim("a")
+        if is_leader:
+            leaders.append(True)
+            # Wait for everyone else to have claimed the key before resolving
+            while flight._waiters["a"] < 7:
+                pass
+            flight.resolve("a", 42)
+        results.append(future.result(timeout=5))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(leaders) == 1
+    assert results == [42] * 8
@@ -1,9 +1,12 @@
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from unittest import mock
 
 import pytest
 from django.utils import timezone
+from snuba_sdk import Column, Condition, Entity, Op, Query, Request
 from urllib3 import HTTPConnectionPool
 from urllib3.exceptions import HTTPError, ReadTimeoutError
 
@@ -17,7 +20,12 @@ from sentry.utils.snuba import (
     RetrySkipTimeout,
     SnubaQueryParams,
     UnqualifiedQueryError,
+    _bulk_snuba_query_coalesced,
+    _get_coalescing_redis_client,
     _prepare_query_params,
+    _snuba_single_flight,
+    bulk_snuba_queries,
+    get_cache_key,
     get_json_type,
     get_query_params_to_update_for_projects,
     get_snuba_column_name,
@@ -412,6 +420,139 @@ class QuantizeTimeTest(unittest.TestCase):
         assert i != j
 
 
+class QueryCoalescingTest(TestCase):
+    def build_request(self, project_id):
+        return Request(
+            dataset="events",
+            app_id="tests",
+            query=Query(
+                match=Entity("events"),
+                select=[Column("event_id")],
+                where=[Condition(Column("project_id"), Op.EQ, project_id)],
+            ),
+            tenant_ids={"referrer": "testing.test", "organization_id": 1},
+        )
+
+    def fake_results(self, snuba_requests):
+        return [
+            {"data": [{"query": str(snuba_request.request.query)}]}
+            for snuba_request in snuba_requests
+        ]
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_disabled(self, mock_bulk_query):
+        mock_bulk_query.side_effect = self.fake_results
+        results = bulk_snuba_queries(
+            [self.build_request(1), self.build_request(1)], referrer="testing.test"
+        )
+        assert len(mock_bulk_query.call_args[0][0]) == 2
+        assert results[0] == results[1]
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_duplicates_in_batch(self, mock_bulk_query):
+        mock_bulk_query.side_effect = self.fake_results
+        with self.options({"snuba.query-coalescing.enabled": True}):
+            results = bulk_snuba_queries(
+                [self.build_request(1), self.build_request(2), self.build_request(1)],
+                referrer="testing.test",
+            )
+        assert mock_bulk_query.call_count == 1
+        assert len(mock_bulk_query.call_args[0][0]) == 2
+        assert results[0] == results[2]
+        assert results[0] != results[1]
+        # Duplicates get their own copy of the result
+        assert results[0] is not results[2]
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_waits_for_in_flight_query(self, mock_bulk_query):
+        mock_bulk_query.side_effect = self.fake_results
+        request = self.build_request(1)
+        cache_key = get_cache_key(request)
+        result = {"data": [{"query": "in flight"}]}
+
+        # Another thread is already running the same query
+        is_leader, _ = _snuba_single_flight.claim(cache_key)
+        assert is_leader
+
+        with (
+            ThreadPoolExecutor(max_workers=1) as executor,
+            self.options({"snuba.query-coalescing.enabled": True}),
+        ):
+            future = executor.submit(
+                _bulk_snuba_query_coalesced,
+                [mock.Mock(request=request, referrer="testing.test")],
+            )
+            while _snuba_single_flight._waiters[cache_key] == 0:
+                time.sleep(0.01)
+            assert _snuba_single_flight.resolve(cache_key, result) == 1
+            coalesced = future.result(timeout=5)
+
+        assert coalesced == [result]
+        assert coalesced[0] is not result
+        assert mock_bulk_query.call_count == 0
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_failure_is_shared(self, mock_bulk_query):
+        mock_bulk_query.side_effect = UnqualifiedQueryError("bad query")
+        with self.options({"snuba.query-coalescing.enabled": True}):
+            with pytest.raises(UnqualifiedQueryError):
+                bulk_snuba_queries([self.build_request(1)], referrer="testing.test")
+        # The failed query is no longer in flight
+        assert len(_snuba_single_flight) == 0
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_redis_lease_shares_results_across_processes(self, mock_bulk_query):
+        mock_bulk_query.side_effect = self.fake_results
+        with self.options(
+            {
+                "snuba.query-coalescing.enabled": True,
+                "snuba.query-coalescing.redis-lease.enabled": True,
+                "snuba.query-coalescing.referrer-ttls": {"testing.test": 30},
+            }
+        ):
+            first = bulk_snuba_queries([self.build_request(1)], referrer="testing.test")
+            second = bulk_snuba_queries([self.build_request(1)], referrer="testing.test")
+        assert first == second
+        assert mock_bulk_query.call_count == 1
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_redis_lease_expired(self, mock_bulk_query):
+        mock_bulk_query.side_effect = self.fake_results
+        requests = [self.build_request(1), self.build_request(2)]
+        # Another process leases both queries, but never publishes their results
+        client = _get_coalescing_redis_client()
+        for request in requests:
+            client.set(f"{get_cache_key(request)}:lease", 1, px=100)
+
+        with self.options(
+            {
+                "snuba.query-coalescing.enabled": True,
+                "snuba.query-coalescing.redis-lease.enabled": True,
+                "snuba.query-coalescing.lease-ms": 5000,
+            }
+        ):
+            start = time.monotonic()
+            bulk_snuba_queries(requests, referrer="testing.test")
+        # The queries are sent together once the leases expire
+        assert time.monotonic() - start < 5
+        assert mock_bulk_query.call_count == 1
+        assert len(mock_bulk_query.call_args.args[0]) == 2
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_redis_lease_zero_ttl(self, mock_bulk_query):
+        mock_bulk_query.side_effect = self.fake_results
+        with self.options(
+            {
+                "snuba.query-coalescing.enabled": True,
+                "snuba.query-coalescing.redis-lease.enabled": True,
+                "snuba.query-coalescing.default-ttl": 0,
+            }
+        ):
+            bulk_snuba_queries([self.build_request(1)], referrer="testing.test")
+            bulk_snuba_queries([self.build_request(1)], referrer="testing.test")
+        assert mock_bulk_query.call_count == 2
+
+
 class FakeConnectionPool(HTTPConnectionPool):
     def __init__(self, connection, **kwargs):
         self.connection = connection
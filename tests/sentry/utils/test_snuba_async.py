@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import orjson
+import pytest
+from snuba_sdk import Column, Condition, Entity, Op, Query, Request
+
+from sentry.testutils.cases import TestCase
+from sentry.utils.snuba import (
+    QueryMemoryLimitExceeded,
+    RateLimitExceeded,
+    SnubaError,
+    UnqualifiedQueryError,
+    bulk_snuba_queries,
+)
+from sentry.utils.snuba_async import AsyncSnubaClient, bulk_snuba_queries_async
+
+
+class StubSnubaHandler(BaseHTTPRequestHandler):
+    """
+    Answers every query with the project id it was made for. A handful of project ids
+    are reserved to return errors.
+    """
+
+    errors = {
+        400: (400, {"error": {"type": "invalid_query", "message": "bad query"}}),
+        429: (429, {"error": {"type": "rate-limited", "message": "slow down"}}),
+        241: (500, {"error": {"type": "clickhouse", "code": 241, "message": "oom"}}),
+    }
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        project_id = int(re.search(rb"project_id = (\d+)", body).group(1))
+        status, response = self.errors.get(
+            project_id, (200, {"data": [{"project_id": project_id, "path": self.path}]})
+        )
+        self.server.requests.append((self.path, self.headers["referer"]))
+        data = orjson.dumps(response)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_snuba():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSnubaHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def build_request(project_id: int) -> Request:
+    return Request(
+        dataset="events",
+        app_id="tests",
+        query=Query(
+            match=Entity("events"),
+            select=[Column("event_id")],
+            where=[Condition(Column("project_id"), Op.EQ, project_id)],
+        ),
+        tenant_ids={"referrer": "testing.test", "organization_id": 1},
+    )
+
+
+def run_async_queries(server, project_ids):
+    async def run():
+        client = AsyncSnubaClient(base_url=f"http://127.0.0.1:{server.server_port}")
+        with mock.patch("sentry.utils.snuba_async.get_client", return_value=client):
+            try:
+                return await bulk_snuba_queries_async(
+                    [build_request(project_id) for project_id in project_ids],
+                    referrer="testing.test",
+                )
+            finally:
+                await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_bulk_queries(stub_snuba):
+    results = run_async_queries(stub_snuba, list(range(1, 21)))
+    assert [result["data"][0]["project_id"] for result in results] == list(range(1, 21))
+    assert {result["data"][0]["path"] for result in results} == {"/events/snql"}
+    assert len(stub_snuba.requests) == 20
+    assert {referrer for _, referrer in stub_snuba.requests} == {"testing.test"}
+
+
+@pytest.mark.parametrize(
+    "project_id,error",
+    [
+        (400, UnqualifiedQueryError),
+        (429, RateLimitExceeded),
+        (241, QueryMemoryLimitExceeded),
+    ],
+)
+def test_error_mapping(stub_snuba, project_id, error):
+    with pytest.raises(error):
+        run_async_queries(stub_snuba, [1, project_id])
+
+
+def test_connection_error():
+    async def run():
+        client = AsyncSnubaClient(base_url="http://127.0.0.1:1", timeout=1)
+        with mock.patch("sentry.utils.snuba_async.get_client", return_value=client):
+            try:
+                await bulk_snuba_queries_async([build_request(1)], referrer="testing.test")
+            finally:
+                await client.aclose()
+
+    with pytest.raises(SnubaError):
+        asyncio.run(run())
+
+
+class SyncBridgeTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def _stub_snuba(self, stub_snuba):
+        self.stub_snuba = stub_snuba
+
+    def test_bulk_snuba_queries(self):
+        client = AsyncSnubaClient(base_url=f"http://127.0.0.1:{self.stub_snuba.server_port}")
+        with (
+            mock.patch("sentry.utils.snuba_async.get_client", return_value=client),
+            self.options({"snuba.async-transport.enabled": True}),
+        ):
+            results = bulk_snuba_queries(
+                [build_request(1), build_request(2)], referrer="testing.test"
+            )
+            with pytest.raises(UnqualifiedQueryError):
+                bulk_snuba_queries([build_request(1), build_request(400)], referrer="testing.test")
+
+        assert [result["data"][0]["project_id"] for result in results] == [1, 2]
+        assert len(self.stub_snuba.requests) == 4
@@ -0,0 +1,62 @@
+import pytest
+
+from sentry.utils.snuba_columnar import ColumnarData, to_serializable
+
+
+def test_from_rows():
+    rows = [{"a": 1, "b": "x"}, {"a": 2, "b": "y"}, {"a": 3, "b": "z"}]
+    data = ColumnarData.from_rows(list(rows))
+    assert data.columns == {"a": [1, 2, 3], "b": ["x", "y", "z"]}
+    assert len(data) == 3
+    assert data == rows
+    assert data.to_rows() == rows
+    assert list(data) == rows
+
+
+def test_from_rows_consumes_input():
+    rows = [{"a": 1}, {"a": 2}]
+    ColumnarData.from_rows(rows)
+    assert rows == []
+
+
+def test_from_rows_translate():
+    data = ColumnarData.from_rows([{"a": 1}, {"a": 2}], lambda row: {"a": row["a"] * 10})
+    assert data.column("a") == [10, 20]
+
+
+def test_from_rows_ragged():
+    data = ColumnarData.from_rows([{"a": 1}, {"a": 2, "b": "y"}, {"b": "z"}])
+    assert data.columns == {"a": [1, 2, None], "b": [None, "y", "z"]}
+
+
+def test_empty():
+    data = ColumnarData.from_rows([])
+    assert len(data) == 0
+    assert not data
+    assert data == []
+    assert list(data) == []
+
+
+def test_getitem():
+    data = ColumnarData({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    assert data[0] == {"a": 1, "b": "x"}
+    assert data[-1] == {"a": 3, "b": "z"}
+    assert data[1:] == [{"a": 2, "b": "y"}, {"a": 3, "b": "z"}]
+    assert len(data[1:]) == 2
+    with pytest.raises(IndexError):
+        data[3]
+
+    # Rows are copies
+    data[0]["a"] = 100
+    assert data.column("a") == [1, 2, 3]
+
+
+def test_to_serializable():
+    data = ColumnarData({"a": [1, 2]})
+    result = {"data": data, "meta": [{"name": "a", "type": "UInt64"}]}
+    assert to_serializable(result) == {
+        "data": [{"a": 1}, {"a": 2}],
+        "meta": [{"name": "a", "type": "UInt64"}],
+    }
+    rows_result = {"data": [{"a": 1}]}
+    assert to_serializable(rows_result) is rows_result
@@ -27,7 +27,7 @@ from sentry.models.grouphistory import GroupHistoryStatus, record_group_history
 from sentry.models.groupowner import GroupOwner
 from sentry.models.groupsubscription import GroupSubscription
 from sentry.search.snuba.backend import EventsDatasetSnubaSearchBackend, SnubaSearchBackendBase
-from sentry.search.snuba.executors import TrendsSortWeights
+from sentry.search.snuba.executors import PostgresSnubaQueryExecutor, TrendsSortWeights
 from sentry.seer.autofix.constants import FixabilityScoreThresholds
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import SnubaTestCase, TestCase
@@ -736,6 +736,24 @@ class EventsSnubaSearchTestCases(EventsDatasetTestSetup):
                 assert results.prev.has_results
                 assert not results.next.has_results
 
+    def test_pagination_with_query_state(self):
+        expected = list(self.make_query(sort_by="freq", limit=10))
+        with self.options({"snuba.search.query-state.enabled": True}):
+            results = self.make_query(sort_by="freq", limit=1)
+            seen = list(results)
+            # Candidates were all ranked by the first page, so later pages are served
+            # from the stored query state without going back to Snuba.
+            with mock.patch.object(
+                PostgresSnubaQueryExecutor,
+                "snuba_search",
+                side_effect=AssertionError("Unexpected Snuba query"),
+            ):
+                while results.next.has_results:
+                    results = self.make_query(sort_by="freq", limit=1, cursor=results.next)
+                    seen.extend(results)
+
+        assert seen == expected
+
     def test_pagination_with_environment(self):
         for dt in [
             self.group1.first_seen + timedelta(days=1),
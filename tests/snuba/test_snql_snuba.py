@@ -14,6 +14,7 @@ from snuba_sdk.query import Query
 
 from sentry.testutils.cases import SnubaTestCase, TestCase
 from sentry.utils import snuba
+from sentry.utils.snuba_columnar import ColumnarData
 
 
 class SnQLTest(TestCase, SnubaTestCase):
@@ -92,3 +93,36 @@ class SnQLTest(TestCase, SnubaTestCase):
         )
 
         assert results["data"] == []
+
+    def test_columnar(self):
+        now = datetime.now()
+        event_ids = {self._insert_event_for_time(now) for _ in range(3)}
+
+        def run_query(use_cache):
+            return snuba.raw_snql_query(
+                Request(
+                    dataset="events",
+                    app_id="tests",
+                    tenant_ids={"referrer": "testing.test", "organization_id": 1},
+                    query=Query(
+                        Entity("events"),
+                        select=[Column("event_id"), Column("project_id")],
+                        where=[
+                            Condition(Column("project_id"), Op.EQ, self.project.id),
+                            Condition(Column("timestamp"), Op.GTE, now - timedelta(days=1)),
+                            Condition(Column("timestamp"), Op.LT, now + timedelta(days=1)),
+                        ],
+                    ),
+                ),
+                referrer="testing.test",
+                use_cache=use_cache,
+                columnar=True,
+            )
+
+        for use_cache in (False, True, True):
+            result = run_query(use_cache)
+            assert isinstance(result["data"], ColumnarData)
+            assert {
+                event_id.replace("-", "") for event_id in result["data"].column("event_id")
+            } == event_ids
+            assert result["data"].column("project_id") == [self.project.id] * 3